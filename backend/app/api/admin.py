@@ -3,10 +3,10 @@ API endpoints: administracion de usuarios (M5).
 Ref: docs/claude/02_module_specs.md (M5)
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import estado_pool, get_db
 from app.models.user import User
 from app.schemas.admin import CreateUserRequest, UpdateUserRequest, ResetPasswordRequest
 from app.services.admin_service import (
@@ -16,21 +16,32 @@ from app.services.admin_service import (
     update_user,
     reset_user_password,
 )
+from app.services import metricas
 from app.services.policy import POLICY
+from app.services.storage_cache import get_cache
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/admin", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"], route_class=RutaJSON)
 
 
 # ── GET /admin/usuarios ───────────────────────────────────────────────
 
 @router.get("/usuarios")
 async def listar_usuarios(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
+    rol: str | None = Query(None, description="Filtrar por rol"),
+    estado: str | None = Query(None, description="ACTIVO | SUSPENDIDO"),
     db: AsyncSession = Depends(get_db),
     admin: User = Depends(require_admin),
 ):
-    """Lista todos los usuarios (solo ADMIN)."""
-    items = await list_users(db)
-    return {"ok": True, "data": items}
+    """Lista usuarios paginada, con filtros por rol y estado (solo ADMIN)."""
+    items, total = await list_users(db, page=page, page_size=page_size, rol=rol, estado=estado)
+    return {
+        "ok": True,
+        "data": items,
+        "meta": {"page": page, "page_size": page_size, "total": total},
+    }
 
 
 # ── POST /admin/usuarios ──────────────────────────────────────────────
@@ -82,3 +93,44 @@ async def obtener_permisos(
 ):
     """Retorna la POLICY de permisos por rol (solo ADMIN)."""
     return {"ok": True, "data": POLICY}
+
+
+# ── GET /admin/storage-cache ──────────────────────────────────────────
+
+@router.get("/storage-cache")
+async def estado_storage_cache(
+    admin: User = Depends(require_admin),
+):
+    """Metricas del cache en disco de S3: hits, misses, bytes, evicciones (solo ADMIN)."""
+    cache = get_cache()
+    return {"ok": True, "data": cache.stats() if cache else None}
+
+
+# ── GET /admin/db-pool ────────────────────────────────────────────────
+
+def _con_uso(estado: dict | None) -> dict | None:
+    if estado:
+        # Fraccion de la capacidad maxima (size + overflow) en uso; None si el
+        # pool no tiene tope (max_overflow=-1, o pool_size=0 con overflow 0)
+        max_overflow = estado.get("max_overflow", -1)
+        capacidad = estado.get("size", 0) + max_overflow
+        estado["uso"] = (
+            round(estado["checkedout"] / capacidad, 3) if max_overflow >= 0 and capacidad > 0 else None
+        )
+    return estado
+
+
+@router.get("/db-pool")
+async def estado_db_pool(
+    admin: User = Depends(require_admin),
+):
+    """Pools de este proceso (primario y replica): estado, espera de checkout y timeouts (solo ADMIN)."""
+    return {
+        "ok": True,
+        "data": {
+            "pool": _con_uso(estado_pool()),
+            "pool_lectura": _con_uso(estado_pool(lectura=True)),
+            "espera_checkout": metricas.db_pool_espera.resumen(),
+            "timeouts": metricas.db_pool_timeouts.valor(),
+        },
+    }
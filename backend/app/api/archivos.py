@@ -4,16 +4,22 @@ Ref: docs/source/05_api_y_policy.md (Modulo Archivos MVP)
 
 POST /solicitudes/{id}/archivos  — upload
 GET  /archivos/{archivo_id}      — download
+GET  /archivos/{archivo_id}/thumbnail — miniatura / vista previa WebP
 DELETE /archivos/{archivo_id}    — delete
+POST /solicitudes/{id}/archivos/presign — upload directo a S3 (paso 1)
+POST /solicitudes/{id}/archivos/confirm — upload directo a S3 (paso 2)
+GET  /solicitudes/{id}/archivos.zip     — todos los adjuntos en un ZIP (streaming)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import Response
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.services.file_storage import save_file, StorageUploadError
+from app.services.file_storage import StorageUploadError
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.session_middleware import get_current_user
 from app.models.user import User
 from app.models.solicitud import (
@@ -22,18 +28,33 @@ from app.models.solicitud import (
     SolicitudArchivo,
     PagoSolicitud,
 )
+from app.config import settings
+from app.schemas.archivo import PresignUploadRequest, ConfirmUploadRequest
+from app.utils.firmas import firmar, verificar
 from app.services.file_storage import (
     generate_storage_name,
-    save_file,
+    presign_supported,
+    presign_upload,
+    head_object,
+    s3_url,
     read_file,
-    delete_file,
+    read_content,
+    content_ref_count,
+    store_content,
+    store_private,
+    release_contents,
+    enqueue_storage_delete,
 )
+from app.services.derivados import VARIANTES, enqueue_derivados
+from app.services.archivos_zip import stream_zip
+from app.middleware.compression_middleware import acepta, sin_compresion
+from app.utils.json_rapido import RutaJSON
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-router = APIRouter(tags=["archivos"])
+router = APIRouter(tags=["archivos"], route_class=RutaJSON)
 
 # Tipos permitidos
 ALLOWED_TIPO_ARCHIVO = {"EVIDENCIA_PAGO", "DOCUMENTO", "OTROS"}
@@ -41,20 +62,35 @@ ALLOWED_TIPO_ARCHIVO = {"EVIDENCIA_PAGO", "DOCUMENTO", "OTROS"}
 # Tamano maximo: 10 MB
 MAX_FILE_SIZE = 10 * 1024 * 1024
 
+# Lectura del upload por bloques (hash incremental)
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+async def _leer_upload(file: UploadFile) -> tuple[bytes, str]:
+    """
+    Lee el upload por bloques calculando el SHA-256 en el mismo recorrido.
+    Corta en cuanto supera MAX_FILE_SIZE (no lee el resto del cuerpo).
+    """
+    sha = hashlib.sha256()
+    chunks: list[bytes] = []
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_FILE_SIZE:
+            raise HTTPException(status_code=422, detail={
+                "ok": False,
+                "error": {"code": "VALIDATION_ERROR",
+                          "message": f"Archivo excede el tamano maximo ({MAX_FILE_SIZE // (1024*1024)} MB)"},
+            })
+        sha.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), sha.hexdigest()
 
-# ── POST /solicitudes/{id}/archivos ──────────────────────────────────
 
-@router.post("/solicitudes/{solicitud_id}/archivos")
-async def upload_archivo(
-    solicitud_id: int,
-    file: UploadFile = File(...),
-    tipo_archivo: str = Form("OTROS"),
-    pago_id: int | None = Form(None),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """Sube un archivo y lo asocia a la solicitud."""
-    # Validar tipo_archivo
+async def _validar_destino(
+    db: AsyncSession, solicitud_id: int, tipo_archivo: str, pago_id: int | None,
+) -> None:
+    """Valida tipo_archivo, que la solicitud exista y que pago_id le pertenezca."""
     if tipo_archivo not in ALLOWED_TIPO_ARCHIVO:
         raise HTTPException(status_code=422, detail={
             "ok": False,
@@ -64,10 +100,9 @@ async def upload_archivo(
 
     # Validar solicitud existe
     result = await db.execute(
-        select(SolicitudCmep).where(SolicitudCmep.solicitud_id == solicitud_id)
+        select(SolicitudCmep.solicitud_id).where(SolicitudCmep.solicitud_id == solicitud_id)
     )
-    solicitud = result.scalar_one_or_none()
-    if not solicitud:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail={
             "ok": False,
             "error": {"code": "NOT_FOUND", "message": "Solicitud no encontrada"},
@@ -76,35 +111,66 @@ async def upload_archivo(
     # Validar pago_id si se proporciona
     if pago_id is not None:
         pago_result = await db.execute(
-            select(PagoSolicitud).where(
+            select(PagoSolicitud.pago_id).where(
                 PagoSolicitud.pago_id == pago_id,
                 PagoSolicitud.solicitud_id == solicitud_id,
             )
         )
-        if not pago_result.scalar_one_or_none():
+        if pago_result.scalar_one_or_none() is None:
             raise HTTPException(status_code=422, detail={
                 "ok": False,
                 "error": {"code": "VALIDATION_ERROR",
                           "message": "pago_id no pertenece a esta solicitud"},
             })
 
-    # Leer contenido del archivo
-    file_bytes = await file.read()
 
-    # Validar tamano
-    if len(file_bytes) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=422, detail={
-            "ok": False,
-            "error": {"code": "VALIDATION_ERROR",
-                      "message": f"Archivo excede el tamano maximo ({MAX_FILE_SIZE // (1024*1024)} MB)"},
-        })
+async def _liberar_conexion(db: AsyncSession) -> None:
+    """
+    Cierra la transaccion de validacion antes de la E/S de storage: la
+    conexion vuelve al pool y un S3 lento no acapara conexiones. La sesion
+    sigue usable; la siguiente consulta abre una transaccion nueva y corta.
+    """
+    await db.commit()
+
 
-    # Guardar en storage (con manejo de fallos S3 para no “colgar” y dar error para modal)
+# ── POST /solicitudes/{id}/archivos ──────────────────────────────────
+
+@router.post("/solicitudes/{solicitud_id}/archivos")
+async def upload_archivo(
+    solicitud_id: int,
+    file: UploadFile = File(...),
+    tipo_archivo: str = Form("OTROS"),
+    pago_id: int | None = Form(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Sube un archivo y lo asocia a la solicitud."""
+    # Tx 1: validacion. Tx 2: estado del contenido (ref_count). Tx 3 (corta):
+    # referencia al contenido + Archivo. La lectura del upload y el PUT a
+    # storage quedan fuera de todas.
+    await _validar_destino(db, solicitud_id, tipo_archivo, pago_id)
+    # Antes de ceder la sesion a store_content: no depender de current_user despues
+    user_id = current_user.user_id
+    await _liberar_conexion(db)
+
+    # Leer contenido (valida tamano y calcula SHA-256 en streaming)
+    file_bytes, sha256 = await _leer_upload(file)
+
+    # Guardar en storage deduplicado por contenido: si ya existe, no hay PUT
+    # (con manejo de fallos S3 para no “colgar” y dar error para modal)
     original_name = file.filename or "archivo"
-    storage_name = generate_storage_name(original_name)
+    storage_name = sha256
+    ref_count = await content_ref_count(db, sha256)
+    await _liberar_conexion(db)
 
     try:
-        storage_path = await save_file(file_bytes, storage_name)
+        guardado = await store_content(db, file_bytes, sha256, ref_count, file.content_type)
+        if guardado is None:
+            # Contenido en pleno borrado (ref_count=-1): copia propia no deduplicada.
+            # El UPDATE fallido no cambio nada; cerrar la tx antes del PUT
+            await _liberar_conexion(db)
+            guardado = await store_private(file_bytes, original_name, file.content_type)
+        storage_name, storage_path, sha256, codec = guardado
     except StorageUploadError as e:
         status = 504 if e.code in ("S3_CONNECT_TIMEOUT", "S3_READ_TIMEOUT") else 502
         raise HTTPException(status_code=status, detail={
@@ -118,47 +184,159 @@ async def upload_archivo(
             "error": {"code": "UPLOAD_INTERNAL_ERROR", "message": "Error interno subiendo el archivo."},
         })
 
-
-    # Crear registro Archivo
-    archivo = Archivo(
+    archivo = await _registrar_archivo(
+        db, solicitud_id, pago_id, user_id,
         nombre_original=original_name,
         nombre_storage=storage_name,
         tipo=tipo_archivo,
         mime_type=file.content_type,
         tamano_bytes=len(file_bytes),
         storage_path=storage_path,
-        created_by=current_user.user_id,
+        sha256=sha256,
+        codec=codec,
     )
+    return {"ok": True, "data": _archivo_dto(archivo)}
+
+
+async def _registrar_archivo(
+    db: AsyncSession, solicitud_id: int, pago_id: int | None, user_id: int, **campos,
+) -> Archivo:
+    """Crea Archivo + SolicitudArchivo y encola sus derivados."""
+    archivo = Archivo(**campos, created_by=user_id)
     db.add(archivo)
     await db.flush()
 
     # Crear junction SolicitudArchivo
-    sol_archivo = SolicitudArchivo(
+    db.add(SolicitudArchivo(
         solicitud_id=solicitud_id,
         archivo_id=archivo.archivo_id,
         pago_id=pago_id,
-        created_by=current_user.user_id,
-    )
-    db.add(sol_archivo)
+        created_by=user_id,
+    ))
     await db.flush()
 
+    # Miniatura / vista previa en segundo plano (imagenes y PDF)
+    enqueue_derivados(db, archivo)
+    return archivo
+
+
+def _archivo_dto(archivo: Archivo) -> dict:
+    return {
+        "archivo_id": archivo.archivo_id,
+        "nombre": archivo.nombre_original,
+        "tipo": archivo.tipo,
+        "tamano_bytes": archivo.tamano_bytes,
+        "mime_type": archivo.mime_type,
+    }
+
+
+# ── Upload directo a S3: presign + confirm ───────────────────────────
+# 1. POST .../archivos/presign  -> presigned POST + upload_token firmado
+# 2. El navegador sube el archivo directo al bucket (sin pasar por la API)
+# 3. POST .../archivos/confirm  -> HEAD del objeto y registro en BD
+# Con storage local responde 409 PRESIGN_NOT_AVAILABLE (usar el upload normal).
+
+def _http_error(status: int, code: str, message: str) -> HTTPException:
+    return HTTPException(status_code=status, detail={
+        "ok": False,
+        "error": {"code": code, "message": message},
+    })
+
+
+@router.post("/solicitudes/{solicitud_id}/archivos/presign")
+async def presign_archivo(
+    solicitud_id: int,
+    body: PresignUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Autoriza un upload directo al bucket (presigned POST)."""
+    if not presign_supported():
+        raise _http_error(409, "PRESIGN_NOT_AVAILABLE",
+                          "Upload directo no disponible; usar POST /solicitudes/{id}/archivos")
+    await _validar_destino(db, solicitud_id, body.tipo_archivo, body.pago_id)
+    if body.tamano_bytes > MAX_FILE_SIZE:
+        raise _http_error(422, "VALIDATION_ERROR",
+                          f"Archivo excede el tamano maximo ({MAX_FILE_SIZE // (1024*1024)} MB)")
+    await _liberar_conexion(db)
+
+    key = f"incoming/{generate_storage_name(body.nombre)}"
+    try:
+        presigned = await presign_upload(key, body.mime_type, MAX_FILE_SIZE)
+    except Exception:
+        logger.exception("PRESIGN_FAILED solicitud_id=%s", solicitud_id)
+        raise _http_error(502, "PRESIGN_FAILED", "No se pudo autorizar la subida. Intenta nuevamente.")
+
+    token = firmar({
+        "k": key, "s": solicitud_id, "u": current_user.user_id,
+        "t": body.tipo_archivo, "p": body.pago_id, "n": body.nombre, "m": body.mime_type,
+    }, settings.S3_PRESIGN_EXPIRES_SECONDS + 3600)  # margen para confirmar tras subir
+
     return {
         "ok": True,
         "data": {
-            "archivo_id": archivo.archivo_id,
-            "nombre": archivo.nombre_original,
-            "tipo": archivo.tipo,
-            "tamano_bytes": archivo.tamano_bytes,
-            "mime_type": archivo.mime_type,
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "upload_token": token,
+            "expires_in": settings.S3_PRESIGN_EXPIRES_SECONDS,
         },
     }
 
 
+@router.post("/solicitudes/{solicitud_id}/archivos/confirm")
+async def confirm_archivo(
+    solicitud_id: int,
+    body: ConfirmUploadRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Verifica el objeto subido (HEAD) y registra Archivo + SolicitudArchivo."""
+    datos = verificar(body.upload_token)
+    if not datos or datos["s"] != solicitud_id or datos["u"] != current_user.user_id:
+        raise _http_error(422, "VALIDATION_ERROR", "upload_token invalido o expirado")
+    key = datos["k"]
+
+    # Idempotente: un reintento del confirm devuelve el mismo archivo
+    existente = (await db.execute(
+        select(Archivo).where(Archivo.nombre_storage == key)
+    )).scalar_one_or_none()
+    if existente:
+        return {"ok": True, "data": _archivo_dto(existente)}
+
+    await _validar_destino(db, solicitud_id, datos["t"], datos["p"])
+    await _liberar_conexion(db)
+
+    try:
+        meta = await head_object(key)
+    except Exception:
+        logger.exception("CONFIRM_HEAD_FAILED key=%s", key)
+        raise _http_error(502, "S3_HEAD_FAILED", "No se pudo verificar el archivo subido.")
+    if meta is None:
+        raise _http_error(409, "UPLOAD_NOT_FOUND", "El archivo no llego al storage")
+    if meta["tamano_bytes"] > MAX_FILE_SIZE or meta["content_type"] != datos["m"]:
+        enqueue_storage_delete(db, s3_url(key))
+        await db.commit()  # el borrado debe persistir aunque se responda error
+        raise _http_error(422, "VALIDATION_ERROR", "El archivo subido no coincide con lo autorizado")
+
+    archivo = await _registrar_archivo(
+        db, solicitud_id, datos["p"], current_user.user_id,
+        nombre_original=datos["n"],
+        nombre_storage=key,
+        tipo=datos["t"],
+        mime_type=meta["content_type"],
+        tamano_bytes=meta["tamano_bytes"],
+        storage_path=s3_url(key),
+    )
+    return {"ok": True, "data": _archivo_dto(archivo)}
+
+
 # ── GET /archivos/{archivo_id} ───────────────────────────────────────
 
 @router.get("/archivos/{archivo_id}")
+@sin_compresion  # binarios ya comprimidos o passthrough gzip: se envian tal cual
 async def download_archivo(
     archivo_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -172,24 +350,126 @@ async def download_archivo(
             "ok": False,
             "error": {"code": "NOT_FOUND", "message": "Archivo no encontrado"},
         })
+    await _liberar_conexion(db)
 
+    headers = {
+        "Content-Disposition": f'attachment; filename="{archivo.nombre_original}"',
+    }
+    # Guardado en gzip y el cliente lo acepta: se envia tal cual (sin descomprimir)
+    passthrough = (
+        archivo.codec == "gzip"
+        and acepta(request.headers.get("accept-encoding", ""), "gzip")
+    )
     try:
-        file_bytes = await read_file(archivo.storage_path)
+        if passthrough:
+            file_bytes = await read_file(archivo.storage_path)
+            headers["Content-Encoding"] = "gzip"
+        else:
+            file_bytes = await read_content(archivo.storage_path, archivo.codec)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail={
             "ok": False,
             "error": {"code": "NOT_FOUND", "message": "Archivo fisico no encontrado en storage"},
         })
+    if archivo.codec:
+        headers["Vary"] = "Accept-Encoding"
 
     return Response(
         content=file_bytes,
         media_type=archivo.mime_type or "application/octet-stream",
+        headers=headers,
+    )
+
+
+# ── GET /solicitudes/{id}/archivos.zip ───────────────────────────────
+
+@router.get("/solicitudes/{solicitud_id}/archivos.zip")
+async def zip_archivos(
+    solicitud_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Descarga todos los adjuntos de la solicitud en un ZIP generado al vuelo."""
+    result = await db.execute(
+        select(SolicitudCmep.solicitud_id).where(SolicitudCmep.solicitud_id == solicitud_id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail={
+            "ok": False,
+            "error": {"code": "NOT_FOUND", "message": "Solicitud no encontrada"},
+        })
+
+    rows = (await db.execute(
+        select(Archivo.nombre_original, Archivo.storage_path, Archivo.codec, Archivo.mime_type)
+        .join(SolicitudArchivo, SolicitudArchivo.archivo_id == Archivo.archivo_id)
+        .where(SolicitudArchivo.solicitud_id == solicitud_id)
+        .order_by(SolicitudArchivo.id)
+    )).all()
+    archivos = [
+        {"nombre": r.nombre_original, "storage_path": r.storage_path,
+         "codec": r.codec, "mime_type": r.mime_type}
+        for r in rows
+    ]
+    await _liberar_conexion(db)
+
+    # El stream no usa la sesion: la BD queda libre mientras se descarga
+    return StreamingResponse(
+        stream_zip(archivos),
+        media_type="application/zip",
         headers={
-            "Content-Disposition": f'attachment; filename="{archivo.nombre_original}"',
+            "Content-Disposition": f'attachment; filename="solicitud_{solicitud_id}_archivos.zip"',
         },
     )
 
 
+# ── GET /archivos/{archivo_id}/thumbnail ─────────────────────────────
+
+@router.get("/archivos/{archivo_id}/thumbnail")
+async def thumbnail_archivo(
+    archivo_id: int,
+    variante: str = "thumb",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Miniatura (thumb) o vista previa (preview) WebP de una imagen o PDF."""
+    if variante not in VARIANTES:
+        raise HTTPException(status_code=422, detail={
+            "ok": False,
+            "error": {"code": "VALIDATION_ERROR",
+                      "message": f"variante debe ser uno de: {', '.join(VARIANTES)}"},
+        })
+
+    result = await db.execute(
+        select(Archivo.thumbnail_path, Archivo.preview_path)
+        .where(Archivo.archivo_id == archivo_id)
+    )
+    row = result.one_or_none()
+    path = None
+    if row is not None:
+        path = row.thumbnail_path if variante == "thumb" else row.preview_path
+    if not path:
+        raise HTTPException(status_code=404, detail={
+            "ok": False,
+            "error": {"code": "NOT_FOUND", "message": "Miniatura no disponible"},
+        })
+    await _liberar_conexion(db)
+
+    try:
+        file_bytes = await read_file(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail={
+            "ok": False,
+            "error": {"code": "NOT_FOUND", "message": "Miniatura no encontrada en storage"},
+        })
+
+    # El derivado de un archivo no cambia: cacheable en el navegador
+    return Response(
+        content=file_bytes,
+        media_type="image/webp",
+        headers={"Cache-Control": "private, max-age=86400"},
+    )
+
+
 # ── DELETE /archivos/{archivo_id} ────────────────────────────────────
 
 @router.delete("/archivos/{archivo_id}")
@@ -198,7 +478,7 @@ async def delete_archivo(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Elimina un archivo (registro + fichero fisico)."""
+    """Elimina un archivo (registro + fichero fisico en segundo plano)."""
     result = await db.execute(
         select(Archivo).where(Archivo.archivo_id == archivo_id)
     )
@@ -216,11 +496,14 @@ async def delete_archivo(
     for junction in junctions.scalars().all():
         await db.delete(junction)
 
-    # Eliminar archivo fisico
-    try:
-        await delete_file(archivo.storage_path)
-    except Exception:
-        pass  # Si falla borrado fisico, seguimos con borrado logico
+    # Eliminar archivo fisico: job tras el COMMIT (con reintentos).
+    # Contenido deduplicado: solo si era la ultima referencia.
+    if archivo.sha256:
+        await release_contents(db, [archivo.sha256])
+    else:
+        for path in (archivo.storage_path, archivo.thumbnail_path, archivo.preview_path):
+            if path:
+                enqueue_storage_delete(db, path)
 
     # Eliminar registro
     await db.delete(archivo)
@@ -21,8 +21,9 @@ from app.services.auth_service import (
 )
 from app.middleware.session_middleware import get_current_user, SESSION_COOKIE_NAME
 from app.utils.time import utcnow
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=RutaJSON)
 
 
 @router.post("/login")
@@ -0,0 +1,75 @@
+"""
+API endpoint: GET /bootstrap — datos iniciales del app shell en una respuesta.
+
+Reemplaza /auth/me + /servicios + /empleados (GESTOR y MEDICO) + /promotores
+al cargar la app: usuario, permisos, POLICY de sus roles y catalogos de los
+selectores. Los catalogos salen del cache (app.services.catalogos); el ETag
+combina usuario y versiones de catalogos (304 si nada cambio).
+"""
+
+import hashlib
+
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.middleware.session_middleware import get_current_user
+from app.models.persona import Persona
+from app.models.user import User
+from app.services import catalogos
+from app.services.auth_service import build_user_dto
+from app.services.policy import POLICY
+from app.utils.json_rapido import RutaJSON
+
+router = APIRouter(tags=["bootstrap"], route_class=RutaJSON)
+
+# Roles de empleado con selector en el detalle de solicitud
+ROLES_SELECTOR = ("GESTOR", "MEDICO")
+# Primera pagina del selector de promotores (el resto via ?modo=autocomplete)
+PROMOTORES_LIMIT = 20
+
+
+@router.get("/bootstrap")
+async def bootstrap(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Usuario + permisos + policy + catalogos, con ETag combinado."""
+    user_dto = build_user_dto(current_user)
+    persona = await db.get(Persona, current_user.persona_id)
+    if persona:
+        user_dto["display_name"] = f"{persona.nombres} {persona.apellidos}"
+
+    snaps = {nombre: await catalogos.obtener(db, nombre) for nombre in catalogos.CATALOGOS}
+    firma = repr((
+        sorted(user_dto.items(), key=lambda kv: kv[0]),
+        [snaps[n].token for n in catalogos.CATALOGOS],
+    ))
+    tag = f'W/"{hashlib.sha1(firma.encode()).hexdigest()[:20]}"'
+
+    def _construir() -> dict:
+        promotores, next_cursor = catalogos.buscar_promotores(
+            snaps["promotores"], None, None, PROMOTORES_LIMIT,
+        )
+        return {
+            "ok": True,
+            "data": {
+                "user": user_dto,
+                "policy": {rol: POLICY[rol] for rol in user_dto["roles"] if rol in POLICY},
+                "catalogos": {
+                    "servicios": snaps["servicios"].data,
+                    "empleados": {
+                        rol: [
+                            {"persona_id": e["persona_id"], "nombre": e["nombre"], "rol": e["rol"]}
+                            for e in snaps["empleados"].data
+                            if e["rol"] == rol and e["estado"] == "ACTIVO"
+                        ]
+                        for rol in ROLES_SELECTOR
+                    },
+                    "promotores": {"items": promotores, "next_cursor": next_cursor},
+                },
+            },
+        }
+
+    return catalogos.respuesta_condicional(request, tag, _construir)
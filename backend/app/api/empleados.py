@@ -4,43 +4,37 @@ Ref: docs/claude/M4_5_incremental_improvements.md
 
 GET /empleados?rol=GESTOR  → lista gestores activos con nombre
 GET /empleados?rol=MEDICO  → lista medicos activos con nombre
+Servido desde el cache de catalogos (ETag / 304).
 """
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.session_middleware import get_current_user
 from app.models.user import User
-from app.models.empleado import Empleado
+from app.services import catalogos
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/empleados", tags=["empleados"])
+router = APIRouter(prefix="/empleados", tags=["empleados"], route_class=RutaJSON)
 
 
 @router.get("")
 async def listar_empleados(
+    request: Request,
     rol: str = Query(..., description="Filtrar por rol: GESTOR, MEDICO, OPERADOR"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Lista empleados activos por rol, con persona_id y nombre."""
-    stmt = select(Empleado).where(
-        Empleado.rol_empleado == rol,
-        Empleado.estado_empleado == "ACTIVO",
-    ).order_by(Empleado.empleado_id)
-
-    result = await db.execute(stmt)
-    empleados = result.scalars().all()
-
-    items = []
-    for emp in empleados:
-        persona = emp.persona
-        nombre = f"{persona.nombres} {persona.apellidos}" if persona else "?"
-        items.append({
-            "persona_id": emp.persona_id,
-            "nombre": nombre,
-            "rol": emp.rol_empleado,
-        })
-
-    return {"ok": True, "data": items}
+    """Lista empleados activos por rol, con persona_id y nombre (cache de catalogos)."""
+    snap = await catalogos.obtener(db, "empleados")
+
+    def _construir() -> dict:
+        items = [
+            {"persona_id": e["persona_id"], "nombre": e["nombre"], "rol": e["rol"]}
+            for e in snap.data
+            if e["rol"] == rol and e["estado"] == "ACTIVO"
+        ]
+        return {"ok": True, "data": items}
+
+    return catalogos.respuesta_condicional(request, catalogos.etag(snap, rol), _construir)
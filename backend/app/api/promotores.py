@@ -3,11 +3,12 @@ API endpoints: promotores CRUD.
 Accesible a cualquier usuario autenticado.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select, func, or_
+from sqlalchemy.orm import contains_eager
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.session_middleware import get_current_user
 from app.models.user import User
 from app.models.promotor import Promotor
@@ -15,23 +16,24 @@ from app.models.persona import Persona
 from app.models.solicitud import SolicitudCmep
 from app.schemas.promotor import CreatePromotorRequest, UpdatePromotorRequest
 from app.services.solicitud_service import create_promotor
+from app.services import catalogos
+from app.services.catalogos import nombre_promotor
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/promotores", tags=["promotores"])
+router = APIRouter(prefix="/promotores", tags=["promotores"], route_class=RutaJSON)
 
 
 def _build_promotor_item(p: Promotor, persona: Persona | None = None) -> dict:
     """Construye dict de respuesta para un promotor."""
-    if p.tipo_promotor == "PERSONA" and persona:
-        nombre = f"{persona.nombres} {persona.apellidos}"
-    elif p.tipo_promotor == "EMPRESA":
-        nombre = p.razon_social or "?"
-    else:
-        nombre = p.nombre_promotor_otros or p.fuente_promotor or "?"
-
     return {
         "promotor_id": p.promotor_id,
         "tipo_promotor": p.tipo_promotor,
-        "nombre": nombre,
+        "nombre": nombre_promotor(
+            p.tipo_promotor,
+            persona.nombres if persona else None,
+            persona.apellidos if persona else None,
+            p.razon_social, p.nombre_promotor_otros, p.fuente_promotor,
+        ),
         "razon_social": p.razon_social,
         "nombre_promotor_otros": p.nombre_promotor_otros,
         "ruc": p.ruc,
@@ -48,33 +50,74 @@ def _build_promotor_item(p: Promotor, persona: Persona | None = None) -> dict:
 
 
 async def _load_persona(db: AsyncSession, promotor: Promotor) -> Persona | None:
-    """Carga persona vinculada si tipo=PERSONA."""
+    """Persona vinculada si tipo=PERSONA (identity map: sin query si ya esta cargada)."""
     if promotor.tipo_promotor == "PERSONA" and promotor.persona_id:
-        result = await db.execute(
-            select(Persona).where(Persona.persona_id == promotor.persona_id)
-        )
-        return result.scalar_one_or_none()
+        return await db.get(Persona, promotor.persona_id)
     return None
 
 
+def _like_prefijo(q: str) -> str:
+    """Patron LIKE 'q%' con comodines escapados (usa los indices de nombre)."""
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
 # ── GET /promotores ──────────────────────────────────────────────────
 
 @router.get("")
 async def listar_promotores(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    q: str | None = Query(None, max_length=100, description="Prefijo de razon social, nombre o apellidos"),
+    cursor: int | None = Query(None, ge=0, description="meta.next_cursor de la pagina anterior"),
+    limit: int = Query(50, ge=1, le=200),
+    modo: str = Query("completo", pattern="^(completo|autocomplete)$"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Lista promotores disponibles."""
-    stmt = select(Promotor).order_by(Promotor.promotor_id)
-    result = await db.execute(stmt)
-    promotores = result.scalars().all()
+    """
+    Lista promotores paginada por cursor (promotor_id ascendente).
+    Una sola query con JOIN a personas. modo=autocomplete retorna solo
+    promotor_id, nombre y tipo_promotor, desde el cache de catalogos (ETag).
+    """
+    if modo == "autocomplete":
+        snap = await catalogos.obtener(db, "promotores")
+
+        def _construir() -> dict:
+            items, next_cursor = catalogos.buscar_promotores(snap, q, cursor, limit)
+            return {"ok": True, "data": items, "meta": {"limit": limit, "next_cursor": next_cursor}}
+
+        return catalogos.respuesta_condicional(
+            request, catalogos.etag(snap, q, cursor, limit), _construir,
+        )
 
-    items = []
-    for p in promotores:
-        persona = await _load_persona(db, p)
-        items.append(_build_promotor_item(p, persona))
+    stmt = (
+        select(Promotor)
+        .outerjoin(Promotor.persona)
+        .options(contains_eager(Promotor.persona))
+    )
 
-    return {"ok": True, "data": items}
+    if q and q.strip():
+        patron = _like_prefijo(q.strip())
+        stmt = stmt.where(or_(
+            Promotor.razon_social.like(patron, escape="\\"),
+            Promotor.nombre_promotor_otros.like(patron, escape="\\"),
+            Persona.nombres.like(patron, escape="\\"),
+            Persona.apellidos.like(patron, escape="\\"),
+        ))
+    if cursor is not None:
+        stmt = stmt.where(Promotor.promotor_id > cursor)
+    # limit + 1: saber si hay pagina siguiente sin COUNT
+    stmt = stmt.order_by(Promotor.promotor_id).limit(limit + 1)
+
+    filas = (await db.execute(stmt)).scalars().all()
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+    items = [
+        _build_promotor_item(p, p.persona if p.tipo_promotor == "PERSONA" else None)
+        for p in filas
+    ]
+
+    next_cursor = items[-1]["promotor_id"] if hay_mas else None
+    return {"ok": True, "data": items, "meta": {"limit": limit, "next_cursor": next_cursor}}
 
 
 # ── GET /promotores/{id} ─────────────────────────────────────────────
@@ -82,7 +125,7 @@ async def listar_promotores(
 @router.get("/{promotor_id}")
 async def detalle_promotor(
     promotor_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Detalle completo de un promotor."""
@@ -150,6 +193,7 @@ async def editar_promotor(
 
     promotor.updated_by = current_user.user_id
     await db.flush()
+    catalogos.invalidar(db, "promotores")
 
     persona = await _load_persona(db, promotor)
     return {"ok": True, "data": _build_promotor_item(promotor, persona)}
@@ -190,4 +234,5 @@ async def eliminar_promotor(
 
     await db.delete(promotor)
     await db.flush()
+    catalogos.invalidar(db, "promotores")
     return {"ok": True}
@@ -8,12 +8,13 @@ from datetime import date
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
 from app.services.admin_service import require_admin
 from app.services.reportes_service import generar_reporte
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/admin", tags=["admin-reportes"])
+router = APIRouter(prefix="/admin", tags=["admin-reportes"], route_class=RutaJSON)
 
 
 @router.get("/reportes")
@@ -22,7 +23,7 @@ async def obtener_reportes(
     hasta: date | None = Query(None, description="Fin del rango (YYYY-MM-DD)"),
     estado: str | None = Query(None, description="Filtro estado operativo"),
     agrupacion: str = Query("mensual", description="semanal o mensual"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     admin: User = Depends(require_admin),
 ):
     """Genera reporte completo: KPIs, series, distribucion, rankings. Solo ADMIN."""
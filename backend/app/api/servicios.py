@@ -1,39 +1,28 @@
 """
 Endpoint: GET /servicios — lista de servicios disponibles.
+Servido desde el cache de catalogos (ETag / 304).
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_read_db
 from app.middleware.session_middleware import get_current_user
 from app.models.user import User
-from app.models.servicio import Servicio
+from app.services import catalogos
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/servicios", tags=["servicios"])
+router = APIRouter(prefix="/servicios", tags=["servicios"], route_class=RutaJSON)
 
 
 @router.get("")
 async def listar_servicios(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Lista todos los servicios disponibles."""
-    result = await db.execute(
-        select(Servicio).order_by(Servicio.servicio_id)
+    snap = await catalogos.obtener(db, "servicios")
+    return catalogos.respuesta_condicional(
+        request, catalogos.etag(snap), lambda: {"ok": True, "data": snap.data},
     )
-    servicios = result.scalars().all()
-
-    return {
-        "ok": True,
-        "data": [
-            {
-                "servicio_id": s.servicio_id,
-                "descripcion_servicio": s.descripcion_servicio,
-                "tarifa_servicio": str(s.tarifa_servicio),
-                "moneda_tarifa": s.moneda_tarifa,
-            }
-            for s in servicios
-        ],
-    }
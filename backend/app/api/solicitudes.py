@@ -7,7 +7,7 @@ Ref: docs/claude/02_module_specs.md (M2)
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.middleware.session_middleware import get_current_user
 from app.models.user import User
 from app.schemas.solicitud import (
@@ -39,10 +39,12 @@ from app.services.solicitud_service import (
 from app.services.policy import assert_allowed
 from app.services.admin_service import require_admin
 from app.services.estado_operativo import derivar_estado_operativo
+from app.services.storage_cache import prefetch_adjuntos
 from app.models.solicitud import SolicitudEstadoHistorial
 from app.utils.time import utcnow
+from app.utils.json_rapido import RutaJSON
 
-router = APIRouter(prefix="/solicitudes", tags=["solicitudes"])
+router = APIRouter(prefix="/solicitudes", tags=["solicitudes"], route_class=RutaJSON)
 
 
 # ── POST /solicitudes ─────────────────────────────────────────────────
@@ -126,7 +128,7 @@ async def listar_solicitudes(
     q: str | None = Query(None, description="Busqueda por documento o nombre"),
     estado_operativo: str | None = Query(None, description="Filtrar por estado operativo"),
     mine: bool = Query(False, description="Solo solicitudes del usuario actual"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Lista solicitudes con filtros y paginacion."""
@@ -141,6 +143,7 @@ async def listar_solicitudes(
     items, total = await list_solicitudes(
         db, page=page, page_size=page_size, q=q, estado_operativo=estado_operativo,
         mine_user_id=mine_user_id, mine_persona_id=mine_persona_id, mine_roles=mine_roles,
+        user_roles=[r.user_role for r in current_user.roles],
     )
 
     return {
@@ -155,7 +158,7 @@ async def listar_solicitudes(
 @router.get("/{solicitud_id}")
 async def detalle_solicitud(
     solicitud_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     """Detalle completo con estado_operativo y acciones_permitidas."""
@@ -170,6 +173,9 @@ async def detalle_solicitud(
     user_names = await resolve_historial_user_names(db, solicitud)
     detail = build_detail_dto(solicitud, user_roles, user_names)
 
+    # Calentar el cache de storage con los adjuntos que se van a ver
+    prefetch_adjuntos([sa.archivo for sa in solicitud.archivos_rel if sa.archivo])
+
     return {"ok": True, "data": detail}
 
 
@@ -26,6 +26,19 @@ class Settings(BaseSettings):
     DB_USER: str = "cmep_user"
     DB_PASS: str = "cmep_pass"
 
+    # Pool de conexiones (por proceso; ver GET /admin/db-pool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0     # segundos esperando conexion antes de TimeoutError
+    DB_POOL_RECYCLE: int = 1800       # segundos; < wait_timeout de MySQL. -1 = nunca
+    DB_POOL_PRE_PING: bool = True
+
+    # Replica de lectura (get_read_db: listados, detalle, reportes, catalogos,
+    # exportes); vacio = todo al primario. Tras una escritura exitosa el
+    # cliente lee del primario durante DB_READ_PIN_SECONDS (read-your-writes).
+    DB_READ_URL: str = ""
+    DB_READ_PIN_SECONDS: int = 10
+
     # Aplicacion
     APP_ENV: str = "local"
     APP_VERSION: str = "0.1.0"
@@ -41,7 +54,78 @@ class Settings(BaseSettings):
     FILE_STORAGE: str = "s3"
     UPLOAD_DIR: str = "uploads"
     S3_BUCKET: str = ""
-    S3_REGION: str = "us-east-1"    
+    S3_REGION: str = "us-east-1"
+    S3_PRESIGN_EXPIRES_SECONDS: int = 900  # validez del upload directo a S3
+
+    # Jobs en segundo plano (app.services.jobs)
+    JOBS_WORKER_ENABLED: bool = True     # worker in-process desde main.lifespan
+    JOBS_CONCURRENCY: int = 2
+    JOBS_POLL_SECONDS: float = 5.0
+    JOBS_MAX_INTENTOS: int = 5
+    JOBS_BACKOFF_SECONDS: float = 10.0   # base del backoff exponencial
+    JOBS_BACKOFF_MAX_SECONDS: float = 3600.0
+    JOBS_LEASE_SECONDS: int = 300        # EN_PROCESO mas antiguo se reclama
+    JOBS_RETENCION_DIAS: int = 7         # jobs finalizados se purgan despues
+
+    # Scheduler periodico (app.services.scheduler)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SECONDS: float = 30.0
+    SCHEDULER_LEASE_SECONDS: int = 90    # lider caido: otra instancia toma el relevo
+    SESSION_CLEANUP_INTERVAL_SECONDS: int = 3600
+    CLEANUP_BATCH_SIZE: int = 500        # filas por DELETE en limpiezas periodicas
+
+    # Cache LRU en disco delante de S3 (app.services.storage_cache); 0 = desactivado
+    STORAGE_CACHE_DIR: str = "storage_cache"
+    STORAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    STORAGE_CACHE_PREFETCH: bool = False  # precargar adjuntos al abrir un detalle
+    STORAGE_CACHE_PREFETCH_MAX_BYTES: int = 2 * 1024 * 1024  # originales mas grandes no se precargan
+    STORAGE_CACHE_PREFETCH_MAX_FILES: int = 8  # lecturas por detalle como maximo
+    STORAGE_CACHE_PREFETCH_CONCURRENCY: int = 4
+
+    # Metricas Prometheus (GET /metrics). Fuera de APP_ENV=local el scrape exige
+    # METRICS_TOKEN (Bearer); sin token /metrics responde 404
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+
+    # Consultas SQL por request: header Server-Timing + log (N+1 si una
+    # sentencia se repite SQL_NPLUS1_THRESHOLD veces o mas)
+    SQL_STATS_ENABLED: bool = True
+    SQL_NPLUS1_THRESHOLD: int = 10
+
+    # Consultas lentas (app.services.consultas_lentas); 0 = desactivado
+    SLOW_QUERY_MS: int = 500
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 300
+    SLOW_QUERY_EXPLAIN_CONCURRENCY: int = 2
+
+    # Compresion de respuestas (app.middleware.compression_middleware): br si
+    # el paquete brotli esta instalado, si no gzip; niveles pensados para latencia
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 5
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Cache de catalogos (servicios, empleados, promotores); ver app.services.catalogos
+    REFDATA_CACHE_TTL_SECONDS: int = 60
+
+    # ZIP de adjuntos (GET /solicitudes/{id}/archivos.zip): lecturas en vuelo
+    ZIP_FETCH_WINDOW: int = 4
+
+    # Compresion transparente en storage ("" desactivada | gzip | zstd)
+    STORAGE_COMPRESSION: str = ""
+
+    # Miniaturas / vistas previas (app.services.derivados)
+    THUMBNAILS_ENABLED: bool = True
+    THUMBNAILS_PROCESS_WORKERS: int = 2  # procesos para el render (CPU)
+    THUMBNAIL_MAX_PX: int = 256
+    PREVIEW_MAX_PX: int = 1024
+
+    # GC / reconciliacion de storage (app.services.storage_gc)
+    STORAGE_GC_INTERVAL_SECONDS: int = 86400
+    STORAGE_GC_BORRAR: bool = False      # False: solo reporta huerfanos
+    STORAGE_GC_PAGE_SIZE: int = 1000     # maximo de ListObjectsV2
+    STORAGE_GC_CONCURRENCY: int = 8      # borrados en paralelo
+    STORAGE_GC_GRACE_SECONDS: int = 86400  # huerfanos mas recientes se ignoran
+
     # Cookies (produccion)
     COOKIE_DOMAIN: str = ""  # vacio = no domain attr; prod: ".tudominio.com"
 
@@ -70,6 +154,11 @@ class Settings(BaseSettings):
     def is_prod(self) -> bool:
         return self.APP_ENV == "prod"
 
+    @property
+    def metrics_expuestas(self) -> bool:
+        """GET /metrics responde: en local siempre; fuera de local solo con METRICS_TOKEN."""
+        return self.METRICS_ENABLED and (self.APP_ENV == "local" or bool(self.METRICS_TOKEN))
+
     model_config = {"env_file": ".env", "extra": "ignore"}
 
 
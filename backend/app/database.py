@@ -4,11 +4,22 @@ Ref: docs/claude/01_architecture_summary.md (seccion 2.3)
 
 Engine se crea de forma lazy para permitir que los tests
 sobreescriban la dependencia get_db sin importar asyncmy.
+
+Con DB_READ_URL, get_read_db entrega sesiones de una replica para rutas de
+solo lectura; sin ella (o con el pin de read-your-writes) usa get_db.
 """
 
+import time
+
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.orm import DeclarativeBase
 
+# Listeners de sentencias a nivel Engine: conteo por request y consultas lentas
+import app.services.consultas_lentas  # noqa: F401
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,42 +28,127 @@ class Base(DeclarativeBase):
 # Engine y session factory se crean lazy (no al importar el modulo)
 _engine = None
 _async_session_factory = None
+_read_engine = None
+_read_session_factory = None
+
+# Pin al primario (read-your-writes): cookie que fija app.middleware.read_pin_middleware
+# tras una escritura, o header explicito del cliente
+PIN_COOKIE_NAME = "cmep_primario"
+PIN_HEADER_NAME = "x-cmep-primario"
+
+
+class PoolMedido(AsyncAdaptedQueuePool):
+    """QueuePool que mide la espera de checkout (cola llena o conexion nueva)."""
+
+    def _do_get(self):
+        from app.services import metricas
+
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metricas.db_pool_timeouts.inc()
+            raise
+        finally:
+            metricas.db_pool_espera.observe(valor=time.perf_counter() - inicio)
+
 
+def _es_sqlite_memoria(url: str) -> bool:
+    # sqlite+aiosqlite:// sin ruta tambien es en memoria
+    return ":memory:" in url or "mode=memory" in url or url.rstrip("/").endswith(":")
 
-def _get_engine():
+
+def _opciones_pool(settings, url: str | None = None) -> dict:
+    """kwargs de create_async_engine para el pool segun Settings."""
+    url = url or settings.DATABASE_URL
+    if url.startswith("sqlite") and _es_sqlite_memoria(url):
+        return {}  # StaticPool: una sola conexion, nada que dimensionar
+    return {
+        "poolclass": PoolMedido,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def get_engine():
+    """Engine async de la aplicacion (se crea en el primer uso)."""
     global _engine
     if _engine is None:
         from app.config import settings
-        url = settings.DATABASE_URL
-        if settings.is_sqlite:
-            # SQLite no soporta pool_size/max_overflow/pool_pre_ping
-            _engine = create_async_engine(url, echo=(settings.APP_ENV == "local"))
-        else:
-            _engine = create_async_engine(
-                url,
-                echo=(settings.APP_ENV == "local"),
-                pool_pre_ping=True,
-                pool_size=5,
-                max_overflow=10,
-            )
+        _engine = create_async_engine(
+            settings.DATABASE_URL,
+            echo=(settings.APP_ENV == "local"),
+            **_opciones_pool(settings),
+        )
     return _engine
 
 
+def get_read_engine():
+    """Engine de la replica de lectura; None si DB_READ_URL no esta definido."""
+    global _read_engine
+    if _read_engine is None:
+        from app.config import settings
+        if not settings.DB_READ_URL:
+            return None
+        _read_engine = create_async_engine(
+            settings.DB_READ_URL,
+            echo=(settings.APP_ENV == "local"),
+            **_opciones_pool(settings, settings.DB_READ_URL),
+        )
+    return _read_engine
+
+
+async def cerrar_engine_lectura() -> None:
+    """Libera la replica (shutdown, tests que cambian DB_READ_URL)."""
+    global _read_engine, _read_session_factory
+    if _read_engine is not None:
+        await _read_engine.dispose()
+    _read_engine = None
+    _read_session_factory = None
+
+
 def _get_session_factory():
     global _async_session_factory
     if _async_session_factory is None:
         _async_session_factory = async_sessionmaker(
-            _get_engine(),
+            get_engine(),
             class_=AsyncSession,
             expire_on_commit=False,
         )
     return _async_session_factory
 
 
-# Propiedades de acceso para codigo que necesite el engine directamente
-@property
-def engine():
-    return _get_engine()
+def _get_read_session_factory():
+    global _read_session_factory
+    if _read_session_factory is None:
+        _read_session_factory = async_sessionmaker(
+            get_read_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _read_session_factory
+
+
+def estado_pool(lectura: bool = False) -> dict | None:
+    """Estado actual del pool (primario o replica); None si el engine aun no existe."""
+    engine = _read_engine if lectura else _engine
+    if engine is None:
+        return None
+    pool = engine.sync_engine.pool
+    estado = {"clase": type(pool).__name__}
+    for nombre in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, nombre, None)
+        if callable(fn):
+            estado[nombre] = fn()
+    if isinstance(pool, QueuePool):
+        estado["max_overflow"] = pool._max_overflow
+        estado["timeout"] = pool._timeout
+        estado["recycle"] = pool._recycle
+        estado["pre_ping"] = pool._pre_ping
+    return estado
 
 
 async def get_db() -> AsyncSession:  # type: ignore[misc]
@@ -66,3 +162,26 @@ async def get_db() -> AsyncSession:  # type: ignore[misc]
             raise
         finally:
             await session.close()
+
+
+def leer_del_primario(request: Request) -> bool:
+    """El cliente escribio hace poco (cookie) o pide explicitamente el primario."""
+    return PIN_COOKIE_NAME in request.cookies or request.headers.get(PIN_HEADER_NAME) == "1"
+
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> AsyncSession:  # type: ignore[misc]
+    """
+    Sesion para rutas de solo lectura. Sin replica o con pin al primario
+    reutiliza get_db (la misma sesion que get_current_user, sin conexion
+    extra); si no, una sesion de la replica que nunca confirma.
+    """
+    if get_read_engine() is None or leer_del_primario(request):
+        yield db
+        return
+    factory = _get_read_session_factory()
+    async with factory() as session:
+        session.info["replica"] = True
+        yield session
@@ -7,8 +7,9 @@ Ref: docs/claude/02_module_specs.md (M0)
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.config import settings
 from app.api.auth import router as auth_router
@@ -16,9 +17,12 @@ from app.api.solicitudes import router as solicitudes_router
 from app.api.archivos import router as archivos_router
 from app.api.promotores import router as promotores_router
 from app.api.empleados import router as empleados_router
+from app.api.bootstrap import router as bootstrap_router
 from app.api.admin import router as admin_router
 from app.api.reportes import router as reportes_router
 from app.api.servicios import router as servicios_router
+from app.middleware.read_pin_middleware import ReadPinMiddleware
+from app.utils.json_rapido import RespuestaJSON
 
 logger = logging.getLogger("cmep")
 
@@ -26,15 +30,37 @@ logger = logging.getLogger("cmep")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("CMEP backend starting — env=%s", settings.APP_ENV)
+    if settings.METRICS_ENABLED and not settings.metrics_expuestas:
+        logger.warning("GET /metrics deshabilitado: definir METRICS_TOKEN para exponerlo fuera de local")
     # SQLite local: crear tablas automaticamente si no existen
     if settings.is_sqlite:
-        from app.database import Base, _get_engine
+        from app.database import Base, get_engine
         import app.models  # noqa: F401 — registrar modelos en metadata
-        engine = _get_engine()
+        engine = get_engine()
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
         logger.info("SQLite: tablas creadas/verificadas en %s", settings.DATABASE_URL)
+    # Worker de jobs in-process (desactivar si se usa `python -m app.worker`)
+    worker = None
+    if settings.JOBS_WORKER_ENABLED:
+        from app.services.jobs import JobWorker
+        worker = JobWorker()
+        worker.start()
+    # Tareas periodicas (limpieza de sesiones, purga de jobs); un solo lider
+    scheduler = None
+    if settings.SCHEDULER_ENABLED:
+        from app.services.scheduler import PeriodicScheduler
+        scheduler = PeriodicScheduler()
+        scheduler.start()
     yield
+    if scheduler is not None:
+        await scheduler.stop()
+    if worker is not None:
+        await worker.stop()
+        from app.services.derivados import shutdown_pool
+        shutdown_pool()
+    from app.database import cerrar_engine_lectura
+    await cerrar_engine_lectura()
     logger.info("CMEP backend shutting down")
 
 
@@ -42,6 +68,7 @@ app = FastAPI(
     title="CMEP API",
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=RespuestaJSON,  # orjson (app.utils.json_rapido)
 )
 
 # --- CORS (Ref: risk R-001) ---
@@ -53,6 +80,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Compresion gzip/br de respuestas (dentro de metricas: su costo se mide) ---
+if settings.COMPRESSION_ENABLED:
+    from app.middleware.compression_middleware import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware)
+
+# --- Metricas HTTP (GET /metrics) ---
+if settings.METRICS_ENABLED:
+    from app.middleware.metrics_middleware import MetricsMiddleware
+    app.add_middleware(MetricsMiddleware)
+
+# --- Consultas SQL por request (Server-Timing + log) ---
+if settings.SQL_STATS_ENABLED:
+    from app.middleware.sql_stats_middleware import SQLStatsMiddleware
+    app.add_middleware(SQLStatsMiddleware)
+
+# --- Read-your-writes con replica de lectura (DB_READ_URL) ---
+app.add_middleware(ReadPinMiddleware)
+
 # --- Logging ---
 logging.basicConfig(
     level=logging.INFO,
@@ -69,6 +114,7 @@ app.include_router(empleados_router)  # M4.5
 app.include_router(admin_router)  # M5
 app.include_router(reportes_router)  # M7
 app.include_router(servicios_router)  # Catalogo servicios
+app.include_router(bootstrap_router)  # App shell (usuario + catalogos)
 
 
 # --- Public endpoints (M0) ---
@@ -80,3 +126,15 @@ async def health():
 @app.get("/version")
 async def version():
     return {"ok": True, "version": settings.APP_VERSION}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Metricas en formato de texto de Prometheus (fuera de local exige METRICS_TOKEN)."""
+    from app.services import metricas
+
+    if not settings.metrics_expuestas:
+        return PlainTextResponse("not found\n", status_code=404)
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return PlainTextResponse("unauthorized\n", status_code=401)
+    return PlainTextResponse(metricas.exponer(), media_type="text/plain; version=0.0.4")
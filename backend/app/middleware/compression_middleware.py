@@ -0,0 +1,184 @@
+"""
+Middleware ASGI: compresion negociada de respuestas (br si esta instalado, gzip).
+
+- Solo tipos que comprimen bien (JSON, texto, XML, CSV, SVG) y desde
+  COMPRESSION_MIN_BYTES; niveles bajos (gzip 5, brotli 4): en respuestas
+  dinamicas pesa mas la latencia de comprimir que los ultimos puntos de ratio.
+- No toca respuestas que ya traen Content-Encoding (passthrough gzip de
+  GET /archivos/{id}), descargas (Content-Disposition: attachment), HEAD,
+  204/206/304 ni endpoints marcados con @sin_compresion.
+- Streaming: cada chunk se comprime y se vacia (sync flush) al llegar; el
+  cliente recibe datos a medida que se generan, sin bufferizar el exporte.
+- Cuerpos grandes de un solo mensaje se comprimen en un hilo (zlib y brotli
+  liberan el GIL) para no bloquear el event loop.
+
+Middleware ASGI puro (no BaseHTTPMiddleware), como el de metricas.
+"""
+
+import asyncio
+import zlib
+
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # opcional: pip install brotli
+    brotli = None
+
+# Tipos comprimibles ademas de text/*
+_COMPRIMIBLES = {
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+_SIN_CUERPO = {204, 206, 304}
+_EN_HILO_BYTES = 256 * 1024
+
+
+def sin_compresion(endpoint):
+    """Marca un endpoint cuya respuesta nunca se comprime (opt-out por ruta)."""
+    endpoint.sin_compresion = True
+    return endpoint
+
+
+def _calidades(accept_encoding: str) -> dict[str, float]:
+    calidades: dict[str, float] = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, params = parte.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if nombre:
+            calidades[nombre] = q
+    return calidades
+
+
+def acepta(accept_encoding: str, codificacion: str) -> bool:
+    """True si Accept-Encoding admite `codificacion` con q > 0 (directo o por '*')."""
+    calidades = _calidades(accept_encoding)
+    return calidades.get(codificacion, calidades.get("*", 0.0)) > 0
+
+
+def negociar(accept_encoding: str) -> str | None:
+    """'br' o 'gzip' segun Accept-Encoding (q-values); None si ninguno es aceptable."""
+    calidades = _calidades(accept_encoding)
+    comodin = calidades.get("*", 0.0)
+    q_br = calidades.get("br", comodin) if brotli is not None else 0.0
+    q_gzip = calidades.get("gzip", comodin)
+    if q_br > 0 and q_br >= q_gzip:
+        return "br"
+    if q_gzip > 0:
+        return "gzip"
+    return None
+
+
+class _Codificador:
+    def __init__(self, codificacion: str):
+        if codificacion == "br":
+            self._c = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 31: formato gzip (cabecera + CRC)
+            self._c = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        self.br = codificacion == "br"
+
+    def chunk(self, datos: bytes) -> bytes:
+        """Comprime y vacia: el cliente puede decodificar todo lo enviado hasta aqui."""
+        if self.br:
+            return self._c.process(datos) + self._c.flush()
+        return self._c.compress(datos) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def final(self, datos: bytes = b"") -> bytes:
+        if self.br:
+            return self._c.process(datos) + self._c.finish()
+        return self._c.compress(datos) + self._c.flush()
+
+
+def _comprimible(scope, headers: MutableHeaders, status: int) -> bool:
+    if status in _SIN_CUERPO or "content-encoding" in headers:
+        return False
+    if "attachment" in headers.get("content-disposition", ""):
+        return False
+    if getattr(scope.get("endpoint"), "sin_compresion", False):
+        return False
+    tipo = headers.get("content-type", "").split(";")[0].strip().lower()
+    return tipo.startswith("text/") or tipo in _COMPRIMIBLES
+
+
+def _marcar(headers: MutableHeaders, codificacion: str) -> None:
+    headers["Content-Encoding"] = codificacion
+    headers.add_vary_header("Accept-Encoding")
+    # El cuerpo cambia: un ETag fuerte ya no identifica estos bytes
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not settings.COMPRESSION_ENABLED:
+            return await self.app(scope, receive, send)
+        accept = ""
+        for nombre, valor in scope["headers"]:
+            if nombre == b"accept-encoding":
+                accept = valor.decode("latin-1")
+                break
+        codificacion = negociar(accept) if accept else None
+        if codificacion is None:
+            return await self.app(scope, receive, send)
+
+        inicio = None          # http.response.start retenido hasta ver el primer chunk
+        modo = None            # None: por decidir | "pasar" | "streaming"
+        codificador = None
+
+        async def _send(message):
+            nonlocal inicio, modo, codificador
+            tipo = message["type"]
+            if tipo == "http.response.start":
+                inicio = message
+                return
+            if tipo != "http.response.body" or modo == "pasar":
+                return await send(message)
+
+            cuerpo = message.get("body", b"")
+            mas = message.get("more_body", False)
+
+            if modo is None:
+                headers = MutableHeaders(scope=inicio)
+                if not _comprimible(scope, headers, inicio["status"]) or (
+                    not mas and len(cuerpo) < settings.COMPRESSION_MIN_BYTES
+                ):
+                    modo = "pasar"
+                    await send(inicio)
+                    return await send(message)
+
+                codificador = _Codificador(codificacion)
+                _marcar(headers, codificacion)
+                if not mas:
+                    # Cuerpo completo en un mensaje (JSON): una sola pasada
+                    if len(cuerpo) >= _EN_HILO_BYTES:
+                        comprimido = await asyncio.to_thread(codificador.final, cuerpo)
+                    else:
+                        comprimido = codificador.final(cuerpo)
+                    headers["Content-Length"] = str(len(comprimido))
+                    await send(inicio)
+                    return await send({"type": "http.response.body", "body": comprimido})
+                modo = "streaming"
+                del headers["Content-Length"]
+                await send(inicio)
+
+            # Streaming: comprimir y vaciar cada chunk al llegar
+            datos = codificador.chunk(cuerpo) if mas else codificador.final(cuerpo)
+            await send({"type": "http.response.body", "body": datos, "more_body": mas})
+
+        await self.app(scope, receive, _send)
@@ -0,0 +1,61 @@
+"""
+Middleware ASGI de metricas HTTP (ver app.services.metricas).
+
+Etiqueta por plantilla de ruta (/solicitudes/{solicitud_id}), no por path
+real: la cardinalidad queda acotada por la cantidad de endpoints. Rutas sin
+match se agrupan como "<unmatched>". Middleware ASGI puro (no
+BaseHTTPMiddleware): no altera el streaming de respuestas.
+"""
+
+import time
+
+from app.services import metricas
+
+
+_plantillas: dict = {}  # endpoint -> path de la ruta
+
+
+def plantilla_ruta(scope) -> str:
+    """Plantilla de la ruta resuelta por el router ("<unmatched>" si no hubo)."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "<unmatched>"
+    plantilla = _plantillas.get(endpoint)
+    if plantilla is None:
+        # El router deja endpoint en el scope; su ruta da la plantilla
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                plantilla = route.path
+                break
+        else:
+            plantilla = "<unmatched>"
+        _plantillas[endpoint] = plantilla
+    return plantilla
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        inicio = time.perf_counter()
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metricas.http_en_vuelo.inc()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            metricas.http_en_vuelo.dec()
+            ruta = plantilla_ruta(scope)
+            metodo = scope["method"]
+            metricas.http_duracion.observe(metodo, ruta, valor=time.perf_counter() - inicio)
+            metricas.http_requests.inc(metodo, ruta, str(status))
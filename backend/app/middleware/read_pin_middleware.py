@@ -0,0 +1,52 @@
+"""
+Middleware ASGI: read-your-writes con replica de lectura (DB_READ_URL).
+
+Tras una escritura exitosa (metodo no seguro, status < 400) fija la cookie
+PIN_COOKIE_NAME por DB_READ_PIN_SECONDS; mientras exista, get_read_db
+entrega la sesion del primario y el cliente ve sus propios cambios aunque
+la replica tenga retraso. Sin DB_READ_URL no hace nada.
+"""
+
+from app.config import settings
+from app.database import PIN_COOKIE_NAME
+
+_METODOS_SEGUROS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _cookie_pin() -> bytes:
+    # Mismos atributos que la cookie de sesion (app.api.auth.login)
+    partes = [
+        f"{PIN_COOKIE_NAME}=1",
+        f"Max-Age={settings.DB_READ_PIN_SECONDS}",
+        "Path=/",
+        "HttpOnly",
+    ]
+    if settings.is_prod:
+        partes += ["Secure", "SameSite=none"]
+        if settings.COOKIE_DOMAIN:
+            partes.append(f"Domain={settings.COOKIE_DOMAIN}")
+    else:
+        partes.append("SameSite=lax")
+    return "; ".join(partes).encode("latin-1")
+
+
+class ReadPinMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in _METODOS_SEGUROS
+            or not settings.DB_READ_URL
+        ):
+            return await self.app(scope, receive, send)
+
+        async def _send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", _cookie_pin()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, _send)
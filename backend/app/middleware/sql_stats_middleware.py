@@ -0,0 +1,67 @@
+"""
+Middleware ASGI: consultas SQL y tiempo de BD por request (app.services.sql_stats).
+
+- Header Server-Timing (db = tiempo en BD con la cantidad de consultas,
+  app = tiempo hasta enviar los headers); visible en las devtools.
+- Log por request en app.sql; WARNING si alguna sentencia se repite
+  SQL_NPLUS1_THRESHOLD veces o mas (N+1 probable).
+
+En respuestas streaming el header refleja lo ejecutado hasta enviarse; el
+log, el total del request.
+"""
+
+import logging
+import time
+
+from app.config import settings
+from app.middleware.metrics_middleware import plantilla_ruta
+from app.services import sql_stats
+
+logger = logging.getLogger("app.sql")
+
+
+class SQLStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        inicio = time.perf_counter()
+
+        with sql_stats.medir(scope) as stats:
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    timing = (
+                        f'db;dur={stats.tiempo * 1000:.1f};desc="{stats.consultas} queries", '
+                        f"app;dur={(time.perf_counter() - inicio) * 1000:.1f}"
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1")),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                self._log(scope, stats)
+
+    @staticmethod
+    def _log(scope, stats: sql_stats.EstadisticasSQL) -> None:
+        if not stats.consultas:
+            return
+        ruta = plantilla_ruta(scope)
+        repetidas = stats.repetidas(settings.SQL_NPLUS1_THRESHOLD)
+        if repetidas:
+            sentencia, n = repetidas[0]
+            logger.warning(
+                "N+1 probable en %s %s: %d consultas (%.1f ms); %dx %s",
+                scope["method"], ruta, stats.consultas, stats.tiempo * 1000,
+                n, " ".join(sentencia.split())[:300],
+            )
+        else:
+            logger.info(
+                "%s %s: %d consultas SQL, %.1f ms en BD",
+                scope["method"], ruta, stats.consultas, stats.tiempo * 1000,
+            )
@@ -23,6 +23,7 @@ from app.models.solicitud import (  # noqa: F401
     SolicitudEstadoHistorial,
     PagoSolicitud,
     Archivo,
+    ArchivoContenido,
     SolicitudArchivo,
     ResultadoMedico,
     EstadoPago,
@@ -33,3 +34,5 @@ from app.models.solicitud import (  # noqa: F401
     RolAsignacion,
     TipoArchivo,
 )
+from app.models.job import Job, EstadoJob  # noqa: F401
+from app.models.scheduler import SchedulerLease, TareaProgramada  # noqa: F401
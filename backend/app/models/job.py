@@ -0,0 +1,57 @@
+"""
+Modelo: jobs — cola persistente de tareas en segundo plano (outbox).
+Los jobs se insertan en la misma transaccion que el cambio de negocio
+y los procesa el worker (app.services.jobs / python -m app.worker).
+"""
+
+import enum
+from datetime import datetime
+
+from sqlalchemy import String, Text, Enum, Integer, JSON, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.utils.time import utcnow
+
+
+class EstadoJob(str, enum.Enum):
+    PENDIENTE = "PENDIENTE"
+    EN_PROCESO = "EN_PROCESO"
+    COMPLETADO = "COMPLETADO"
+    FALLIDO = "FALLIDO"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    job_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    # Nombre del handler registrado (ej. "storage.delete")
+    tipo: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+
+    estado: Mapped[str] = mapped_column(
+        Enum(EstadoJob, native_enum=False, values_callable=lambda e: [x.value for x in e]),
+        nullable=False,
+        default=EstadoJob.PENDIENTE.value,
+    )
+    intentos: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_intentos: Mapped[int] = mapped_column(Integer, nullable=False, default=5)
+
+    # No se reclama antes de esta fecha (backoff entre reintentos)
+    ejecutar_desde: Mapped[datetime] = mapped_column(nullable=False, default=utcnow)
+
+    # Lease del worker que lo esta procesando
+    bloqueado_por: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    bloqueado_en: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    ultimo_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    finalizado_en: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    # Auditoria
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+    updated_at: Mapped[datetime | None] = mapped_column(default=utcnow, onupdate=utcnow)
+
+    __table_args__ = (
+        Index("ix_jobs_estado_ejecutar_desde", "estado", "ejecutar_desde"),
+    )
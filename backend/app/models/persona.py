@@ -31,8 +31,9 @@ class Persona(Base):
         nullable=True,
     )
     numero_documento: Mapped[str | None] = mapped_column(String(30), nullable=True)
-    nombres: Mapped[str] = mapped_column(String(150), nullable=False)
-    apellidos: Mapped[str] = mapped_column(String(150), nullable=False)
+    # Indices para busqueda por prefijo (GET /promotores?q=)
+    nombres: Mapped[str] = mapped_column(String(150), nullable=False, index=True)
+    apellidos: Mapped[str] = mapped_column(String(150), nullable=False, index=True)
     fecha_nacimiento: Mapped[datetime | None] = mapped_column(Date, nullable=True)
     email: Mapped[str | None] = mapped_column(String(255), nullable=True)
     celular_1: Mapped[str | None] = mapped_column(String(20), nullable=True)
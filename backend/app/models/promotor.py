@@ -37,10 +37,10 @@ class Promotor(Base):
         ForeignKey("personas.persona_id", onupdate="RESTRICT", ondelete="RESTRICT"),
         nullable=True,
     )
-    # Solo si tipo_promotor = EMPRESA
-    razon_social: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Solo si tipo_promotor = EMPRESA (indexado: busqueda por prefijo)
+    razon_social: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     # Solo si tipo_promotor = OTROS
-    nombre_promotor_otros: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    nombre_promotor_otros: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
 
     # Relationship to Persona (for PERSONA type)
     persona: Mapped["Persona"] = relationship(  # noqa: F821
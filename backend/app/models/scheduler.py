@@ -0,0 +1,34 @@
+"""
+Modelos: scheduler_lease, tareas_programadas.
+Soporte del scheduler periodico in-app (app.services.scheduler):
+- scheduler_lease: fila-candado para elegir un unico lider entre instancias.
+- tareas_programadas: estado de cada tarea (ultima/proxima ejecucion).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import String, Text, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.utils.time import utcnow
+
+
+class SchedulerLease(Base):
+    __tablename__ = "scheduler_lease"
+
+    nombre: Mapped[str] = mapped_column(String(50), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(100), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime | None] = mapped_column(default=utcnow, onupdate=utcnow)
+
+
+class TareaProgramada(Base):
+    __tablename__ = "tareas_programadas"
+
+    nombre: Mapped[str] = mapped_column(String(100), primary_key=True)
+    ultima_ejecucion: Mapped[datetime | None] = mapped_column(nullable=True)
+    proxima_ejecucion: Mapped[datetime] = mapped_column(nullable=False)
+    ultima_duracion_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ultimo_resultado: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    ultimo_error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -1,6 +1,6 @@
 """
 Modelos: solicitud_cmep, solicitud_asignacion, solicitud_estado_historial,
-         pago_solicitud, archivos, solicitud_archivo.
+         pago_solicitud, archivos, archivo_contenido, solicitud_archivo.
 Ref: docs/source/01_glosario_y_enums.md secciones 1.2.5-1.2.7
 Ref: docs/source/02_modelo_de_datos.md (tablas derivadas de secciones 2.2.12+)
 Ref: docs/source/04_acciones_y_reglas_negocio.md (auditoria, pagos, asignaciones)
@@ -296,6 +296,17 @@ class Archivo(Base):
     mime_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     tamano_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    # Contenido deduplicado (NULL: archivo previo a la deduplicacion, key propia)
+    sha256: Mapped[str | None] = mapped_column(
+        ForeignKey("archivo_contenido.sha256", onupdate="RESTRICT", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
+    )
+    # Codec con que esta guardado el objeto (NULL: sin comprimir)
+    codec: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    # Derivados WebP (app.services.derivados); NULL mientras no se generan
+    thumbnail_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    preview_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     # Auditoria
     created_by: Mapped[int | None] = mapped_column(nullable=True)
@@ -304,6 +315,27 @@ class Archivo(Base):
     updated_at: Mapped[datetime | None] = mapped_column(default=utcnow, onupdate=utcnow)
 
 
+# ── archivo_contenido ─────────────────────────────────────────────────
+
+class ArchivoContenido(Base):
+    """
+    Objeto fisico direccionado por contenido (key = sha256). Varios archivos
+    con el mismo contenido comparten un objeto; ref_count cuenta cuantos.
+    ref_count = -1: borrado fisico en curso (ver file_storage).
+    """
+    __tablename__ = "archivo_contenido"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    nombre_storage: Mapped[str] = mapped_column(String(255), nullable=False)
+    storage_path: Mapped[str] = mapped_column(String(500), nullable=False)
+    tamano_bytes: Mapped[int] = mapped_column(Integer, nullable=False)
+    codec: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+    updated_at: Mapped[datetime | None] = mapped_column(default=utcnow, onupdate=utcnow)
+
+
 # ── solicitud_archivo ─────────────────────────────────────────────────
 
 class SolicitudArchivo(Base):
@@ -154,7 +154,8 @@ class Session(Base):
     )
 
     created_at: Mapped[datetime] = mapped_column(default=utcnow, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+    # Indexado: la expiracion periodica borra por rango de expires_at
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
     last_seen_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
 
@@ -0,0 +1,20 @@
+"""
+Schemas Pydantic para archivos (M4): upload presignado directo a S3.
+Ref: docs/source/05_api_y_policy.md (Modulo Archivos MVP)
+"""
+
+from pydantic import BaseModel, Field
+
+
+# ── Request schemas ───────────────────────────────────────────────────
+
+class PresignUploadRequest(BaseModel):
+    nombre: str = Field(..., min_length=1, max_length=255)
+    mime_type: str = Field("application/octet-stream", min_length=1, max_length=100)
+    tamano_bytes: int = Field(..., gt=0)
+    tipo_archivo: str = "OTROS"
+    pago_id: int | None = None
+
+
+class ConfirmUploadRequest(BaseModel):
+    upload_token: str = Field(..., min_length=1)
@@ -4,15 +4,16 @@ Ref: docs/claude/02_module_specs.md (M5)
 """
 
 from fastapi import HTTPException, Depends
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, noload
 
 from app.database import get_db
 from app.middleware.session_middleware import get_current_user
 from app.models.persona import Persona
 from app.models.user import User, UserRole, UserRoleEnum, EstadoUser, Session
 from app.models.empleado import Empleado, MedicoExtra, RolEmpleado, EstadoEmpleado
+from app.services import catalogos
 from app.schemas.admin import CreateUserRequest, UpdateUserRequest, ResetPasswordRequest, AdminUserDTO
 from app.utils.hashing import hash_password
 
@@ -37,8 +38,8 @@ async def require_admin(
 
 # ── Helpers ────────────────────────────────────────────────────────────
 
-def _build_user_dto(user: User, persona: Persona) -> dict:
-    """Construye AdminUserDTO como dict."""
+def _build_user_dto(user: User, persona: Persona, roles: list[str] | None = None) -> dict:
+    """Construye AdminUserDTO como dict (roles: precalculados o de user.roles)."""
     return {
         "user_id": user.user_id,
         "user_email": user.user_email,
@@ -55,26 +56,23 @@ def _build_user_dto(user: User, persona: Persona) -> dict:
         "fecha_nacimiento": persona.fecha_nacimiento,
         "direccion": persona.direccion,
         "comentario": persona.comentario,
-        "roles": [r.user_role for r in user.roles],
+        "roles": roles if roles is not None else [r.user_role for r in user.roles],
         "created_at": user.created_at.isoformat() if user.created_at else None,
     }
 
 
 async def _load_user_with_persona(db: AsyncSession, user_id: int) -> tuple[User, Persona]:
-    """Carga User + Persona o lanza 404."""
-    stmt = select(User).where(User.user_id == user_id).options(selectinload(User.roles))
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
-    if not user:
+    """Carga User + Persona (un JOIN) o lanza 404."""
+    stmt = (
+        select(User, Persona)
+        .join(Persona, Persona.persona_id == User.persona_id)
+        .where(User.user_id == user_id)
+        .options(selectinload(User.roles))
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Usuario no encontrado")
-
-    p_stmt = select(Persona).where(Persona.persona_id == user.persona_id)
-    p_result = await db.execute(p_stmt)
-    persona = p_result.scalar_one_or_none()
-    if not persona:
-        raise HTTPException(status_code=404, detail="Persona no encontrada")
-
-    return user, persona
+    return row.User, row.Persona
 
 
 def _validate_roles(roles: list[str]) -> None:
@@ -89,21 +87,67 @@ def _validate_roles(roles: list[str]) -> None:
 
 # ── list_users ─────────────────────────────────────────────────────────
 
-async def list_users(db: AsyncSession) -> list[dict]:
-    """Lista todos los usuarios con persona y roles."""
-    stmt = select(User).options(selectinload(User.roles)).order_by(User.user_id)
-    result = await db.execute(stmt)
-    users = result.scalars().all()
+async def list_users(
+    db: AsyncSession,
+    page: int = 1,
+    page_size: int = 50,
+    rol: str | None = None,
+    estado: str | None = None,
+) -> tuple[list[dict], int]:
+    """
+    Lista usuarios con persona y roles en una sola query: JOIN a personas,
+    roles agregados con GROUP_CONCAT y total con COUNT(*) OVER ().
+    Retorna (items, total).
+    """
+    if rol is not None:
+        _validate_roles([rol])
+    if estado is not None and estado not in {e.value for e in EstadoUser}:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Estado invalido: {estado}. Validos: {', '.join(e.value for e in EstadoUser)}",
+        )
 
-    items = []
-    for user in users:
-        p_stmt = select(Persona).where(Persona.persona_id == user.persona_id)
-        p_result = await db.execute(p_stmt)
-        persona = p_result.scalar_one_or_none()
-        if persona:
-            items.append(_build_user_dto(user, persona))
+    roles_col = (
+        select(func.group_concat(UserRole.user_role))
+        .where(UserRole.user_id == User.user_id)
+        .correlate(User)
+        .scalar_subquery()
+        .label("roles")
+    )
+    filtros = []
+    if rol is not None:
+        filtros.append(exists().where(UserRole.user_id == User.user_id, UserRole.user_role == rol))
+    if estado is not None:
+        filtros.append(User.estado == estado)
+
+    stmt = (
+        select(User, Persona, roles_col, func.count().over().label("total"))
+        .join(Persona, Persona.persona_id == User.persona_id)
+        .where(*filtros)
+        # Roles y permisos ya vienen en roles_col: evitar las cargas selectin
+        .options(noload(User.roles), noload(User.permissions))
+        .order_by(User.user_id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
 
-    return items
+    rows = (await db.execute(stmt)).all()
+    items = [
+        _build_user_dto(r.User, r.Persona, sorted(r.roles.split(",")) if r.roles else [])
+        for r in rows
+    ]
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        # Pagina fuera de rango: el total no viene en ninguna fila
+        total = (await db.execute(
+            select(func.count()).select_from(User)
+            .join(Persona, Persona.persona_id == User.persona_id)
+            .where(*filtros)
+        )).scalar_one()
+    else:
+        total = 0
+    return items, total
 
 
 # ── create_user ────────────────────────────────────────────────────────
@@ -208,6 +252,7 @@ async def create_user(db: AsyncSession, data: CreateUserRequest, admin_user_id:
             ))
 
     await db.flush()
+    catalogos.invalidar(db, "empleados")
 
     # Reload user with roles
     user, persona = await _load_user_with_persona(db, user.user_id)
@@ -302,6 +347,8 @@ async def update_user(
             await db.execute(delete(Session).where(Session.user_id == user_id))
 
     await db.flush()
+    # Roles -> empleados; nombres de persona -> selectores de empleados y promotores
+    catalogos.invalidar(db, "empleados", "promotores")
 
     # Expire stale cached relationships before reload
     db.expire_all()
@@ -0,0 +1,111 @@
+"""
+ZIP en streaming con los adjuntos de una solicitud.
+
+- Lee los objetos del storage con una ventana acotada de lecturas
+  concurrentes (ZIP_FETCH_WINDOW) y escribe las entradas en orden.
+- zipfile sobre un sink no seekable (data descriptors): cada entrada se
+  emite apenas se escribe; nunca se arma el ZIP completo en memoria.
+  Memoria maxima ~ ventana x tamano de archivo.
+- Objetos faltantes en storage no cortan la descarga: se listan en
+  FALTANTES.txt al final del ZIP.
+"""
+
+import asyncio
+import zipfile
+from collections import deque
+from pathlib import PurePosixPath
+from typing import AsyncIterator
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.file_storage import read_content
+from app.utils.compresion import es_comprimible
+
+
+class _Sink:
+    """Destino no seekable de zipfile: acumula bytes hasta que se drenan."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _nombres_unicos(nombres: list[str]) -> list[str]:
+    """Evita entradas repetidas: informe.pdf, informe (2).pdf, ..."""
+    usados: set[str] = set()
+    out = []
+    for nombre in nombres:
+        base = PurePosixPath(nombre.replace("\\", "/")).name or "archivo"
+        candidato, n = base, 1
+        while candidato.lower() in usados:
+            n += 1
+            p = PurePosixPath(base)
+            candidato = f"{p.stem} ({n}){p.suffix}"
+        usados.add(candidato.lower())
+        out.append(candidato)
+    return out
+
+
+def _escribir_entrada(zf: zipfile.ZipFile, nombre: str, data: bytes, mime: str | None) -> None:
+    metodo = zipfile.ZIP_DEFLATED if es_comprimible(mime) else zipfile.ZIP_STORED
+    zf.writestr(zipfile.ZipInfo(nombre), data, compress_type=metodo)
+
+
+async def stream_zip(archivos: list[dict], window: int | None = None) -> AsyncIterator[bytes]:
+    """
+    archivos: dicts con nombre, storage_path, codec y mime_type, en el orden
+    de las entradas. Genera el ZIP por partes.
+    """
+    window = window or settings.ZIP_FETCH_WINDOW
+    nombres = _nombres_unicos([a["nombre"] for a in archivos])
+
+    async def _leer(a: dict) -> bytes | None:
+        try:
+            return await read_content(a["storage_path"], a["codec"])
+        except FileNotFoundError:
+            return None
+
+    sink = _Sink()
+    zf = zipfile.ZipFile(sink, mode="w", allowZip64=True)
+    pendientes: deque[asyncio.Task] = deque()
+    siguiente = 0
+    faltantes: list[str] = []
+    try:
+        for i, archivo in enumerate(archivos):
+            # Mantener la ventana llena: hasta `window` lecturas en vuelo
+            while siguiente < len(archivos) and len(pendientes) < window:
+                pendientes.append(asyncio.ensure_future(_leer(archivos[siguiente])))
+                siguiente += 1
+            data = await pendientes.popleft()
+            if data is None:
+                faltantes.append(nombres[i])
+                continue
+            await run_in_threadpool(_escribir_entrada, zf, nombres[i], data, archivo["mime_type"])
+            del data
+            yield sink.drain()
+
+        if faltantes:
+            zf.writestr("FALTANTES.txt", "Archivos no encontrados en storage:\n" + "\n".join(faltantes) + "\n")
+        zf.close()
+        yield sink.drain()
+    finally:
+        # Cliente desconectado a mitad: cancelar lecturas en vuelo
+        for task in pendientes:
+            task.cancel()
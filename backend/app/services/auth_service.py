@@ -102,6 +102,28 @@ async def invalidate_user_sessions(db: AsyncSession, user_id: int) -> None:
     await db.flush()
 
 
+async def delete_expired_sessions(db: AsyncSession, limit: int) -> int:
+    """
+    Borra un lote de hasta `limit` sesiones expiradas (por PK, usando el
+    indice de expires_at). Retorna cuantas borro; el llamador hace COMMIT
+    por lote para no retener locks sobre toda la tabla.
+    """
+    ids = (await db.execute(
+        select(Session.session_id)
+        .where(Session.expires_at < utcnow())
+        .order_by(Session.expires_at)
+        .limit(limit)
+    )).scalars().all()
+    if not ids:
+        return 0
+    await db.execute(
+        delete(Session)
+        .where(Session.session_id.in_(ids))
+        .execution_options(synchronize_session=False)
+    )
+    return len(ids)
+
+
 def build_user_dto(user: User) -> dict:
     """
     Construye UserDTO para respuestas de auth.
@@ -0,0 +1,248 @@
+"""
+Cache de datos de referencia (catalogos) para los selectores de formularios.
+
+- Un snapshot en memoria por catalogo: servicios, empleados, promotores.
+- Versionado: las escrituras marcan el catalogo con invalidar(db, ...) y la
+  version sube recien al confirmarse la transaccion (after_commit); un
+  snapshot cargado antes del commit nunca queda como vigente.
+- REFDATA_CACHE_TTL_SECONDS acota la desactualizacion frente a escrituras
+  de otras instancias o directas en la BD.
+- Cargado desde la replica de lectura (get_read_db) poco despues de una
+  invalidacion, el snapshot se sirve pero no se publica: la replica puede
+  no tener aun la escritura y fijaria datos viejos por todo el TTL.
+- ETag = hash del contenido (igual en todas las instancias) + parametros;
+  los endpoints responden 304 si coincide con If-None-Match.
+- create_solicitud (tarifa) y validate_empleado_r10 consultan el snapshot:
+  en regimen estable no tocan la BD.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession
+
+from app.config import settings
+from app.models.empleado import Empleado
+from app.models.persona import Persona
+from app.models.promotor import Promotor
+from app.models.servicio import Servicio
+from app.utils.json_rapido import RespuestaJSON
+
+CATALOGOS = ("servicios", "empleados", "promotores")
+
+
+@dataclass
+class Snapshot:
+    version: int
+    data: list[dict]
+    token: str  # hash del contenido
+    cargado_en: float
+    indices: dict[str, dict] = field(default_factory=dict)
+
+
+_versiones: dict[str, int] = {n: 0 for n in CATALOGOS}
+_invalidado_en: dict[str, float] = {n: 0.0 for n in CATALOGOS}
+_snapshots: dict[str, Snapshot] = {}
+
+
+def reset() -> None:
+    """Descarta todos los snapshots (tests, cambios de BD fuera de la app)."""
+    for nombre in CATALOGOS:
+        _bump(nombre)
+
+
+def _bump(nombre: str) -> None:
+    _versiones[nombre] += 1
+    _invalidado_en[nombre] = time.monotonic()
+    _snapshots.pop(nombre, None)
+
+
+# ── Invalidacion transaccional ──────────────────────────────────────────
+
+_INFO_KEY = "catalogos_invalidar"
+
+
+def invalidar(db: AsyncSession, *nombres: str) -> None:
+    """Marca catalogos a invalidar cuando la transaccion de `db` confirme."""
+    db.info.setdefault(_INFO_KEY, set()).update(nombres)
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _al_confirmar(session: OrmSession) -> None:
+    for nombre in session.info.pop(_INFO_KEY, ()):
+        _bump(nombre)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _al_revertir(session: OrmSession) -> None:
+    session.info.pop(_INFO_KEY, None)
+
+
+# ── Cargadores ──────────────────────────────────────────────────────────
+
+def nombre_promotor(
+    tipo_promotor: str,
+    persona_nombres: str | None,
+    persona_apellidos: str | None,
+    razon_social: str | None,
+    nombre_promotor_otros: str | None,
+    fuente_promotor: str | None,
+) -> str:
+    if tipo_promotor == "PERSONA" and persona_nombres is not None:
+        return f"{persona_nombres} {persona_apellidos}"
+    if tipo_promotor == "EMPRESA":
+        return razon_social or "?"
+    return nombre_promotor_otros or fuente_promotor or "?"
+
+
+async def _cargar_servicios(db: AsyncSession) -> list[dict]:
+    rows = (await db.execute(
+        select(Servicio.servicio_id, Servicio.descripcion_servicio,
+               Servicio.tarifa_servicio, Servicio.moneda_tarifa)
+        .order_by(Servicio.servicio_id)
+    )).all()
+    return [
+        {
+            "servicio_id": r.servicio_id,
+            "descripcion_servicio": r.descripcion_servicio,
+            "tarifa_servicio": str(r.tarifa_servicio),
+            "moneda_tarifa": r.moneda_tarifa,
+        }
+        for r in rows
+    ]
+
+
+async def _cargar_empleados(db: AsyncSession) -> list[dict]:
+    rows = (await db.execute(
+        select(Empleado.persona_id, Empleado.rol_empleado, Empleado.estado_empleado,
+               Persona.nombres, Persona.apellidos)
+        .join(Persona, Persona.persona_id == Empleado.persona_id)
+        .order_by(Empleado.empleado_id)
+    )).all()
+    return [
+        {
+            "persona_id": r.persona_id,
+            "nombre": f"{r.nombres} {r.apellidos}",
+            "rol": r.rol_empleado,
+            "estado": r.estado_empleado,
+        }
+        for r in rows
+    ]
+
+
+async def _cargar_promotores(db: AsyncSession) -> list[dict]:
+    rows = (await db.execute(
+        select(Promotor.promotor_id, Promotor.tipo_promotor, Promotor.razon_social,
+               Promotor.nombre_promotor_otros, Promotor.fuente_promotor,
+               Persona.nombres, Persona.apellidos)
+        .outerjoin(Persona, Persona.persona_id == Promotor.persona_id)
+        .order_by(Promotor.promotor_id)
+    )).all()
+    return [
+        {
+            "promotor_id": r.promotor_id,
+            "tipo_promotor": r.tipo_promotor,
+            "nombre": nombre_promotor(
+                r.tipo_promotor, r.nombres, r.apellidos,
+                r.razon_social, r.nombre_promotor_otros, r.fuente_promotor,
+            ),
+            # Campos de busqueda por prefijo (mismos que GET /promotores?q=)
+            "_buscar": [
+                c.casefold() for c in
+                (r.razon_social, r.nombre_promotor_otros, r.nombres, r.apellidos) if c
+            ],
+        }
+        for r in rows
+    ]
+
+
+def _indexar(nombre: str, data: list[dict]) -> dict[str, dict]:
+    if nombre == "servicios":
+        return {"por_id": {s["servicio_id"]: s for s in data}}
+    if nombre == "empleados":
+        return {"por_persona_rol": {(e["persona_id"], e["rol"]): e for e in data}}
+    return {}
+
+
+_CARGADORES: dict[str, Callable] = {
+    "servicios": _cargar_servicios,
+    "empleados": _cargar_empleados,
+    "promotores": _cargar_promotores,
+}
+
+
+def _replica_atrasada(db: AsyncSession, nombre: str) -> bool:
+    return (
+        db.info.get("replica", False)
+        and time.monotonic() - _invalidado_en[nombre] < settings.DB_READ_PIN_SECONDS
+    )
+
+
+async def obtener(db: AsyncSession, nombre: str) -> Snapshot:
+    """Snapshot vigente del catalogo; lo (re)carga con `db` si no hay o expiro."""
+    snap = _snapshots.get(nombre)
+    if snap and time.monotonic() - snap.cargado_en < settings.REFDATA_CACHE_TTL_SECONDS:
+        return snap
+
+    version = _versiones[nombre]
+    data = await _CARGADORES[nombre](db)
+    token = hashlib.sha1(
+        json.dumps(data, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    snap = Snapshot(version, data, token, time.monotonic(), _indexar(nombre, data))
+    # Si hubo una escritura confirmada durante la carga, no publicar el snapshot
+    if _versiones[nombre] == version and not _replica_atrasada(db, nombre):
+        _snapshots[nombre] = snap
+    return snap
+
+
+# ── Consultas internas ──────────────────────────────────────────────────
+
+async def servicio(db: AsyncSession, servicio_id: int) -> dict | None:
+    return (await obtener(db, "servicios")).indices["por_id"].get(servicio_id)
+
+
+async def empleado(db: AsyncSession, persona_id: int, rol: str) -> dict | None:
+    return (await obtener(db, "empleados")).indices["por_persona_rol"].get((persona_id, rol))
+
+
+def buscar_promotores(
+    snap: Snapshot, q: str | None, cursor: int | None, limit: int,
+) -> tuple[list[dict], int | None]:
+    """Prefijo + cursor + limite sobre el snapshot (semantica de GET /promotores)."""
+    prefijo = q.strip().casefold() if q and q.strip() else None
+    items = []
+    for p in snap.data:
+        if cursor is not None and p["promotor_id"] <= cursor:
+            continue
+        if prefijo and not any(c.startswith(prefijo) for c in p["_buscar"]):
+            continue
+        items.append({k: v for k, v in p.items() if k != "_buscar"})
+        if len(items) > limit:
+            break
+    hay_mas = len(items) > limit
+    items = items[:limit]
+    return items, (items[-1]["promotor_id"] if hay_mas else None)
+
+
+# ── Respuestas con ETag ─────────────────────────────────────────────────
+
+def etag(snap: Snapshot, *params: Any) -> str:
+    extra = hashlib.sha1(repr(params).encode()).hexdigest()[:8] if params else "0"
+    return f'W/"{snap.token}-{extra}"'
+
+
+def respuesta_condicional(request: Request, tag: str, construir: Callable[[], Any]) -> Response:
+    """304 si If-None-Match coincide; si no, el JSON de construir() con su ETag."""
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if tag in {t.strip() for t in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    return RespuestaJSON(construir(), headers=headers)
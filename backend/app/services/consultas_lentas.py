@@ -0,0 +1,202 @@
+"""
+Log de consultas lentas con plan de ejecucion.
+
+- Toda sentencia que tarda SLOW_QUERY_MS o mas se loguea (WARNING, logger
+  app.sql.lenta) con: duracion, plantilla de ruta del request (o "-" fuera
+  de requests), funcion de la app que la origino y parametros ligados con
+  los datos personales redactados.
+- Para SELECT se captura el plan en una tarea aparte (no demora el request):
+  EXPLAIN QUERY PLAN en SQLite, EXPLAIN en MySQL, sobre otra conexion del
+  pool. Rate limit: cada sentencia a lo sumo una vez por
+  SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS y como maximo
+  SLOW_QUERY_EXPLAIN_CONCURRENCY planes en vuelo; el resto se omite.
+  Con StaticPool (SQLite en memoria, tests) no hay otra conexion: sin plan.
+- Log y plan comparten un id (q=<hash de la sentencia>) para correlacionarlos.
+"""
+
+import asyncio
+import hashlib
+import logging
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.services import sql_stats
+
+logger = logging.getLogger("app.sql.lenta")
+
+# Fragmentos de nombres de parametro con datos personales o clinicos
+_SENSIBLES = (
+    "documento", "nombre", "apellido", "email", "celular", "telefono",
+    "direccion", "nacimiento", "password", "hash", "session", "token",
+    "ruc", "razon_social", "comentario", "diagnostico", "observacion",
+    "resultado", "recomendacion", "referencia", "motivo",
+)
+
+# Modulos que nunca son "el llamador" (infraestructura de BD y de medicion)
+_INFRA = (
+    "app.database", "app.services.sql_stats", "app.services.consultas_lentas",
+    "app.middleware",
+)
+
+
+# ── Redaccion de parametros ─────────────────────────────────────────────
+
+def _redactar(nombre: str | None, valor) -> str:
+    if valor is None or isinstance(valor, bool):
+        return repr(valor)
+    if nombre and any(s in nombre.lower() for s in _SENSIBLES):
+        return "<redactado>"
+    if isinstance(valor, (int, float, Decimal)):
+        return repr(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, (bytes, bytearray, memoryview)):
+        return f"<bytes len={len(valor)}>"
+    if isinstance(valor, str) and nombre and not nombre.startswith("param_"):
+        # Columnas no sensibles (estado, rol, codigo...): visibles, truncadas
+        return repr(valor[:40])
+    # Sin nombre confiable (parametro anonimo, SQL textual): no exponer
+    return f"<{type(valor).__name__} len={len(valor)}>" if hasattr(valor, "__len__") else "<redactado>"
+
+
+def parametros_redactados(context, parameters, executemany: bool) -> str:
+    if executemany:
+        return f"<executemany: {len(parameters)} filas>"
+    if not parameters:
+        return "{}"
+    if isinstance(parameters, dict):
+        pares = list(parameters.items())
+    else:
+        compiled = getattr(context, "compiled", None)
+        nombres = getattr(compiled, "positiontup", None) or ()
+        if len(nombres) != len(parameters):
+            # IN expandidos o SQL textual: los nombres no se alinean
+            nombres = [None] * len(parameters)
+        pares = list(zip(nombres, parameters))
+    return "{" + ", ".join(
+        f"{nombre or f'${i}'}: {_redactar(nombre, valor)}"
+        for i, (nombre, valor) in enumerate(pares, 1)
+    ) + "}"
+
+
+# ── Contexto: llamador y ruta ───────────────────────────────────────────
+
+def _frames():
+    """Frames del greenlet actual y de sus padres (el async que espera la BD)."""
+    frame = sys._getframe(2)
+    actual = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        actual = actual.parent
+        if actual is None:
+            return
+        frame = actual.gr_frame
+
+
+def llamador() -> str:
+    """Primera funcion de la app (fuera de la infraestructura) en la pila."""
+    for frame in _frames():
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.") and not modulo.startswith(_INFRA):
+            return f"{modulo}.{frame.f_code.co_name}:{frame.f_lineno}"
+    return "-"
+
+
+def _ruta() -> str:
+    stats = sql_stats.actual()
+    if stats is None or stats.scope is None:
+        return "-"
+    from app.middleware.metrics_middleware import plantilla_ruta
+
+    return f"{stats.scope['method']} {plantilla_ruta(stats.scope)}"
+
+
+# ── EXPLAIN asincrono ───────────────────────────────────────────────────
+
+_ultimo_explain: dict[str, float] = {}
+_tareas: set[asyncio.Task] = set()
+
+
+def _explain_sql(dialecto: str, statement: str) -> str | None:
+    if dialecto == "sqlite":
+        return f"EXPLAIN QUERY PLAN {statement}"
+    if dialecto in ("mysql", "mariadb"):
+        return f"EXPLAIN {statement}"
+    return None
+
+
+def _programar_explain(conn, statement: str, parameters, qid: str) -> None:
+    engine = conn.engine
+    sql = _explain_sql(engine.dialect.name, statement)
+    if sql is None or isinstance(engine.pool, StaticPool):
+        return
+    ahora = time.monotonic()
+    if ahora - _ultimo_explain.get(qid, float("-inf")) < settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS:
+        return
+    if len(_tareas) >= settings.SLOW_QUERY_EXPLAIN_CONCURRENCY:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return  # engine sync fuera del event loop
+    _ultimo_explain[qid] = ahora
+    tarea = loop.create_task(_explicar(engine, sql, parameters, qid))
+    _tareas.add(tarea)
+    tarea.add_done_callback(_tareas.discard)
+
+
+async def _explicar(engine, sql: str, parameters, qid: str) -> None:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    try:
+        async with AsyncEngine(engine).connect() as conn:
+            filas = (await conn.exec_driver_sql(sql, parameters)).all()
+    except Exception as e:
+        logger.info("EXPLAIN no disponible [q=%s]: %s", qid, e)
+        return
+    plan = "\n".join("  " + " | ".join(str(c) for c in fila) for fila in filas)
+    logger.warning("Plan de consulta lenta [q=%s]:\n%s", qid, plan)
+
+
+async def esperar_planes() -> None:
+    """Espera los EXPLAIN en curso (tests, apagado ordenado)."""
+    if _tareas:
+        await asyncio.gather(*list(_tareas), return_exceptions=True)
+
+
+def reset() -> None:
+    _ultimo_explain.clear()
+
+
+# ── Listener ────────────────────────────────────────────────────────────
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _al_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    umbral = settings.SLOW_QUERY_MS
+    if umbral <= 0:
+        return
+    segundos = sql_stats.duracion(context)
+    if segundos is None or segundos * 1000 < umbral:
+        return
+    if statement.lstrip()[:7].upper() == "EXPLAIN":
+        return
+
+    qid = hashlib.sha1(statement.encode()).hexdigest()[:10]
+    logger.warning(
+        "Consulta lenta %.1f ms [q=%s] ruta=%s llamador=%s\n  %s\n  parametros=%s",
+        segundos * 1000, qid, _ruta(), llamador(),
+        " ".join(statement.split()),
+        parametros_redactados(context, parameters, executemany),
+    )
+    if not executemany and statement.lstrip()[:6].upper() == "SELECT":
+        _programar_explain(conn, statement, parameters, qid)
@@ -0,0 +1,129 @@
+"""
+Derivados de archivos: miniatura y vista previa WebP.
+
+- Al subir una imagen o PDF se encola el job archivos.derivados.
+- El job lee el original, renderiza en un ProcessPoolExecutor (CPU fuera del
+  event loop y del GIL) y guarda los derivados junto al original:
+  <nombre_storage>.thumb.webp y <nombre_storage>.preview.webp.
+- Con contenido deduplicado los derivados se generan una sola vez por sha256
+  y se comparten entre todos los archivos con ese contenido.
+- Se sirven desde GET /archivos/{id}/thumbnail.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.solicitud import Archivo
+from app.services.file_storage import read_content, save_file
+from app.services.jobs import job_handler, enqueue_job, job_session_factory
+from app.utils.imagenes import PDF_MIME, render_derivados
+
+logger = logging.getLogger(__name__)
+
+VARIANTES = ("thumb", "preview")
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def soporta_derivados(mime_type: str | None) -> bool:
+    if not mime_type:
+        return False
+    return mime_type == PDF_MIME or (mime_type.startswith("image/") and mime_type != "image/svg+xml")
+
+
+def derivative_key(nombre_storage: str, variante: str) -> str:
+    return f"{nombre_storage}.{variante}.webp"
+
+
+def base_key(key: str) -> str:
+    """Key del original para una key de derivado (o la misma key)."""
+    for variante in VARIANTES:
+        sufijo = f".{variante}.webp"
+        if key.endswith(sufijo):
+            return key[:-len(sufijo)]
+    return key
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: el hijo solo importa app.utils.imagenes (sin engine ni loop heredados)
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.THUMBNAILS_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def enqueue_derivados(db: AsyncSession, archivo: Archivo) -> None:
+    """Encola la generacion de derivados si el tipo lo admite."""
+    if settings.THUMBNAILS_ENABLED and soporta_derivados(archivo.mime_type):
+        enqueue_job(db, "archivos.derivados", {"archivo_id": archivo.archivo_id})
+
+
+@job_handler("archivos.derivados")
+async def _job_derivados(payload: dict) -> None:
+    archivo_id = payload["archivo_id"]
+    factory = job_session_factory()
+
+    async with factory() as db:
+        archivo = (await db.execute(
+            select(Archivo.nombre_storage, Archivo.storage_path, Archivo.mime_type,
+                   Archivo.sha256, Archivo.codec, Archivo.thumbnail_path)
+            .where(Archivo.archivo_id == archivo_id)
+        )).one_or_none()
+        if archivo is None or archivo.thumbnail_path:
+            return  # borrado antes de procesar, o ya generado
+        existente = None
+        if archivo.sha256:
+            existente = (await db.execute(
+                select(Archivo.thumbnail_path, Archivo.preview_path)
+                .where(Archivo.sha256 == archivo.sha256, Archivo.thumbnail_path.is_not(None))
+                .limit(1)
+            )).one_or_none()
+        if existente is not None:
+            # Mismo contenido ya procesado: solo metadata
+            await db.execute(
+                update(Archivo).where(Archivo.archivo_id == archivo_id)
+                .values(thumbnail_path=existente.thumbnail_path, preview_path=existente.preview_path)
+            )
+            await db.commit()
+            return
+
+    data = await read_content(archivo.storage_path, archivo.codec)
+    try:
+        renders = await asyncio.get_running_loop().run_in_executor(
+            _get_pool(), render_derivados, data, archivo.mime_type,
+            settings.THUMBNAIL_MAX_PX, settings.PREVIEW_MAX_PX,
+        )
+    except Exception as e:
+        # Archivo corrupto o formato no soportado: reintentar no ayuda
+        logger.warning("Derivados no generados para archivo %s: %s", archivo_id, e)
+        return
+
+    paths = {}
+    for variante in VARIANTES:
+        paths[variante] = await save_file(
+            renders[variante], derivative_key(archivo.nombre_storage, variante)
+        )
+
+    destino = (Archivo.sha256 == archivo.sha256) if archivo.sha256 else (Archivo.archivo_id == archivo_id)
+    async with factory() as db:
+        await db.execute(
+            update(Archivo).where(destino)
+            .values(thumbnail_path=paths["thumb"], preview_path=paths["preview"])
+        )
+        await db.commit()
@@ -6,7 +6,9 @@ Local: guarda en UPLOAD_DIR (default: uploads/).
 Prod:  S3 via boto3 (FILE_STORAGE=s3).
 """
 
+import asyncio
 import uuid
+from datetime import datetime, timezone
 from pathlib import Path
 
 from app.config import settings
@@ -15,8 +17,17 @@ import boto3
 import logging
 from botocore.config import Config
 from botocore.exceptions import ConnectTimeoutError, ReadTimeoutError, EndpointConnectionError
+from collections import Counter
+from sqlalchemy import select, update, delete, case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.models.solicitud import ArchivoContenido
+from app.services.jobs import job_handler, enqueue_job, job_session_factory
+from app.utils.compresion import maybe_compress, decompress
+from app.services.storage_cache import get_cache
+from app.services.metricas import medir_storage
 logger = logging.getLogger(__name__)
 
 # ── Helpers ─────────────────────────────────────────────────────────────
@@ -27,6 +38,11 @@ def generate_storage_name(original_filename: str) -> str:
     return f"{uuid.uuid4().hex}{ext}"
 
 
+def content_storage_name(sha256: str) -> str:
+    """Key direccionada por contenido: sha256/ab/abcdef..."""
+    return f"sha256/{sha256[:2]}/{sha256}"
+
+
 # ── Local storage ───────────────────────────────────────────────────────
 
 def _ensure_upload_dir() -> Path:
@@ -40,11 +56,10 @@ def _ensure_upload_dir() -> Path:
 
 
 async def _local_save(file_bytes: bytes, key: str) -> str:
-    path = os.path.join(settings.LOCAL_UPLOADS_PATH, key)
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "wb") as f:
-        f.write(file_bytes)
-    return path
+    path = _ensure_upload_dir() / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(file_bytes)
+    return str(path)
 
 
 async def _local_read(storage_path: str) -> bytes:
@@ -115,22 +130,107 @@ async def _s3_save(file_bytes: bytes, key: str) -> str:
             message="Error inesperado subiendo el archivo."
         ) from e
 
-    url = f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{key}"
-    return url
+    return s3_url(key)
+
+
+def s3_url(key: str) -> str:
+    """storage_path con que se registran los objetos de S3."""
+    return f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{key}"
+
+
+def _s3_key(storage_path: str) -> str:
+    """storage_path guardado por _s3_save es la URL publica; S3 necesita la key."""
+    prefix = f"https://{settings.S3_BUCKET}.s3.amazonaws.com/"
+    if storage_path.startswith(prefix):
+        return storage_path[len(prefix):]
+    return storage_path
 
 
 async def _s3_read(storage_path: str) -> bytes:
     client = _get_s3_client()
     try:
-        response = client.get_object(Bucket=settings.S3_BUCKET, Key=storage_path)
-        return response["Body"].read()
+        response = await run_in_threadpool(
+            client.get_object, Bucket=settings.S3_BUCKET, Key=_s3_key(storage_path)
+        )
+        return await run_in_threadpool(response["Body"].read)
     except client.exceptions.NoSuchKey:
         raise FileNotFoundError(f"Archivo no encontrado en S3: {storage_path}")
 
 
+# Lecturas en curso por key: un miss concurrente (p.ej. prefetch + apertura)
+# hace un solo GET a S3
+_s3_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _s3_read_cached(storage_path: str) -> bytes:
+    cache = get_cache()
+    if cache is None:
+        return await _s3_read(storage_path)
+    key = _s3_key(storage_path)
+    data = await cache.get(key)
+    if data is not None:
+        return data
+
+    task = _s3_inflight.get(key)
+    if task is None:
+        async def _fetch() -> bytes:
+            try:
+                data = await _s3_read(storage_path)
+                await cache.put(key, data)
+                return data
+            finally:
+                _s3_inflight.pop(key, None)
+        task = asyncio.ensure_future(_fetch())
+        _s3_inflight[key] = task
+    return await asyncio.shield(task)
+
+
 async def _s3_delete(storage_path: str) -> None:
+    cache = get_cache()
+    if cache is not None:
+        cache.discard(_s3_key(storage_path))
+    client = _get_s3_client()
+    await run_in_threadpool(
+        client.delete_object, Bucket=settings.S3_BUCKET, Key=_s3_key(storage_path)
+    )
+
+
+# ── Upload directo a S3 (presigned POST) ────────────────────────────────
+
+def presign_supported() -> bool:
+    return _use_s3()
+
+
+async def presign_upload(key: str, mime_type: str, max_bytes: int) -> dict:
+    """
+    Presigned POST para que el navegador suba directo al bucket.
+    S3 rechaza el upload si cambia el Content-Type o excede max_bytes.
+    """
     client = _get_s3_client()
-    client.delete_object(Bucket=settings.S3_BUCKET, Key=storage_path)
+    return await run_in_threadpool(
+        client.generate_presigned_post,
+        Bucket=settings.S3_BUCKET,
+        Key=key,
+        Fields={"Content-Type": mime_type},
+        Conditions=[
+            {"Content-Type": mime_type},
+            ["content-length-range", 1, max_bytes],
+        ],
+        ExpiresIn=settings.S3_PRESIGN_EXPIRES_SECONDS,
+    )
+
+
+@medir_storage("head")
+async def head_object(key: str) -> dict | None:
+    """Metadata del objeto (tamano_bytes, content_type) o None si no existe."""
+    client = _get_s3_client()
+    try:
+        resp = await run_in_threadpool(client.head_object, Bucket=settings.S3_BUCKET, Key=key)
+    except client.exceptions.ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return {"tamano_bytes": resp["ContentLength"], "content_type": resp.get("ContentType")}
 
 
 # ── Public API (routing por FILE_STORAGE) ───────────────────────────────
@@ -139,21 +239,270 @@ def _use_s3() -> bool:
     return settings.FILE_STORAGE == "s3"
 
 
+@medir_storage("save")
 async def save_file(file_bytes: bytes, key: str) -> str:
     if _use_s3():
         return await _s3_save(file_bytes, key)
     return await _local_save(file_bytes, key)
 
 
+@medir_storage("read")
 async def read_file(storage_path: str) -> bytes:
-    """Lee un archivo desde storage (local o S3)."""
+    """Lee un archivo desde storage (local o S3, con cache en disco)."""
     if _use_s3():
-        return await _s3_read(storage_path)
+        return await _s3_read_cached(storage_path)
     return await _local_read(storage_path)
 
 
+async def read_content(storage_path: str, codec: str | None) -> bytes:
+    """Lee un archivo y lo descomprime segun el codec con que se guardo."""
+    data = await read_file(storage_path)
+    if codec is None:
+        return data
+    return await run_in_threadpool(decompress, data, codec)
+
+
+@medir_storage("delete")
 async def delete_file(storage_path: str) -> None:
     """Elimina un archivo de storage (local o S3)."""
     if _use_s3():
         return await _s3_delete(storage_path)
     return await _local_delete(storage_path)
+
+
+@medir_storage("delete")
+async def delete_key(key: str) -> None:
+    """Elimina un objeto por su key de storage (nombre_storage)."""
+    if _use_s3():
+        return await _s3_delete(key)
+    return await _local_delete(str(_ensure_upload_dir() / key))
+
+
+# ── Listado paginado (reconciliacion / GC) ──────────────────────────────
+# Cada pagina es una lista de (key, modificado_en) con a lo sumo page_size
+# elementos; nunca se materializa el bucket/directorio completo en memoria.
+
+def _iter_local_pages(page_size: int):
+    base = _ensure_upload_dir()
+    page = []
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            if name.startswith("."):
+                continue
+            path = Path(root) / name
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue  # borrado durante el recorrido
+            page.append((path.relative_to(base).as_posix(),
+                         datetime.fromtimestamp(mtime, tz=timezone.utc).replace(tzinfo=None)))
+            if len(page) >= page_size:
+                yield page
+                page = []
+    if page:
+        yield page
+
+
+def _iter_s3_pages(page_size: int):
+    paginator = _get_s3_client().get_paginator("list_objects_v2")
+    for resp in paginator.paginate(
+        Bucket=settings.S3_BUCKET, PaginationConfig={"PageSize": page_size}
+    ):
+        page = [
+            (obj["Key"], obj["LastModified"].astimezone(timezone.utc).replace(tzinfo=None))
+            for obj in resp.get("Contents", [])
+        ]
+        if page:
+            yield page
+
+
+async def iter_storage_pages(page_size: int = 1000):
+    """Recorre el storage (ListObjectsV2 paginado o directorio local) por paginas."""
+    pages = _iter_s3_pages(page_size) if _use_s3() else _iter_local_pages(page_size)
+    while True:
+        # La E/S de cada pagina es bloqueante: fuera del event loop
+        page = await run_in_threadpool(next, pages, None)
+        if page is None:
+            return
+        yield page
+
+
+# ── Borrado diferido (job en segundo plano) ─────────────────────────────
+# Los borrados fisicos no se hacen dentro de la request: se encolan como job
+# en la misma transaccion que borra el registro. Si la transaccion hace
+# ROLLBACK el job no existe; si el storage falla, el worker reintenta.
+
+@job_handler("storage.delete")
+async def _job_storage_delete(payload: dict) -> None:
+    await delete_file(payload["storage_path"])
+
+
+def enqueue_storage_delete(db: AsyncSession, storage_path: str) -> None:
+    """Encola el borrado fisico de storage_path en la transaccion de db."""
+    enqueue_job(db, "storage.delete", {"storage_path": storage_path})
+
+
+# ── Contenido deduplicado (key = sha256) ────────────────────────────────
+# Ciclo de vida de archivo_contenido.ref_count:
+#   >0  referenciado por N archivos
+#    0  sin referencias; job storage.delete_contenido encolado
+#   -1  el job esta borrando el objeto (una subida no puede revivirlo)
+
+async def _save_compressed(file_bytes: bytes, key: str, mime_type: str | None) -> tuple[str, str | None]:
+    """Comprime (si STORAGE_COMPRESSION y el MIME lo ameritan) y guarda."""
+    data, codec = file_bytes, None
+    if settings.STORAGE_COMPRESSION:
+        data, codec = await run_in_threadpool(
+            maybe_compress, file_bytes, mime_type, settings.STORAGE_COMPRESSION
+        )
+    return await save_file(data, key), codec
+
+
+async def content_ref_count(db: AsyncSession, sha256: str) -> int | None:
+    """ref_count del contenido (incluido -1); None si no hay fila."""
+    return (await db.execute(
+        select(ArchivoContenido.ref_count).where(ArchivoContenido.sha256 == sha256)
+    )).scalar_one_or_none()
+
+
+async def _referenciar_contenido(
+    db: AsyncSession,
+    sha256: str,
+    tamano_bytes: int,
+    subido: tuple[str, str | None] | None,
+) -> tuple[str, str, str, str | None] | None:
+    """
+    Suma una referencia al contenido; si no existe y `subido` trae el objeto
+    ya escrito (storage_path, codec), inserta la fila. Sin E/S de storage.
+    Retorna None si hay que (re)escribir el objeto antes de referenciarlo.
+    """
+    async def _incrementar():
+        res = await db.execute(
+            update(ArchivoContenido)
+            .where(ArchivoContenido.sha256 == sha256, ArchivoContenido.ref_count >= 0)
+            .values(ref_count=ArchivoContenido.ref_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if not res.rowcount:
+            return None
+        row = (await db.execute(
+            select(ArchivoContenido.nombre_storage, ArchivoContenido.storage_path,
+                   ArchivoContenido.codec)
+            .where(ArchivoContenido.sha256 == sha256)
+        )).one()
+        return row.nombre_storage, row.storage_path, sha256, row.codec
+
+    existente = await _incrementar()
+    if existente or subido is None:
+        return existente
+
+    storage_path, codec = subido
+    key = content_storage_name(sha256)
+    try:
+        async with db.begin_nested():
+            db.add(ArchivoContenido(
+                sha256=sha256, nombre_storage=key, storage_path=storage_path,
+                tamano_bytes=tamano_bytes, codec=codec, ref_count=1,
+            ))
+    except IntegrityError:
+        # Otra subida concurrente inserto el mismo contenido (misma key, mismo objeto)
+        return await _incrementar()
+    return key, storage_path, sha256, codec
+
+
+async def store_content(
+    db: AsyncSession,
+    file_bytes: bytes,
+    sha256: str,
+    ref_count: int | None,
+    mime_type: str | None = None,
+) -> tuple[str, str, str, str | None] | None:
+    """
+    Guarda file_bytes deduplicado por sha256, a partir del ref_count leido
+    con content_ref_count(). Si el contenido ya existe solo incrementa
+    ref_count (sin escribir en storage); si no, escribe el objeto y lo
+    inserta. Retorna (nombre_storage, storage_path, sha256, codec).
+
+    Retorna None si el contenido se esta borrando (ref_count=-1): el job
+    borra la key sha256, asi que no se escribe ni se referencia; el caller
+    guarda una copia propia con store_private().
+
+    No controla la transaccion: el caller la cierra antes de llamar (la E/S
+    de storage no retiene conexion) y confirma la referencia con su Archivo.
+    """
+    if ref_count is not None and ref_count < 0:
+        return None
+    subido = None
+    if ref_count is None:
+        subido = await _save_compressed(file_bytes, content_storage_name(sha256), mime_type)
+    return await _referenciar_contenido(db, sha256, len(file_bytes), subido)
+
+
+async def store_private(
+    file_bytes: bytes,
+    original_filename: str,
+    mime_type: str | None = None,
+) -> tuple[str, str, None, str | None]:
+    """Copia propia no deduplicada (key uuid). Retorna la misma tupla que store_content."""
+    key = generate_storage_name(original_filename)
+    storage_path, codec = await _save_compressed(file_bytes, key, mime_type)
+    return key, storage_path, None, codec
+
+
+async def release_contents(db: AsyncSession, sha256s: list[str]) -> None:
+    """
+    Decrementa ref_count (un UPDATE para todos los hashes) y encola el borrado
+    fisico de los contenidos que quedan sin referencias.
+    """
+    if not sha256s:
+        return
+    counts = Counter(sha256s)
+    await db.execute(
+        update(ArchivoContenido)
+        .where(ArchivoContenido.sha256.in_(counts), ArchivoContenido.ref_count > 0)
+        .values(ref_count=ArchivoContenido.ref_count - case(
+            counts, value=ArchivoContenido.sha256, else_=0,
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    liberados = (await db.execute(
+        select(ArchivoContenido.sha256)
+        .where(ArchivoContenido.sha256.in_(counts), ArchivoContenido.ref_count == 0)
+    )).scalars().all()
+    for sha256 in liberados:
+        enqueue_job(db, "storage.delete_contenido", {"sha256": sha256})
+
+
+@job_handler("storage.delete_contenido")
+async def _job_delete_contenido(payload: dict) -> None:
+    sha256 = payload["sha256"]
+    factory = job_session_factory()
+
+    # 0 -> -1: desde aqui una subida del mismo contenido no lo reutiliza
+    async with factory() as db:
+        await db.execute(
+            update(ArchivoContenido)
+            .where(ArchivoContenido.sha256 == sha256, ArchivoContenido.ref_count == 0)
+            .values(ref_count=-1)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await db.execute(
+            select(ArchivoContenido.storage_path, ArchivoContenido.ref_count)
+            .where(ArchivoContenido.sha256 == sha256)
+        )).one_or_none()
+        await db.commit()
+    if row is None or row.ref_count != -1:
+        return  # ya borrado, o una subida lo volvio a referenciar
+
+    await delete_file(row.storage_path)
+    from app.services.derivados import VARIANTES, derivative_key
+    for variante in VARIANTES:
+        await delete_key(derivative_key(content_storage_name(sha256), variante))
+
+    async with factory() as db:
+        await db.execute(
+            delete(ArchivoContenido)
+            .where(ArchivoContenido.sha256 == sha256, ArchivoContenido.ref_count == -1)
+        )
+        await db.commit()
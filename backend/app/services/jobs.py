@@ -0,0 +1,323 @@
+"""
+Cola de jobs en segundo plano respaldada por BD (patron outbox).
+
+- enqueue_job() inserta el job en la MISMA transaccion que el cambio de negocio:
+  si la transaccion hace ROLLBACK, el job no existe.
+- JobWorker reclama jobs con bloqueo de filas (FOR UPDATE SKIP LOCKED en MySQL),
+  los ejecuta fuera de cualquier transaccion y registra el resultado,
+  reintentando con backoff exponencial hasta max_intentos.
+- Corre dentro de la app (main.lifespan, JOBS_WORKER_ENABLED) o standalone
+  con `python -m app.worker`.
+
+Los handlers se registran con @job_handler("tipo") en su modulo dueño
+(listado en HANDLER_MODULES) y reciben el payload (dict JSON). Si necesitan
+BD abren sesiones con job_session_factory() (la del worker que los ejecuta).
+Deben ser idempotentes: un job puede ejecutarse mas de una vez si un worker
+cae a mitad de ejecucion y su lease expira.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import socket
+import uuid
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, update, delete, or_, and_, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.job import Job, EstadoJob
+from app.utils.time import utcnow
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+_HANDLERS: dict[str, JobHandler] = {}
+
+# Modulos que registran handlers al importarse
+HANDLER_MODULES: tuple[str, ...] = (
+    "app.services.file_storage",
+    "app.services.derivados",
+)
+
+
+def job_handler(tipo: str):
+    """Decorador: registra una corrutina como handler del tipo de job."""
+    def decorator(fn: JobHandler) -> JobHandler:
+        _HANDLERS[tipo] = fn
+        return fn
+    return decorator
+
+
+def load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+_session_factory_var: ContextVar = ContextVar("jobs_session_factory", default=None)
+
+
+def job_session_factory():
+    """Session factory para handlers: la del worker que ejecuta el job actual."""
+    factory = _session_factory_var.get()
+    if factory is None:
+        from app.database import _get_session_factory
+        factory = _get_session_factory()
+    return factory
+
+
+# ── Encolado ────────────────────────────────────────────────────────────
+
+_ENQUEUED_KEY = "jobs_enqueued"
+
+# Eventos de los workers in-process activos (para despertarlos tras COMMIT)
+_wakeup_events: set[asyncio.Event] = set()
+
+
+def _notify_workers(session) -> None:
+    if session.info.pop(_ENQUEUED_KEY, False):
+        for ev in _wakeup_events:
+            ev.set()
+
+
+def _discard_notify(session) -> None:
+    session.info.pop(_ENQUEUED_KEY, None)
+
+
+def enqueue_job(
+    db: AsyncSession,
+    tipo: str,
+    payload: dict,
+    delay_seconds: float = 0,
+    max_intentos: int | None = None,
+) -> Job:
+    """
+    Agrega un job a la transaccion actual de db. Se hace visible al worker
+    cuando la transaccion confirma (y lo despierta si corre in-process).
+    """
+    job = Job(
+        tipo=tipo,
+        payload=payload,
+        estado=EstadoJob.PENDIENTE.value,
+        intentos=0,
+        max_intentos=max_intentos or settings.JOBS_MAX_INTENTOS,
+        ejecutar_desde=utcnow() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+
+    sync_session = db.sync_session
+    if not event.contains(sync_session, "after_commit", _notify_workers):
+        event.listen(sync_session, "after_commit", _notify_workers)
+        event.listen(sync_session, "after_rollback", _discard_notify)
+    sync_session.info[_ENQUEUED_KEY] = True
+    return job
+
+
+# ── Reclamo y resultado ─────────────────────────────────────────────────
+
+def _claimable(now):
+    """PENDIENTE vencido, o EN_PROCESO con lease expirado (worker caido)."""
+    lease_limit = now - timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+    return or_(
+        and_(Job.estado == EstadoJob.PENDIENTE.value, Job.ejecutar_desde <= now),
+        and_(Job.estado == EstadoJob.EN_PROCESO.value, Job.bloqueado_en < lease_limit),
+    )
+
+
+async def claim_jobs(db: AsyncSession, worker_id: str, limit: int) -> list[Job]:
+    """
+    Reclama hasta `limit` jobs para worker_id. Debe ejecutarse en una
+    transaccion corta que el llamador confirma de inmediato.
+    """
+    now = utcnow()
+    token = f"{worker_id}/{uuid.uuid4().hex[:8]}"
+
+    candidatos = (await db.execute(
+        select(Job.job_id)
+        .where(_claimable(now))
+        .order_by(Job.ejecutar_desde, Job.job_id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).scalars().all()
+    if not candidatos:
+        return []
+
+    # UPDATE condicional: si otro worker gano la carrera (SQLite no tiene
+    # FOR UPDATE), la condicion ya no se cumple y la fila no se toca.
+    await db.execute(
+        update(Job)
+        .where(Job.job_id.in_(candidatos), _claimable(now))
+        .values(
+            estado=EstadoJob.EN_PROCESO.value,
+            bloqueado_por=token,
+            bloqueado_en=now,
+            intentos=Job.intentos + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return list((await db.execute(
+        select(Job)
+        .where(Job.job_id.in_(candidatos), Job.bloqueado_por == token)
+        .order_by(Job.job_id)
+        .execution_options(populate_existing=True)
+    )).scalars().all())
+
+
+def _backoff_seconds(intentos: int) -> float:
+    return min(
+        settings.JOBS_BACKOFF_MAX_SECONDS,
+        settings.JOBS_BACKOFF_SECONDS * (2 ** max(intentos - 1, 0)),
+    )
+
+
+async def record_outcome(
+    db: AsyncSession,
+    job_id: int,
+    token: str,
+    error: str | None,
+    permanente: bool = False,
+) -> None:
+    """Registra exito, reintento con backoff o fallo definitivo."""
+    job = await db.get(Job, job_id)
+    if job is None or job.bloqueado_por != token:
+        # Lease perdido: otro worker lo reclamo, su resultado prevalece
+        return
+
+    now = utcnow()
+    job.bloqueado_por = None
+    job.bloqueado_en = None
+    if error is None:
+        job.estado = EstadoJob.COMPLETADO.value
+        job.ultimo_error = None
+        job.finalizado_en = now
+    elif permanente or job.intentos >= job.max_intentos:
+        job.estado = EstadoJob.FALLIDO.value
+        job.ultimo_error = error
+        job.finalizado_en = now
+        logger.error("Job %s (%s) FALLIDO tras %s intentos: %s",
+                     job.job_id, job.tipo, job.intentos, error)
+    else:
+        job.estado = EstadoJob.PENDIENTE.value
+        job.ultimo_error = error
+        job.ejecutar_desde = now + timedelta(seconds=_backoff_seconds(job.intentos))
+    await db.flush()
+
+
+async def purge_finished_jobs(db: AsyncSession, older_than_days: int, limit: int) -> int:
+    """Borra un lote de jobs COMPLETADO/FALLIDO finalizados hace mas de N dias."""
+    limite = utcnow() - timedelta(days=older_than_days)
+    ids = (await db.execute(
+        select(Job.job_id)
+        .where(
+            Job.estado.in_([EstadoJob.COMPLETADO.value, EstadoJob.FALLIDO.value]),
+            Job.finalizado_en < limite,
+        )
+        .limit(limit)
+    )).scalars().all()
+    if not ids:
+        return 0
+    await db.execute(
+        delete(Job).where(Job.job_id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    return len(ids)
+
+
+# ── Worker ──────────────────────────────────────────────────────────────
+
+class JobWorker:
+    """
+    Pool de `concurrency` corrutinas que reclaman y ejecutan jobs.
+    Cada ciclo: transaccion corta de reclamo -> handler sin transaccion
+    abierta -> transaccion corta de resultado.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        concurrency: int | None = None,
+        poll_seconds: float | None = None,
+    ):
+        self._session_factory = session_factory
+        self.concurrency = concurrency or settings.JOBS_CONCURRENCY
+        self.poll_seconds = settings.JOBS_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: list[asyncio.Task] = []
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.database import _get_session_factory
+            self._session_factory = _get_session_factory()
+        return self._session_factory
+
+    async def run_once(self, limit: int | None = None) -> int:
+        """Reclama y ejecuta un lote. Retorna cuantos jobs proceso."""
+        load_handlers()
+        async with self._factory()() as db:
+            jobs = await claim_jobs(db, self.worker_id, limit or self.concurrency)
+            claimed = [(j.job_id, j.bloqueado_por, j.tipo, dict(j.payload or {})) for j in jobs]
+            await db.commit()
+
+        await asyncio.gather(*(self._execute(*c) for c in claimed))
+        return len(claimed)
+
+    async def run_until_empty(self) -> int:
+        """Procesa jobs hasta que no quede ninguno reclamable (tests / CLI)."""
+        total = 0
+        while (n := await self.run_once()) > 0:
+            total += n
+        return total
+
+    async def _execute(self, job_id: int, token: str, tipo: str, payload: dict) -> None:
+        _session_factory_var.set(self._factory())  # cada _execute corre en su propia task
+        handler = _HANDLERS.get(tipo)
+        error = None
+        permanente = False
+        if handler is None:
+            error = f"Handler no registrado para tipo '{tipo}'"
+            permanente = True
+        else:
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.warning("Job %s (%s) fallo: %s", job_id, tipo, e, exc_info=True)
+                error = f"{type(e).__name__}: {e}"
+
+        async with self._factory()() as db:
+            await record_outcome(db, job_id, token, error, permanente)
+            await db.commit()
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                processed = await self.run_once(1)
+            except Exception:
+                logger.exception("Error en ciclo del worker de jobs")
+                processed = 0
+            if processed == 0 and not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        load_handlers()
+        _wakeup_events.add(self._wakeup)
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+        logger.info("JobWorker %s iniciado (concurrency=%s)", self.worker_id, self.concurrency)
+
+    async def stop(self) -> None:
+        """Detiene el pool dejando terminar los jobs en curso."""
+        self._stopping = True
+        self._wakeup.set()
+        _wakeup_events.discard(self._wakeup)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("JobWorker %s detenido", self.worker_id)
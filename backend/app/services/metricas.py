@@ -0,0 +1,268 @@
+"""
+Metricas en memoria con exposicion en formato texto de Prometheus (GET /metrics).
+
+Sin dependencias ni colector externo: contadores, gauges e histogramas con
+labels, por proceso (con varios workers, cada uno expone los suyos; el
+scraper los distingue por instancia).
+
+- HTTP (app.middleware.metrics_middleware): latencia y status por plantilla
+  de ruta (/solicitudes/{solicitud_id}), requests en vuelo.
+- Pool de BD: checked-out / overflow / size, leidos del engine al exponer;
+  espera de checkout y timeouts (app.database.PoolMedido).
+- Storage (file_storage): latencia y errores por operacion y backend.
+- Reportes: tiempo de generar_reporte.
+"""
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Buckets por defecto de los clientes de Prometheus (segundos)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(nombres: tuple[str, ...], valores: tuple, extra: str = "") -> str:
+    partes = [f'{n}="{_escapar(v)}"' for n, v in zip(nombres, valores)]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metrica:
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, labels: tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.label_names = labels
+
+    def _cabecera(self) -> list[str]:
+        return [f"# HELP {self.nombre} {self.ayuda}", f"# TYPE {self.nombre} {self.tipo}"]
+
+
+class Counter(_Metrica):
+    tipo = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: dict[tuple, float] = {}
+
+    def inc(self, *labels, valor: float = 1) -> None:
+        self._valores[labels] = self._valores.get(labels, 0) + valor
+
+    def valor(self, *labels) -> float:
+        return self._valores.get(labels, 0)
+
+    def exponer(self) -> list[str]:
+        lineas = self._cabecera()
+        for labels, v in sorted(self._valores.items()):
+            lineas.append(f"{self.nombre}{_labels(self.label_names, labels)} {_num(v)}")
+        return lineas
+
+
+class Gauge(_Metrica):
+    """Gauge con valor fijado (set/inc/dec) o calculado al exponer (fn)."""
+
+    tipo = "gauge"
+
+    def __init__(self, *args, fn=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._valores: dict[tuple, float] = {}
+        self._fn = fn  # () -> dict[tuple, float] | None
+
+    def set(self, *labels, valor: float) -> None:
+        self._valores[labels] = valor
+
+    def inc(self, *labels, valor: float = 1) -> None:
+        self._valores[labels] = self._valores.get(labels, 0) + valor
+
+    def dec(self, *labels, valor: float = 1) -> None:
+        self.inc(*labels, valor=-valor)
+
+    def valor(self, *labels) -> float:
+        return self._valores.get(labels, 0)
+
+    def exponer(self) -> list[str]:
+        valores = self._valores
+        if self._fn is not None:
+            valores = self._fn() or {}
+            if not valores:
+                return []
+        lineas = self._cabecera()
+        for labels, v in sorted(valores.items()):
+            lineas.append(f"{self.nombre}{_labels(self.label_names, labels)} {_num(v)}")
+        return lineas
+
+
+class Histogram(_Metrica):
+    tipo = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [conteos por bucket (no acumulados)..., suma, total]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, *labels, valor: float) -> None:
+        serie = self._series.get(labels)
+        if serie is None:
+            serie = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                serie[0][i] += 1
+                break
+        serie[1] += valor
+        serie[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labels, valor=time.perf_counter() - inicio)
+
+    def count(self, *labels) -> int:
+        serie = self._series.get(labels)
+        return serie[2] if serie else 0
+
+    def resumen(self, *labels) -> dict:
+        """Serie como dict (endpoints de admin): total, suma y buckets acumulados."""
+        conteos, suma, total = self._series.get(labels) or ([0] * len(self.buckets), 0.0, 0)
+        acumulados, acumulado = {}, 0
+        for limite, c in zip(self.buckets, conteos):
+            acumulado += c
+            acumulados[_num(limite)] = acumulado
+        acumulados["+Inf"] = total
+        return {"count": total, "sum": suma, "buckets": acumulados}
+
+    def exponer(self) -> list[str]:
+        lineas = self._cabecera()
+        for labels, (conteos, suma, total) in sorted(self._series.items()):
+            acumulado = 0
+            for limite, c in zip(self.buckets, conteos):
+                acumulado += c
+                le = f'le="{_num(limite)}"'
+                lineas.append(f"{self.nombre}_bucket{_labels(self.label_names, labels, le)} {acumulado}")
+            inf = 'le="+Inf"'
+            lineas.append(f"{self.nombre}_bucket{_labels(self.label_names, labels, inf)} {total}")
+            lineas.append(f"{self.nombre}_sum{_labels(self.label_names, labels)} {_num(suma)}")
+            lineas.append(f"{self.nombre}_count{_labels(self.label_names, labels)} {total}")
+        return lineas
+
+
+# ── Registro ────────────────────────────────────────────────────────────
+
+_registro: list[_Metrica] = []
+
+
+def _registrar(metrica):
+    _registro.append(metrica)
+    return metrica
+
+
+def exponer() -> str:
+    """Todas las metricas en formato de exposicion de texto (version 0.0.4)."""
+    lineas: list[str] = []
+    for metrica in _registro:
+        lineas.extend(metrica.exponer())
+    return "\n".join(lineas) + "\n"
+
+
+def reset() -> None:
+    """Limpia los valores (tests)."""
+    for metrica in _registro:
+        if isinstance(metrica, Histogram):
+            metrica._series.clear()
+        else:
+            metrica._valores.clear()
+
+
+# ── HTTP ────────────────────────────────────────────────────────────────
+
+http_requests = _registrar(Counter(
+    "cmep_http_requests_total", "Requests HTTP por metodo, ruta y status.",
+    ("method", "route", "status"),
+))
+http_duracion = _registrar(Histogram(
+    "cmep_http_request_duration_seconds", "Latencia HTTP por metodo y plantilla de ruta.",
+    ("method", "route"),
+))
+http_en_vuelo = _registrar(Gauge(
+    "cmep_http_requests_in_flight", "Requests HTTP en curso.",
+))
+
+
+# ── Pool de BD ──────────────────────────────────────────────────────────
+
+def _estado_pool() -> dict[tuple, float]:
+    from app import database
+
+    estado = database.estado_pool() or {}  # no crea un engine para exponer
+    return {(nombre,): estado[nombre] for nombre in ("checkedout", "overflow", "size") if nombre in estado}
+
+
+db_pool = _registrar(Gauge(
+    "cmep_db_pool_connections", "Estado del pool de conexiones (checkedout, overflow, size).",
+    ("state",), fn=_estado_pool,
+))
+db_pool_espera = _registrar(Histogram(
+    "cmep_db_pool_checkout_wait_seconds",
+    "Espera para obtener una conexion del pool (incluye abrir conexiones nuevas).",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+))
+db_pool_timeouts = _registrar(Counter(
+    "cmep_db_pool_timeouts_total", "Checkouts que agotaron DB_POOL_TIMEOUT.",
+))
+
+
+# ── Storage ─────────────────────────────────────────────────────────────
+
+storage_duracion = _registrar(Histogram(
+    "cmep_storage_operation_duration_seconds", "Latencia de operaciones de storage.",
+    ("op", "backend"),
+))
+storage_errores = _registrar(Counter(
+    "cmep_storage_operation_errors_total", "Operaciones de storage fallidas.",
+    ("op", "backend"),
+))
+
+
+def medir_storage(op: str):
+    """Decorador para funciones async de file_storage: latencia y errores."""
+    def decorador(fn):
+        @wraps(fn)
+        async def envoltura(*args, **kwargs):
+            from app.config import settings
+
+            backend = settings.FILE_STORAGE
+            inicio = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except FileNotFoundError:
+                raise  # ausencia esperada (404, GC): no es un error del backend
+            except Exception:
+                storage_errores.inc(op, backend)
+                raise
+            finally:
+                storage_duracion.observe(op, backend, valor=time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+# ── Reportes ────────────────────────────────────────────────────────────
+
+reporte_duracion = _registrar(Histogram(
+    "cmep_report_generation_seconds", "Tiempo de generar_reporte.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+))
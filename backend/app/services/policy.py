@@ -3,6 +3,10 @@ POLICY de autorizacion: matriz rol x estado_operativo -> acciones_permitidas.
 Fuente de verdad: docs/source/05_api_y_policy.md (seccion POLICY)
 """
 
+from collections.abc import Iterable, Mapping
+from itertools import combinations
+from types import MappingProxyType
+
 from fastapi import HTTPException
 
 # Copia exacta del JSON en doc 05
@@ -42,23 +46,89 @@ POLICY: dict[str, dict[str, list[str]]] = {
 }
 
 
+# ── Tabla precompilada ─────────────────────────────────────────────────
+# POLICY se compila al importar en una tabla inmutable
+# (frozenset de roles, estado_operativo) -> (mascara de bits, tupla ordenada).
+# Cada accion es un bit, asignado en orden alfabetico: la union de roles es
+# un OR y la tupla ordenada se precalcula una sola vez por combinacion.
+
+ROLES: frozenset[str] = frozenset(POLICY)
+ESTADOS: tuple[str, ...] = tuple(sorted({e for por_estado in POLICY.values() for e in por_estado}))
+ACCIONES: tuple[str, ...] = tuple(sorted({
+    a for por_estado in POLICY.values() for lista in por_estado.values() for a in lista
+}))
+BIT: Mapping[str, int] = MappingProxyType({a: 1 << i for i, a in enumerate(ACCIONES)})
+
+_VACIO: tuple[int, tuple[str, ...]] = (0, ())
+
+
+def _acciones_de_mascara(mascara: int) -> tuple[str, ...]:
+    return tuple(a for a in ACCIONES if mascara & BIT[a])
+
+
+def _compilar() -> Mapping[tuple[frozenset[str], str], tuple[int, tuple[str, ...]]]:
+    tabla = {}
+    roles = sorted(ROLES)
+    for n in range(1, len(roles) + 1):
+        for combinacion in combinations(roles, n):
+            for estado in ESTADOS:
+                mascara = 0
+                for rol in combinacion:
+                    for accion in POLICY[rol].get(estado, ()):
+                        mascara |= BIT[accion]
+                tabla[(frozenset(combinacion), estado)] = (mascara, _acciones_de_mascara(mascara))
+    return MappingProxyType(tabla)
+
+
+TABLA = _compilar()
+
+
+def _clave_roles(roles) -> frozenset[str]:
+    # Roles desconocidos no aportan acciones (igual que POLICY.get(rol, {}))
+    return ROLES.intersection(roles)
+
+
+def acciones_mascara(roles, estado_operativo: str) -> int:
+    """Mascara de bits de acciones permitidas (ver BIT)."""
+    return TABLA.get((_clave_roles(roles), estado_operativo), _VACIO)[0]
+
+
 def get_acciones_permitidas(roles: list[str], estado_operativo: str) -> list[str]:
     """
     Retorna la union de acciones permitidas para todos los roles del usuario.
     """
-    acciones: set[str] = set()
-    for rol in roles:
-        rol_policy = POLICY.get(rol, {})
-        acciones.update(rol_policy.get(estado_operativo, []))
-    return sorted(acciones)
+    return list(TABLA.get((_clave_roles(roles), estado_operativo), _VACIO)[1])
+
+
+def acciones_permitidas_lote(roles, estados: Iterable[str]) -> list[tuple[str, ...]]:
+    """
+    Acciones permitidas para muchas solicitudes de un mismo usuario
+    (listados, acciones masivas): una sola normalizacion de roles y una
+    busqueda por estado distinto.
+    """
+    clave = _clave_roles(roles)
+    por_estado: dict[str, tuple[str, ...]] = {}
+    out = []
+    for estado in estados:
+        acciones = por_estado.get(estado)
+        if acciones is None:
+            acciones = por_estado[estado] = TABLA.get((clave, estado), _VACIO)[1]
+        out.append(acciones)
+    return out
+
+
+def permitido_lote(roles, estados: Iterable[str], accion: str) -> list[bool]:
+    """Para cada estado, si `accion` esta permitida (acciones masivas)."""
+    bit = BIT.get(accion, 0)
+    clave = _clave_roles(roles)
+    return [bool(TABLA.get((clave, estado), _VACIO)[0] & bit) for estado in estados]
 
 
 def assert_allowed(roles: list[str], estado_operativo: str, accion: str) -> None:
     """
     Lanza HTTPException 403 si la accion no esta permitida por la POLICY.
     """
-    acciones = get_acciones_permitidas(roles, estado_operativo)
-    if accion not in acciones:
+    if not acciones_mascara(roles, estado_operativo) & BIT.get(accion, 0):
         raise HTTPException(
             status_code=403,
             detail={
@@ -26,6 +26,7 @@ from app.models.promotor import Promotor
 from app.models.persona import Persona
 from app.models.cliente import Cliente
 from app.config import settings
+from app.services import metricas
 
 
 # ── Estado operativo como expresion SQL ──────────────────────────────
@@ -96,6 +97,17 @@ async def generar_reporte(
     agrupacion: str,
 ) -> dict:
     """Genera el reporte completo: KPIs, series, distribucion, rankings."""
+    with metricas.reporte_duracion.time():
+        return await _generar_reporte(db, desde, hasta, estado, agrupacion)
+
+
+async def _generar_reporte(
+    db: AsyncSession,
+    desde: date | None,
+    hasta: date | None,
+    estado: str | None,
+    agrupacion: str,
+) -> dict:
 
     # Defaults
     if hasta is None:
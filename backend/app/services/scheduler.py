@@ -0,0 +1,260 @@
+"""
+Scheduler periodico in-app (reemplaza a infra/lambda_cleanup.py).
+
+- Arranca desde main.lifespan (SCHEDULER_ENABLED). Cada instancia de la API
+  corre un PeriodicScheduler, pero solo el lider ejecuta tareas: el liderazgo
+  es un lease en la fila scheduler_lease, renovado en cada tick y tomado por
+  otra instancia si expira (SCHEDULER_LEASE_SECONDS).
+- El estado de cada tarea vive en tareas_programadas, asi un cambio de lider
+  no repite ni salta ejecuciones. La primera ejecucion se desfasa segun el
+  nombre de la tarea para repartir la carga dentro del intervalo.
+- Las limpiezas borran en lotes (CLEANUP_BATCH_SIZE) con un COMMIT por lote,
+  nunca un DELETE sin limite sobre toda la tabla.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+import zlib
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.models.scheduler import SchedulerLease, TareaProgramada
+from app.utils.time import utcnow
+
+logger = logging.getLogger(__name__)
+
+LEASE_NOMBRE = "scheduler"
+
+# fn(session_factory) -> resumen corto del resultado (para tareas_programadas)
+TaskFn = Callable[..., Awaitable[str | None]]
+
+
+class ScheduledTask:
+    def __init__(self, nombre: str, intervalo_segundos: float, fn: TaskFn):
+        self.nombre = nombre
+        self.intervalo_segundos = intervalo_segundos
+        self.fn = fn
+
+    def fase_inicial(self) -> timedelta:
+        """Desfase deterministico dentro del intervalo (reparte las tareas)."""
+        segundos = zlib.crc32(self.nombre.encode()) % max(int(self.intervalo_segundos), 1)
+        return timedelta(seconds=segundos)
+
+
+# ── Tareas ──────────────────────────────────────────────────────────────
+
+async def borrar_en_lotes(session_factory, borrar_lote, batch_size: int) -> int:
+    """
+    Ejecuta borrar_lote(db, batch_size) en transacciones cortas hasta que
+    borre menos de un lote completo. Retorna el total borrado.
+    """
+    total = 0
+    while True:
+        async with session_factory() as db:
+            borradas = await borrar_lote(db, batch_size)
+            await db.commit()
+        total += borradas
+        if borradas < batch_size:
+            return total
+        await asyncio.sleep(0)  # ceder el event loop entre lotes
+
+
+async def tarea_expirar_sesiones(session_factory) -> str:
+    from app.services.auth_service import delete_expired_sessions
+
+    total = await borrar_en_lotes(
+        session_factory, delete_expired_sessions, settings.CLEANUP_BATCH_SIZE
+    )
+    return f"sesiones_borradas={total}"
+
+
+async def tarea_purgar_jobs(session_factory) -> str:
+    from app.services.jobs import purge_finished_jobs
+
+    async def _lote(db, limit):
+        return await purge_finished_jobs(db, settings.JOBS_RETENCION_DIAS, limit)
+
+    total = await borrar_en_lotes(session_factory, _lote, settings.CLEANUP_BATCH_SIZE)
+    return f"jobs_purgados={total}"
+
+
+async def tarea_storage_gc(session_factory) -> str:
+    from app.services.storage_gc import reconciliar_storage
+
+    reporte = await reconciliar_storage(session_factory, borrar=settings.STORAGE_GC_BORRAR)
+    return reporte.resumen()
+
+
+def default_tasks() -> list[ScheduledTask]:
+    return [
+        ScheduledTask("expirar_sesiones", settings.SESSION_CLEANUP_INTERVAL_SECONDS,
+                      tarea_expirar_sesiones),
+        ScheduledTask("purgar_jobs", 6 * 3600, tarea_purgar_jobs),
+        ScheduledTask("storage_gc", settings.STORAGE_GC_INTERVAL_SECONDS, tarea_storage_gc),
+    ]
+
+
+# ── Scheduler ───────────────────────────────────────────────────────────
+
+class PeriodicScheduler:
+    def __init__(
+        self,
+        tasks: list[ScheduledTask] | None = None,
+        session_factory=None,
+        tick_seconds: float | None = None,
+        lease_seconds: int | None = None,
+    ):
+        self.tasks = default_tasks() if tasks is None else tasks
+        self._session_factory = session_factory
+        self.tick_seconds = settings.SCHEDULER_TICK_SECONDS if tick_seconds is None else tick_seconds
+        self.lease_seconds = lease_seconds or settings.SCHEDULER_LEASE_SECONDS
+        self.instance_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def _factory(self):
+        if self._session_factory is None:
+            from app.database import _get_session_factory
+            self._session_factory = _get_session_factory()
+        return self._session_factory
+
+    # -- Liderazgo --
+
+    async def try_acquire_leadership(self) -> bool:
+        """Toma o renueva el lease. True si esta instancia es el lider."""
+        now = utcnow()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        async with self._factory()() as db:
+            result = await db.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.nombre == LEASE_NOMBRE,
+                    or_(SchedulerLease.holder == self.instance_id,
+                        SchedulerLease.expires_at < now),
+                )
+                .values(holder=self.instance_id, expires_at=expires, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                await db.commit()
+                return True
+
+            if await db.get(SchedulerLease, LEASE_NOMBRE) is not None:
+                await db.rollback()
+                return False
+
+            db.add(SchedulerLease(nombre=LEASE_NOMBRE, holder=self.instance_id, expires_at=expires))
+            try:
+                await db.commit()
+                return True
+            except IntegrityError:
+                await db.rollback()  # otra instancia la creo primero
+                return False
+
+    async def release_leadership(self) -> None:
+        async with self._factory()() as db:
+            await db.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.nombre == LEASE_NOMBRE,
+                       SchedulerLease.holder == self.instance_id)
+                .values(expires_at=utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+    # -- Ejecucion --
+
+    async def _tareas_vencidas(self) -> list[ScheduledTask]:
+        now = utcnow()
+        async with self._factory()() as db:
+            rows = (await db.execute(
+                select(TareaProgramada).where(
+                    TareaProgramada.nombre.in_([t.nombre for t in self.tasks])
+                )
+            )).scalars().all()
+            estado = {r.nombre: r for r in rows}
+
+            vencidas = []
+            for task in self.tasks:
+                row = estado.get(task.nombre)
+                if row is None:
+                    db.add(TareaProgramada(
+                        nombre=task.nombre,
+                        proxima_ejecucion=now + task.fase_inicial(),
+                    ))
+                elif row.proxima_ejecucion <= now:
+                    vencidas.append(task)
+            await db.commit()
+        return vencidas
+
+    async def _ejecutar(self, task: ScheduledTask) -> None:
+        inicio = time.perf_counter()
+        resultado, error = None, None
+        try:
+            resultado = await task.fn(self._factory())
+        except Exception as e:
+            logger.exception("Tarea programada %s fallo", task.nombre)
+            error = f"{type(e).__name__}: {e}"
+        duracion_ms = int((time.perf_counter() - inicio) * 1000)
+
+        now = utcnow()
+        intervalo = timedelta(seconds=task.intervalo_segundos)
+        async with self._factory()() as db:
+            row = await db.get(TareaProgramada, task.nombre)
+            # Mantener la fase: avanzar en multiplos del intervalo
+            proxima = row.proxima_ejecucion
+            while proxima <= now:
+                proxima += intervalo
+            row.proxima_ejecucion = proxima
+            row.ultima_ejecucion = now
+            row.ultima_duracion_ms = duracion_ms
+            row.ultimo_resultado = (resultado or "")[:255] or None
+            row.ultimo_error = error
+            await db.commit()
+        logger.info("Tarea programada %s: %s (%s ms)", task.nombre, error or resultado, duracion_ms)
+
+    async def tick(self) -> list[str]:
+        """Un ciclo: si es lider, ejecuta las tareas vencidas. Retorna sus nombres."""
+        if not await self.try_acquire_leadership():
+            return []
+        ejecutadas = []
+        for task in await self._tareas_vencidas():
+            # Renovar el lease antes de cada tarea (pueden ser largas)
+            if not await self.try_acquire_leadership():
+                break
+            await self._ejecutar(task)
+            ejecutadas.append(task.nombre)
+        return ejecutadas
+
+    async def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Error en ciclo del scheduler")
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Scheduler %s iniciado (%s tareas)", self.instance_id, len(self.tasks))
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        try:
+            await self.release_leadership()
+        except Exception:
+            logger.exception("No se pudo liberar el lease del scheduler")
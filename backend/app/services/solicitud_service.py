@@ -7,7 +7,7 @@ Ref: docs/source/05_api_y_policy.md
 from datetime import datetime, date
 from decimal import Decimal
 
-from sqlalchemy import select, func, or_, and_, exists
+from sqlalchemy import select, func, or_, and_, exists, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException
@@ -27,8 +27,9 @@ from app.models.solicitud import (
 )
 from app.models.cliente import ClienteApoderado
 from app.models.user import User
+from app.services import catalogos
 from app.services.estado_operativo import derivar_estado_operativo
-from app.services.policy import get_acciones_permitidas, assert_allowed
+from app.services.policy import get_acciones_permitidas, acciones_permitidas_lote, assert_allowed
 from app.utils.time import utcnow
 
 
@@ -172,6 +173,7 @@ async def create_promotor(
     )
     db.add(promotor)
     await db.flush()
+    catalogos.invalidar(db, "promotores")
     return promotor
 
 
@@ -214,17 +216,12 @@ async def create_solicitud(
     # Generar codigo
     solicitud.codigo = _generate_codigo(solicitud.solicitud_id)
 
-    # Copiar tarifa del servicio si se proporciona
+    # Copiar tarifa del servicio si se proporciona (cache de catalogos)
     if servicio_id:
-        from app.models.servicio import Servicio
-
-        srv_result = await db.execute(
-            select(Servicio).where(Servicio.servicio_id == servicio_id)
-        )
-        servicio = srv_result.scalar_one_or_none()
+        servicio = await catalogos.servicio(db, servicio_id)
         if servicio:
-            solicitud.tarifa_monto = servicio.tarifa_servicio
-            solicitud.tarifa_moneda = servicio.moneda_tarifa
+            solicitud.tarifa_monto = Decimal(servicio["tarifa_servicio"])
+            solicitud.tarifa_moneda = servicio["moneda_tarifa"]
             solicitud.tarifa_fuente = "SERVICIO"
 
     # Auditoria: registrar creacion
@@ -310,11 +307,13 @@ async def list_solicitudes(
     mine_user_id: int | None = None,
     mine_persona_id: int | None = None,
     mine_roles: list[str] | None = None,
+    user_roles: list[str] | None = None,
 ) -> tuple[list[dict], int]:
     """
     Lista solicitudes con filtros y paginacion.
     Si mine_user_id se proporciona, filtra por usuario segun roles:
       ADMIN -> sin filtro, OPERADOR -> created_by, GESTOR/MEDICO -> asignacion vigente.
+    Con user_roles, cada item incluye acciones_permitidas (tabla de POLICY en lote).
     Retorna (items, total).
     """
     # Query base
@@ -434,9 +433,14 @@ async def list_solicitudes(
             "gestor": vigentes["GESTOR"]["nombre"] if vigentes["GESTOR"] else None,
             "medico": vigentes["MEDICO"]["nombre"] if vigentes["MEDICO"] else None,
             "promotor": _build_promotor_dto(sol.promotor) if hasattr(sol, 'promotor') and sol.promotor else None,
-            "created_at": sol.created_at.isoformat() if sol.created_at else None,
+            "created_at": sol.created_at,
         })
 
+    if user_roles is not None:
+        lote = acciones_permitidas_lote(user_roles, (it["estado_operativo"] for it in items))
+        for item, acciones in zip(items, lote):
+            item["acciones_permitidas"] = list(acciones)
+
     return items, total
 
 
@@ -445,7 +449,10 @@ def build_detail_dto(
     user_roles: list[str],
     user_names: dict[int, str] | None = None,
 ) -> dict:
-    """Construye el DTO de detalle completo de una solicitud."""
+    """
+    Construye el DTO de detalle completo de una solicitud.
+    Fechas, Decimal y enums van nativos: los serializa RespuestaJSON.
+    """
     estado_op = _get_estado_operativo_for_solicitud(solicitud)
     acciones = get_acciones_permitidas(user_roles, estado_op)
     vigentes = _get_asignaciones_vigentes(solicitud)
@@ -463,7 +470,7 @@ def build_detail_dto(
             "nombre": f"{cliente_persona.nombres} {cliente_persona.apellidos}" if cliente_persona else "?",
             "celular": cliente_persona.celular_1 if cliente_persona else None,
             "email": cliente_persona.email if cliente_persona else None,
-            "fecha_nacimiento": cliente_persona.fecha_nacimiento.isoformat() if cliente_persona and cliente_persona.fecha_nacimiento else None,
+            "fecha_nacimiento": cliente_persona.fecha_nacimiento if cliente_persona else None,
             "direccion": cliente_persona.direccion if cliente_persona else None,
         } if solicitud.cliente else None,
         "apoderado": {
@@ -474,19 +481,19 @@ def build_detail_dto(
             "apellidos": solicitud.apoderado.apellidos,
             "celular_1": solicitud.apoderado.celular_1,
             "email": solicitud.apoderado.email,
-            "fecha_nacimiento": solicitud.apoderado.fecha_nacimiento.isoformat() if solicitud.apoderado.fecha_nacimiento else None,
+            "fecha_nacimiento": solicitud.apoderado.fecha_nacimiento,
             "direccion": solicitud.apoderado.direccion,
         } if solicitud.apoderado else None,
         "servicio": {
             "servicio_id": solicitud.servicio.servicio_id,
             "descripcion": solicitud.servicio.descripcion_servicio,
-            "tarifa": str(solicitud.servicio.tarifa_servicio),
+            "tarifa": solicitud.servicio.tarifa_servicio,
             "moneda": solicitud.servicio.moneda_tarifa,
         } if solicitud.servicio else None,
         "estado_atencion": solicitud.estado_atencion,
         "estado_pago": solicitud.estado_pago,
         "estado_certificado": solicitud.estado_certificado,
-        "tarifa_monto": str(solicitud.tarifa_monto) if solicitud.tarifa_monto else None,
+        "tarifa_monto": solicitud.tarifa_monto or None,
         "tarifa_moneda": solicitud.tarifa_moneda,
         "tipo_atencion": solicitud.tipo_atencion,
         "lugar_atencion": solicitud.lugar_atencion,
@@ -499,12 +506,12 @@ def build_detail_dto(
             {
                 "pago_id": p.pago_id,
                 "canal_pago": p.canal_pago,
-                "fecha_pago": p.fecha_pago.isoformat() if p.fecha_pago else None,
-                "monto": str(p.monto),
+                "fecha_pago": p.fecha_pago,
+                "monto": p.monto,
                 "moneda": p.moneda,
                 "referencia_transaccion": p.referencia_transaccion,
                 "comentario": p.comentario,
-                "validated_at": p.validated_at.isoformat() if p.validated_at else None,
+                "validated_at": p.validated_at,
             }
             for p in solicitud.pagos
         ],
@@ -517,6 +524,7 @@ def build_detail_dto(
                 "tipo": sa.archivo.tipo if sa.archivo else None,
                 "mime_type": sa.archivo.mime_type if sa.archivo else None,
                 "tamano_bytes": sa.archivo.tamano_bytes if sa.archivo else None,
+                "thumbnail_disponible": bool(sa.archivo and sa.archivo.thumbnail_path),
             }
             for sa in solicitud.archivos_rel
         ],
@@ -528,22 +536,22 @@ def build_detail_dto(
                 "valor_nuevo": h.valor_nuevo,
                 "cambiado_por": h.cambiado_por,
                 "usuario_nombre": (user_names or {}).get(h.cambiado_por) if h.cambiado_por else None,
-                "cambiado_en": h.cambiado_en.isoformat() if h.cambiado_en else None,
+                "cambiado_en": h.cambiado_en,
                 "comentario": h.comentario,
             }
             for h in solicitud.historial
         ],
         "motivo_cancelacion": solicitud.motivo_cancelacion,
-        "fecha_cierre": solicitud.fecha_cierre.isoformat() if solicitud.fecha_cierre else None,
+        "fecha_cierre": solicitud.fecha_cierre,
         "cerrado_por": solicitud.cerrado_por,
-        "fecha_cancelacion": solicitud.fecha_cancelacion.isoformat() if solicitud.fecha_cancelacion else None,
+        "fecha_cancelacion": solicitud.fecha_cancelacion,
         "cancelado_por": solicitud.cancelado_por,
         "comentario_admin": solicitud.comentario_admin,
         "resultados_medicos": [
             {
                 "resultado_id": rm.resultado_id,
                 "medico_id": rm.medico_id,
-                "fecha_evaluacion": rm.fecha_evaluacion.isoformat() if rm.fecha_evaluacion else None,
+                "fecha_evaluacion": rm.fecha_evaluacion,
                 "diagnostico": rm.diagnostico,
                 "resultado": rm.resultado,
                 "observaciones": rm.observaciones,
@@ -552,20 +560,25 @@ def build_detail_dto(
             }
             for rm in solicitud.resultados_medicos
         ],
-        "created_at": solicitud.created_at.isoformat() if solicitud.created_at else None,
-        "updated_at": solicitud.updated_at.isoformat() if solicitud.updated_at else None,
+        "created_at": solicitud.created_at,
+        "updated_at": solicitud.updated_at,
     }
 
 
 # ── M3: Workflow action helpers ─────────────────────────────────────
 
 
-async def validate_empleado_r10(db: AsyncSession, persona_id: int, rol: str) -> Empleado:
+async def validate_empleado_r10(db: AsyncSession, persona_id: int, rol: str) -> None:
     """
     Valida R10: persona debe tener un registro en empleado
     con estado_empleado=ACTIVO y rol_empleado=rol.
     Lanza 422 si no cumple.
     """
+    empleado = await catalogos.empleado(db, persona_id, rol)
+    if empleado and empleado["estado"] == "ACTIVO":
+        return
+
+    # Negativo en cache: confirmar en BD (el snapshot puede venir atrasado)
     stmt = select(Empleado).where(
         Empleado.persona_id == persona_id,
         Empleado.rol_empleado == rol,
@@ -585,7 +598,6 @@ async def validate_empleado_r10(db: AsyncSession, persona_id: int, rol: str) ->
             detail={"ok": False, "error": {"code": "VALIDATION_ERROR",
                     "message": f"El empleado no esta ACTIVO (estado: {empleado.estado_empleado})"}},
         )
-    return empleado
 
 
 def _compute_estado_op(solicitud: SolicitudCmep) -> str:
@@ -794,112 +806,82 @@ async def cancelar_solicitud(
 
 async def eliminar_solicitud(db: AsyncSession, solicitud: SolicitudCmep) -> None:
     """
-    Elimina una solicitud y todas sus entidades dependientes en orden.
+    Elimina una solicitud y todas sus entidades dependientes con un DELETE
+    por tabla. Los archivos fisicos se borran via job tras el COMMIT.
     Limpia cliente/apoderado si quedan huerfanos.
     """
-    from app.services.file_storage import delete_file
+    from app.services.file_storage import enqueue_storage_delete, release_contents
 
+    solicitud_id = solicitud.solicitud_id
     cliente_id = solicitud.cliente_id
     apoderado_id = solicitud.apoderado_id
 
-    # 1. Resultados medicos
-    for rm in list(solicitud.resultados_medicos):
-        await db.delete(rm)
-
-    # 2-3. Archivos: junction + archivo fisico + registro
-    for sa in list(solicitud.archivos_rel):
-        archivo = sa.archivo
-        await db.delete(sa)
-        if archivo:
-            try:
-                await delete_file(archivo.storage_path)
-            except Exception:
-                pass  # Si falla borrado fisico, seguimos
-            await db.delete(archivo)
-
-    # 4. Pagos
-    for pago in list(solicitud.pagos):
-        await db.delete(pago)
-
-    # 5. Historial
-    for h in list(solicitud.historial):
-        await db.delete(h)
-
-    # 6. Asignaciones
-    for a in list(solicitud.asignaciones):
-        await db.delete(a)
-
-    # 7. La solicitud misma
-    await db.delete(solicitud)
-    await db.flush()
+    # Archivos vinculados (una sola consulta, antes de borrar la junction)
+    archivo_rows = (await db.execute(
+        select(Archivo.archivo_id, Archivo.storage_path, Archivo.sha256,
+               Archivo.thumbnail_path, Archivo.preview_path)
+        .join(SolicitudArchivo, SolicitudArchivo.archivo_id == Archivo.archivo_id)
+        .where(SolicitudArchivo.solicitud_id == solicitud_id)
+    )).all()
+    archivo_ids = [r.archivo_id for r in archivo_rows]
+
+    # 1-7. Cascada en orden de FKs: un DELETE por tabla
+    await db.execute(delete(ResultadoMedico).where(ResultadoMedico.solicitud_id == solicitud_id))
+    await db.execute(delete(SolicitudArchivo).where(SolicitudArchivo.solicitud_id == solicitud_id))
+    if archivo_ids:
+        await db.execute(delete(Archivo).where(Archivo.archivo_id.in_(archivo_ids)))
+    await db.execute(delete(PagoSolicitud).where(PagoSolicitud.solicitud_id == solicitud_id))
+    await db.execute(
+        delete(SolicitudEstadoHistorial).where(SolicitudEstadoHistorial.solicitud_id == solicitud_id)
+    )
+    await db.execute(delete(SolicitudAsignacion).where(SolicitudAsignacion.solicitud_id == solicitud_id))
+    await db.execute(delete(SolicitudCmep).where(SolicitudCmep.solicitud_id == solicitud_id))
+
+    # Borrado fisico diferido: job en la misma transaccion (no se pierde ni retiene locks).
+    # Contenido deduplicado: solo se borra el que queda sin referencias.
+    await release_contents(db, [r.sha256 for r in archivo_rows if r.sha256])
+    for r in archivo_rows:
+        if not r.sha256:
+            for path in (r.storage_path, r.thumbnail_path, r.preview_path):
+                if path:
+                    enqueue_storage_delete(db, path)
 
     # 8-11. Limpieza condicional de cliente y apoderado
-    await _limpiar_cliente_huerfano(db, cliente_id)
-    if apoderado_id:
-        await _limpiar_apoderado_huerfano(db, apoderado_id)
+    await _limpiar_personas_huerfanas(db, cliente_id, apoderado_id)
 
 
-async def _persona_es_empleado_o_user(db: AsyncSession, persona_id: int) -> bool:
-    """Verifica si una persona tiene registro en empleados o users."""
-    emp = await db.execute(
-        select(func.count()).select_from(Empleado).where(Empleado.persona_id == persona_id)
+def _es_empleado_o_user(persona_id: int):
+    """EXISTS: la persona tiene registro en empleados o users."""
+    return or_(
+        exists().where(Empleado.persona_id == persona_id),
+        exists().where(User.persona_id == persona_id),
     )
-    if (emp.scalar() or 0) > 0:
-        return True
-    usr = await db.execute(
-        select(func.count()).select_from(User).where(User.persona_id == persona_id)
-    )
-    return (usr.scalar() or 0) > 0
-
 
-async def _limpiar_cliente_huerfano(db: AsyncSession, cliente_id: int) -> None:
-    """Elimina cliente + persona si ya no tiene solicitudes y no es empleado/user."""
-    count = (await db.execute(
-        select(func.count()).select_from(SolicitudCmep)
-        .where(SolicitudCmep.cliente_id == cliente_id)
-    )).scalar() or 0
-    if count > 0:
-        return
 
-    # Eliminar registros cliente_apoderado
-    ca_rows = (await db.execute(
-        select(ClienteApoderado).where(ClienteApoderado.cliente_id == cliente_id)
-    )).scalars().all()
-    for ca in ca_rows:
-        await db.delete(ca)
-
-    # Eliminar cliente
-    cliente = (await db.execute(
-        select(Cliente).where(Cliente.persona_id == cliente_id)
-    )).scalar_one_or_none()
-    if cliente:
-        await db.delete(cliente)
-        await db.flush()
-
-        # Eliminar persona si no es empleado/user
-        if not await _persona_es_empleado_o_user(db, cliente_id):
-            persona = (await db.execute(
-                select(Persona).where(Persona.persona_id == cliente_id)
-            )).scalar_one_or_none()
-            if persona:
-                await db.delete(persona)
-
-    await db.flush()
-
-
-async def _limpiar_apoderado_huerfano(db: AsyncSession, apoderado_id: int) -> None:
-    """Elimina persona del apoderado si ya no es apoderado de ninguna solicitud."""
-    count = (await db.execute(
-        select(func.count()).select_from(SolicitudCmep)
-        .where(SolicitudCmep.apoderado_id == apoderado_id)
-    )).scalar() or 0
-    if count > 0:
-        return
-
-    if not await _persona_es_empleado_o_user(db, apoderado_id):
-        persona = (await db.execute(
-            select(Persona).where(Persona.persona_id == apoderado_id)
-        )).scalar_one_or_none()
-        if persona:
-            await db.delete(persona)
-            await db.flush()
+async def _limpiar_personas_huerfanas(
+    db: AsyncSession, cliente_id: int, apoderado_id: int | None
+) -> None:
+    """
+    Elimina cliente (+ persona) si ya no tiene solicitudes, y la persona del
+    apoderado si ya no es apoderado de ninguna solicitud. Las personas que son
+    empleado/user se conservan. Todas las comprobaciones van en un solo SELECT.
+    """
+    checks = [
+        exists().where(SolicitudCmep.cliente_id == cliente_id).label("cliente_en_uso"),
+        _es_empleado_o_user(cliente_id).label("cliente_es_staff"),
+    ]
+    if apoderado_id:
+        checks += [
+            exists().where(SolicitudCmep.apoderado_id == apoderado_id).label("apoderado_en_uso"),
+            _es_empleado_o_user(apoderado_id).label("apoderado_es_staff"),
+        ]
+    flags = (await db.execute(select(*checks))).one()
+
+    if not flags.cliente_en_uso:
+        await db.execute(delete(ClienteApoderado).where(ClienteApoderado.cliente_id == cliente_id))
+        await db.execute(delete(Cliente).where(Cliente.persona_id == cliente_id))
+        if not flags.cliente_es_staff:
+            await db.execute(delete(Persona).where(Persona.persona_id == cliente_id))
+
+    if apoderado_id and not flags.apoderado_en_uso and not flags.apoderado_es_staff:
+        await db.execute(delete(Persona).where(Persona.persona_id == apoderado_id))
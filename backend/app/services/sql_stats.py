@@ -0,0 +1,87 @@
+"""
+Conteo de sentencias SQL y tiempo de BD por request (y por bloque en tests).
+
+- Listeners before/after_cursor_execute a nivel de la clase Engine: cubren
+  cualquier engine (el de la app, el de tests, replicas).
+- Los acumuladores activos viven en un contextvar; SQLAlchemy propaga el
+  contexto al greenlet del driver async, asi que cada request cuenta solo
+  sus propias sentencias aunque haya otras concurrentes.
+- Los bloques anidan: medir() dentro de otro medir() suma en ambos (el
+  presupuesto de consultas de los tests envuelve al del middleware).
+- Sospecha de N+1: una misma sentencia (texto con parametros ligados, no
+  valores) repetida SQL_NPLUS1_THRESHOLD veces o mas en el bloque.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class EstadisticasSQL:
+    consultas: int = 0
+    tiempo: float = 0.0  # segundos
+    sentencias: Counter = field(default_factory=Counter)
+    scope: dict | None = None  # scope ASGI del request, si hay
+
+    def repetidas(self, minimo: int) -> list[tuple[str, int]]:
+        """Sentencias ejecutadas `minimo` veces o mas (candidatas a N+1)."""
+        return [(s, n) for s, n in self.sentencias.most_common() if n >= minimo]
+
+    def resumen(self, maximo: int = 5) -> str:
+        lineas = [f"{self.consultas} consultas, {self.tiempo * 1000:.1f} ms"]
+        for sentencia, n in self.sentencias.most_common(maximo):
+            lineas.append(f"  {n}x {' '.join(sentencia.split())[:200]}")
+        return "\n".join(lineas)
+
+
+_activas: ContextVar[tuple[EstadisticasSQL, ...]] = ContextVar("sql_stats", default=())
+
+
+def actual() -> EstadisticasSQL | None:
+    """Acumulador mas interno activo (el del request en curso, si hay)."""
+    activas = _activas.get()
+    return activas[-1] if activas else None
+
+
+@contextmanager
+def medir(scope: dict | None = None):
+    """Cuenta las sentencias ejecutadas dentro del bloque (en este contexto)."""
+    stats = EstadisticasSQL(scope=scope)
+    token = _activas.set(_activas.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _activas.reset(token)
+
+
+# ── Listeners ───────────────────────────────────────────────────────────
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    # Siempre: tambien lo usa el log de consultas lentas (consultas_lentas)
+    if context is not None:
+        context._sql_stats_inicio = time.perf_counter()
+
+
+def duracion(context) -> float | None:
+    """Segundos desde before_cursor_execute (None si no se marco)."""
+    inicio = getattr(context, "_sql_stats_inicio", None)
+    return time.perf_counter() - inicio if inicio is not None else None
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    activas = _activas.get()
+    if not activas:
+        return
+    segundos = duracion(context) or 0.0
+    for stats in activas:
+        stats.consultas += 1
+        stats.tiempo += segundos
+        stats.sentencias[statement] += 1
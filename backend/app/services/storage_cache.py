@@ -0,0 +1,199 @@
+"""
+Cache LRU en disco local delante de S3 (read-through).
+
+- read_file() consulta primero el cache; en miss lee de S3 y guarda la copia.
+- Las keys de storage son inmutables (uuid o sha256): no hay invalidacion
+  salvo al borrar el objeto (discard).
+- Escrituras atomicas: archivo temporal + os.replace; un lector nunca ve
+  un archivo a medio escribir.
+- Eviccion por bytes (STORAGE_CACHE_MAX_BYTES), del menos usado al mas
+  usado. Al arrancar el indice se reconstruye del directorio por mtime.
+- prefetch() (opcional, STORAGE_CACHE_PREFETCH) precarga en segundo plano
+  las miniaturas y los originales chicos de una solicitud al abrir su
+  detalle, con tope de archivos por detalle: los escaneos grandes que nadie
+  abre no gastan transferencia S3 ni desplazan del cache lo que si se usa.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._index: OrderedDict[str, int] = OrderedDict()  # nombre -> bytes
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cargar_indice()
+
+    def _cargar_indice(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entradas = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                st = entry.stat()
+                entradas.append((st.st_mtime, entry.name, st.st_size))
+            elif entry.name.endswith(".tmp"):
+                os.unlink(entry.path)  # escritura interrumpida
+        for _, nombre, size in sorted(entradas):
+            self._index[nombre] = size
+            self._bytes += size
+        self._evict()
+
+    @staticmethod
+    def _nombre(key: str) -> str:
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def _path(self, nombre: str) -> Path:
+        return self.directory / nombre
+
+    def __contains__(self, key: str) -> bool:
+        return self._nombre(key) in self._index
+
+    def _touch(self, nombre: str) -> None:
+        self._index.move_to_end(nombre)
+        try:
+            os.utime(self._path(nombre))  # persistir recencia para el proximo arranque
+        except FileNotFoundError:
+            pass
+
+    async def get(self, key: str) -> bytes | None:
+        nombre = self._nombre(key)
+        if nombre not in self._index:
+            self.misses += 1
+            return None
+        try:
+            data = await run_in_threadpool(self._path(nombre).read_bytes)
+        except FileNotFoundError:
+            self._quitar(nombre)
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(nombre)
+        return data
+
+    def _write_atomic(self, nombre: str, data: bytes) -> None:
+        tmp = self._path(f"{nombre}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self._path(nombre))
+
+    async def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        nombre = self._nombre(key)
+        await run_in_threadpool(self._write_atomic, nombre, data)
+        self._quitar(nombre, borrar_archivo=False)
+        self._index[nombre] = len(data)
+        self._bytes += len(data)
+        self._evict()
+
+    def _quitar(self, nombre: str, borrar_archivo: bool = True) -> None:
+        size = self._index.pop(nombre, None)
+        if size is None:
+            return
+        self._bytes -= size
+        if borrar_archivo:
+            try:
+                os.unlink(self._path(nombre))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._index:
+            nombre = next(iter(self._index))
+            self._quitar(nombre)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        self._quitar(self._nombre(key))
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "evictions": self.evictions,
+        }
+
+
+# ── Instancia del proceso ───────────────────────────────────────────────
+
+_cache: DiskLRUCache | None = None
+
+
+def get_cache() -> DiskLRUCache | None:
+    """Cache del proceso, o None si esta desactivado o el storage es local."""
+    global _cache
+    if settings.FILE_STORAGE != "s3" or not settings.STORAGE_CACHE_MAX_BYTES:
+        return None
+    if _cache is None:
+        base = Path(settings.STORAGE_CACHE_DIR)
+        if not base.is_absolute():
+            base = Path(__file__).resolve().parent.parent.parent / base
+        _cache = DiskLRUCache(base, settings.STORAGE_CACHE_MAX_BYTES)
+    return _cache
+
+
+# ── Prefetch ────────────────────────────────────────────────────────────
+
+_prefetch_tasks: set[asyncio.Task] = set()
+_prefetch_sem: asyncio.Semaphore | None = None
+
+
+def prefetch(storage_paths: list[str]) -> None:
+    """Precarga en segundo plano los paths que no esten en cache (no bloquea)."""
+    cache = get_cache()
+    if cache is None or not settings.STORAGE_CACHE_PREFETCH:
+        return
+    from app.services.file_storage import _s3_key, read_file
+
+    # El cache esta indexado por key de S3; storage_path es la URL publica
+    pendientes = [p for p in storage_paths if p and _s3_key(p) not in cache]
+    pendientes = pendientes[:settings.STORAGE_CACHE_PREFETCH_MAX_FILES]
+    if not pendientes:
+        return
+
+    global _prefetch_sem
+    if _prefetch_sem is None:
+        _prefetch_sem = asyncio.Semaphore(settings.STORAGE_CACHE_PREFETCH_CONCURRENCY)
+
+    async def _uno(path: str) -> None:
+        async with _prefetch_sem:
+            if _s3_key(path) in cache:
+                return
+            try:
+                await read_file(path)
+            except Exception as e:
+                logger.debug("Prefetch de %s fallo: %s", path, e)
+
+    for path in pendientes:
+        task = asyncio.create_task(_uno(path))
+        _prefetch_tasks.add(task)
+        task.add_done_callback(_prefetch_tasks.discard)
+
+
+def prefetch_adjuntos(archivos) -> None:
+    """Precarga miniaturas y, despues, originales de hasta STORAGE_CACHE_PREFETCH_MAX_BYTES."""
+    prefetch(
+        [a.thumbnail_path for a in archivos]
+        + [a.storage_path for a in archivos
+           if (a.tamano_bytes or 0) <= settings.STORAGE_CACHE_PREFETCH_MAX_BYTES]
+    )
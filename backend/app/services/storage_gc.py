@@ -0,0 +1,149 @@
+"""
+Reconciliacion archivos <-> storage (garbage collector).
+
+Recorre el storage por paginas (ListObjectsV2 en S3, os.walk en local) y
+compara cada pagina contra archivos.nombre_storage con un SELECT ... IN:
+- Huerfanos: objetos sin registro en archivos (uploads que fallaron tras
+  save_file, borrados que no llegaron al storage). Se reportan y, con
+  borrar=True, se eliminan con paralelismo acotado. Solo cuentan los mas
+  antiguos que STORAGE_GC_GRACE_SECONDS: un upload en curso ya escribio el
+  objeto pero su fila aun no confirma.
+- Faltantes: registros de archivos cuyo objeto no aparece en el storage.
+  Solo se reportan (no hay de donde recuperarlos).
+Los derivados (<key>.thumb.webp, ...) cuentan como parte de su original.
+
+Se ejecuta como tarea del scheduler (storage_gc) o con `python -m app.storage_gc`.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.solicitud import Archivo
+from app.services.file_storage import iter_storage_pages, delete_key
+from app.services.derivados import base_key
+from app.utils.time import utcnow
+
+logger = logging.getLogger(__name__)
+
+# Cuantas keys/ids se guardan en el reporte (los contadores son exactos)
+MUESTRA_MAX = 100
+
+
+class ReporteGC:
+    def __init__(self, borrar: bool):
+        self.borrar = borrar
+        self.objetos_escaneados = 0
+        self.huerfanos = 0
+        self.huerfanos_borrados = 0
+        self.errores_borrado = 0
+        self.faltantes = 0
+        self.muestra_huerfanos: list[str] = []
+        self.muestra_faltantes: list[int] = []
+
+    def to_dict(self) -> dict:
+        return {
+            "borrar": self.borrar,
+            "objetos_escaneados": self.objetos_escaneados,
+            "huerfanos": self.huerfanos,
+            "huerfanos_borrados": self.huerfanos_borrados,
+            "errores_borrado": self.errores_borrado,
+            "faltantes": self.faltantes,
+            "muestra_huerfanos": self.muestra_huerfanos,
+            "muestra_faltantes": self.muestra_faltantes,
+        }
+
+    def resumen(self) -> str:
+        return (
+            f"escaneados={self.objetos_escaneados} huerfanos={self.huerfanos} "
+            f"borrados={self.huerfanos_borrados} faltantes={self.faltantes}"
+        )
+
+
+async def _borrar_huerfanos(keys: list[str], sem: asyncio.Semaphore, reporte: ReporteGC) -> None:
+    async def _uno(key: str) -> None:
+        async with sem:
+            try:
+                await delete_key(key)
+                reporte.huerfanos_borrados += 1
+            except Exception:
+                logger.warning("GC: no se pudo borrar %s", key, exc_info=True)
+                reporte.errores_borrado += 1
+
+    await asyncio.gather(*(_uno(k) for k in keys))
+
+
+async def reconciliar_storage(
+    session_factory,
+    borrar: bool = False,
+    page_size: int | None = None,
+    concurrency: int | None = None,
+    grace_seconds: int | None = None,
+) -> ReporteGC:
+    """
+    Compara storage contra archivos y reporta (o borra) huerfanos y faltantes.
+    Cada pagina usa una sesion corta: no se retiene conexion durante el listado.
+    """
+    page_size = page_size or settings.STORAGE_GC_PAGE_SIZE
+    sem = asyncio.Semaphore(concurrency or settings.STORAGE_GC_CONCURRENCY)
+    grace = settings.STORAGE_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    inicio = utcnow()
+    limite_huerfano = inicio - timedelta(seconds=grace)
+    reporte = ReporteGC(borrar)
+
+    # Keys del storage con registro: para detectar faltantes al final.
+    # Solo guarda keys referenciadas (acotado por el tamano de archivos).
+    presentes: set[str] = set()
+    borrados_pendientes: list[asyncio.Task] = []
+
+    async for page in iter_storage_pages(page_size):
+        reporte.objetos_escaneados += len(page)
+        # Derivados (miniaturas) se comparan por la key de su original
+        keys = {base_key(k) for k, _ in page}
+        async with session_factory() as db:
+            conocidas = set((await db.execute(
+                select(Archivo.nombre_storage).where(Archivo.nombre_storage.in_(keys))
+            )).scalars().all())
+        presentes.update(k for k, _ in page if k in conocidas)
+
+        huerfanos = [
+            k for k, mtime in page
+            if base_key(k) not in conocidas and mtime < limite_huerfano
+        ]
+        reporte.huerfanos += len(huerfanos)
+        espacio = MUESTRA_MAX - len(reporte.muestra_huerfanos)
+        reporte.muestra_huerfanos.extend(huerfanos[:max(espacio, 0)])
+        if borrar and huerfanos:
+            # Borrar esta pagina mientras se lista la siguiente
+            borrados_pendientes.append(
+                asyncio.create_task(_borrar_huerfanos(huerfanos, sem, reporte))
+            )
+
+    if borrados_pendientes:
+        await asyncio.gather(*borrados_pendientes)
+
+    # Faltantes: keyset por archivo_id, solo registros previos al inicio del escaneo
+    ultimo_id = 0
+    while True:
+        async with session_factory() as db:
+            rows = (await db.execute(
+                select(Archivo.archivo_id, Archivo.nombre_storage)
+                .where(Archivo.archivo_id > ultimo_id, Archivo.created_at < inicio)
+                .order_by(Archivo.archivo_id)
+                .limit(page_size)
+            )).all()
+        if not rows:
+            break
+        ultimo_id = rows[-1].archivo_id
+        for archivo_id, key in rows:
+            if key not in presentes:
+                reporte.faltantes += 1
+                if len(reporte.muestra_faltantes) < MUESTRA_MAX:
+                    reporte.muestra_faltantes.append(archivo_id)
+
+    if reporte.huerfanos or reporte.faltantes:
+        logger.warning("GC storage: %s", reporte.resumen())
+    return reporte
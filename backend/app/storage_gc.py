@@ -0,0 +1,42 @@
+"""
+Reconciliacion manual archivos <-> storage.
+
+    python -m app.storage_gc            # solo reporta
+    python -m app.storage_gc --borrar   # borra objetos huerfanos
+
+Imprime el reporte como JSON. La misma reconciliacion corre periodicamente
+en el scheduler (tarea storage_gc, STORAGE_GC_BORRAR).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from app.config import settings
+from app.services.storage_gc import reconciliar_storage
+
+logger = logging.getLogger("cmep.storage_gc")
+
+
+async def main(borrar: bool, grace_seconds: int | None) -> dict:
+    from app.database import _get_session_factory
+
+    reporte = await reconciliar_storage(
+        _get_session_factory(), borrar=borrar, grace_seconds=grace_seconds
+    )
+    return reporte.to_dict()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GC / reconciliacion de storage")
+    parser.add_argument("--borrar", action="store_true", help="borrar objetos huerfanos")
+    parser.add_argument("--grace-seconds", type=int, default=None,
+                        help=f"ignorar huerfanos mas recientes (default {settings.STORAGE_GC_GRACE_SECONDS})")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    print(json.dumps(asyncio.run(main(args.borrar, args.grace_seconds)), indent=2))
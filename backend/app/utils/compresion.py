@@ -0,0 +1,93 @@
+"""
+Codecs de compresion para el storage (gzip siempre; zstd si esta instalado).
+Compresion y descompresion por bloques (compressobj / decompressobj): nunca
+se arma una segunda copia intermedia completa del documento.
+"""
+
+import zlib
+
+CHUNK_SIZE = 256 * 1024
+
+# MIME que vale la pena comprimir (los ya comprimidos: jpeg, png, zip/docx...
+# se guardan tal cual)
+COMPRESSIBLE_MIME = {
+    "application/pdf",
+    "image/bmp",
+    "image/x-ms-bmp",
+    "image/tiff",
+    "application/msword",
+    "application/vnd.ms-excel",
+    "application/vnd.ms-powerpoint",
+    "application/rtf",
+    "application/json",
+    "application/xml",
+}
+
+# Si la ganancia no llega a este ratio se guarda sin comprimir
+MIN_RATIO = 0.9
+
+try:
+    import zstandard
+except ImportError:  # opcional: pip install zstandard
+    zstandard = None
+
+
+def zstd_disponible() -> bool:
+    return zstandard is not None
+
+
+def es_comprimible(mime_type: str | None) -> bool:
+    if not mime_type:
+        return False
+    return mime_type.startswith("text/") or mime_type in COMPRESSIBLE_MIME
+
+
+def _chunks(data: bytes):
+    view = memoryview(data)
+    for i in range(0, len(view), CHUNK_SIZE):
+        yield view[i:i + CHUNK_SIZE]
+
+
+def compress(data: bytes, codec: str, level: int | None = None) -> bytes:
+    """Comprime data con codec ("gzip" | "zstd") por bloques."""
+    if codec == "gzip":
+        comp = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        out = [comp.compress(c) for c in _chunks(data)]
+        out.append(comp.flush())
+        return b"".join(out)
+    if codec == "zstd":
+        comp = zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+        out = [comp.compress(c) for c in _chunks(data)]
+        out.append(comp.flush())
+        return b"".join(out)
+    raise ValueError(f"Codec no soportado: {codec}")
+
+
+def decompress(data: bytes, codec: str | None) -> bytes:
+    """Inverso de compress(); codec None retorna data sin cambios."""
+    if codec is None:
+        return data
+    if codec == "gzip":
+        dec = zlib.decompressobj(31)
+        out = [dec.decompress(c) for c in _chunks(data)]
+        out.append(dec.flush())
+        return b"".join(out)
+    if codec == "zstd":
+        dec = zstandard.ZstdDecompressor().decompressobj()
+        return b"".join(dec.decompress(c) for c in _chunks(data))
+    raise ValueError(f"Codec no soportado: {codec}")
+
+
+def maybe_compress(data: bytes, mime_type: str | None, codec: str) -> tuple[bytes, str | None]:
+    """
+    Comprime si el MIME es comprimible y la ganancia lo justifica.
+    Retorna (bytes_a_guardar, codec usado o None).
+    """
+    if not codec or not es_comprimible(mime_type) or not data:
+        return data, None
+    if codec == "zstd" and not zstd_disponible():
+        codec = "gzip"
+    comprimido = compress(data, codec)
+    if len(comprimido) > len(data) * MIN_RATIO:
+        return data, None
+    return comprimido, codec
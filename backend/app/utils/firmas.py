@@ -0,0 +1,45 @@
+"""
+Tokens firmados (HMAC-SHA256 con SESSION_SECRET) para datos que el cliente
+devuelve tal cual, p.ej. el upload presignado entre presign y confirm.
+Formato: base64url(json).base64url(hmac). No cifra: solo evita alteraciones.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from app.config import settings
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _mac(body: str) -> str:
+    return _b64(hmac.new(settings.SESSION_SECRET.encode(), body.encode(), hashlib.sha256).digest())
+
+
+def firmar(payload: dict, expires_in: int) -> str:
+    body = _b64(json.dumps({**payload, "exp": int(time.time()) + expires_in},
+                           separators=(",", ":")).encode())
+    return f"{body}.{_mac(body)}"
+
+
+def verificar(token: str) -> dict | None:
+    """Retorna el payload si la firma es valida y no expiro; si no, None."""
+    try:
+        body, mac = token.split(".", 1)
+        if not hmac.compare_digest(mac, _mac(body)):
+            return None
+        payload = json.loads(_unb64(body))
+    except (ValueError, json.JSONDecodeError):
+        return None
+    if payload.get("exp", 0) < time.time():
+        return None
+    return payload
@@ -0,0 +1,47 @@
+"""
+Render de miniatura y vista previa WebP (imagenes y primera pagina de PDF).
+Funciones puras y sin dependencias de la app: se ejecutan en un proceso
+aparte (ProcessPoolExecutor de app.services.derivados).
+"""
+
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+PDF_MIME = "application/pdf"
+# Resolucion del render de la primera pagina de un PDF (72 dpi * escala)
+PDF_RENDER_SCALE = 2.0
+
+
+def _abrir(data: bytes, mime: str) -> Image.Image:
+    if mime == PDF_MIME:
+        import pypdfium2 as pdfium  # opcional: solo para vistas previas de PDF
+
+        pdf = pdfium.PdfDocument(data)
+        try:
+            return pdf[0].render(scale=PDF_RENDER_SCALE).to_pil()
+        finally:
+            pdf.close()
+
+    img = Image.open(BytesIO(data))
+    img.draft("RGB", (2048, 2048))  # JPEG: decodificar ya reducido
+    return ImageOps.exif_transpose(img)  # fotos de celular rotadas
+
+
+def _webp(img: Image.Image, max_px: int) -> bytes:
+    copia = img.copy()
+    copia.thumbnail((max_px, max_px))
+    buf = BytesIO()
+    copia.save(buf, format="WEBP", quality=80, method=4)
+    return buf.getvalue()
+
+
+def render_derivados(data: bytes, mime: str, thumb_px: int, preview_px: int) -> dict[str, bytes]:
+    """Retorna {"thumb": webp, "preview": webp} para una imagen o PDF."""
+    img = _abrir(data, mime)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    return {
+        "thumb": _webp(img, thumb_px),
+        "preview": _webp(img, preview_px),
+    }
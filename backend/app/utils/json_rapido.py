@@ -0,0 +1,88 @@
+"""
+Serializacion JSON de respuestas con orjson, sin pasar por jsonable_encoder.
+
+- RespuestaJSON: default_response_class de la app. datetime/date, Enum,
+  UUID y dataclasses los resuelve orjson; Decimal sale como string ("150.00",
+  el contrato historico de montos y tarifas); cualquier otro tipo (modelos
+  pydantic, sets) cae a jsonable_encoder.
+- RutaJSON: route_class de los routers. Si el endpoint no declara
+  response_model ni response_class, el dict/lista que retorna se entrega
+  directo a RespuestaJSON: FastAPI no lo recorre con jsonable_encoder, que
+  en paginas de 100 items y reportes grandes era la mayor parte del tiempo
+  de serializacion. Status, headers y cookies del parametro `response`
+  (y status_code del decorador) se respetan igual que en FastAPI.
+"""
+
+import inspect
+from decimal import Decimal
+from functools import wraps
+
+import orjson
+from fastapi import Response
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+OPCIONES = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return jsonable_encoder(obj)
+
+
+def dumps(contenido) -> bytes:
+    return orjson.dumps(contenido, default=_default, option=OPCIONES)
+
+
+class RespuestaJSON(JSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+# Nombre del parametro que se agrega al endpoint para recibir la sub-respuesta
+_PARAM_RESPUESTA = "_respuesta_json"
+
+
+def _envolver(endpoint, status_code: int | None):
+    firma = inspect.signature(endpoint)
+    # FastAPI inyecta la sub-respuesta en un solo parametro: reusar `response: Response`
+    # si el endpoint ya lo declara; si no, agregar uno propio
+    propio = next(
+        (p.name for p in firma.parameters.values()
+         if isinstance(p.annotation, type) and issubclass(p.annotation, Response)),
+        None,
+    )
+    params = list(firma.parameters.values())
+    if propio is None:
+        params.append(inspect.Parameter(_PARAM_RESPUESTA, inspect.Parameter.KEYWORD_ONLY, annotation=Response))
+
+    @wraps(endpoint)
+    async def envoltura(*args, **kwargs):
+        sub = kwargs[propio] if propio else kwargs.pop(_PARAM_RESPUESTA)
+        contenido = await endpoint(*args, **kwargs)
+        if not isinstance(contenido, (dict, list)):
+            return contenido  # Response propia, None, etc.: camino normal de FastAPI
+        respuesta = RespuestaJSON(contenido, status_code=sub.status_code or status_code or 200)
+        respuesta.headers.raw.extend(sub.headers.raw)
+        return respuesta
+
+    envoltura.__signature__ = firma.replace(parameters=params, return_annotation=inspect.Signature.empty)
+    envoltura._json_rapido = True
+    return envoltura
+
+
+class RutaJSON(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        sin_modelo = (
+            isinstance(kwargs.get("response_model"), DefaultPlaceholder)
+            or kwargs.get("response_model") is None
+        ) and inspect.signature(endpoint).return_annotation is inspect.Signature.empty
+        sin_clase = isinstance(kwargs.get("response_class", DefaultPlaceholder(None)), DefaultPlaceholder)
+        # include_router vuelve a crear la ruta con el endpoint ya envuelto
+        envuelto = getattr(endpoint, "_json_rapido", False)
+        if sin_modelo and sin_clase and not envuelto and inspect.iscoroutinefunction(endpoint):
+            endpoint = _envolver(endpoint, kwargs.get("status_code"))
+        super().__init__(path, endpoint, **kwargs)
@@ -0,0 +1,47 @@
+"""
+Worker standalone de jobs en segundo plano.
+
+    python -m app.worker
+
+Usar cuando la API corre con JOBS_WORKER_ENABLED=false (p.ej. varias
+instancias de API y un worker dedicado). Termina limpio con SIGINT/SIGTERM.
+"""
+
+import asyncio
+import logging
+import signal
+
+from app.config import settings
+from app.services.jobs import JobWorker
+
+logger = logging.getLogger("cmep.worker")
+
+
+async def main() -> None:
+    worker = JobWorker()
+    worker.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    )
+    logger.info("CMEP worker starting — env=%s", settings.APP_ENV)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -3,13 +3,21 @@ Fixtures compartidas para tests de integracion.
 Engine SQLite unico para evitar conflictos de dependency_overrides.
 """
 
+import tempfile
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.pool import StaticPool
 
+from app.config import settings
 from app.database import Base, get_db
 from app.main import app
 
+# --- Storage local en directorio temporal (sin S3 en tests) ---
+settings.FILE_STORAGE = "local"
+settings.UPLOAD_DIR = tempfile.mkdtemp(prefix="cmep_test_uploads_")
+
 # --- Engine SQLite async compartido ---
 test_engine = create_async_engine(
     "sqlite+aiosqlite:///:memory:",
@@ -32,3 +40,32 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+
+
+# --- Cache de catalogos: cada test recrea la BD, no reutilizar snapshots ---
+@pytest.fixture(autouse=True)
+def _reset_catalogos():
+    from app.services import catalogos
+    catalogos.reset()
+    yield
+    catalogos.reset()
+
+
+# --- Presupuesto de consultas SQL por bloque (ver app.services.sql_stats) ---
+@pytest.fixture
+def max_consultas():
+    """
+    Uso: with max_consultas(6): resp = await client.get(...)
+    Falla si el bloque ejecuta mas sentencias SQL que el presupuesto.
+    """
+    from app.services import sql_stats
+
+    @contextmanager
+    def _presupuesto(maximo: int):
+        with sql_stats.medir() as stats:
+            yield stats
+        assert stats.consultas <= maximo, (
+            f"Presupuesto de consultas excedido ({maximo}): {stats.resumen()}"
+        )
+
+    return _presupuesto
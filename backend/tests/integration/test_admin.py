@@ -120,6 +120,56 @@ async def test_list_users_as_admin(client: AsyncClient):
     assert len(body["data"]) >= 2  # admin + operador
 
 
+@pytest.mark.anyio
+async def test_list_users_paginado_y_filtros(client: AsyncClient):
+    """Paginacion con total, filtros por rol y estado; roles agregados en el DTO."""
+    for i in range(3):
+        resp = await client.post(
+            "/admin/usuarios",
+            json=_new_user_payload(
+                user_email=f"medico{i}@cmep.local", numero_documento=f"9100000{i}",
+                roles=["MEDICO", "GESTOR"],
+            ),
+            cookies=_cookies("test-admin-session"),
+        )
+        assert resp.status_code == 201
+    suspendido_id = resp.json()["data"]["user_id"]
+    resp = await client.patch(
+        f"/admin/usuarios/{suspendido_id}", json={"is_active": False},
+        cookies=_cookies("test-admin-session"),
+    )
+    assert resp.status_code == 200
+
+    resp = await client.get("/admin/usuarios", params={"page_size": 2}, cookies=_cookies("test-admin-session"))
+    body = resp.json()
+    assert body["meta"] == {"page": 1, "page_size": 2, "total": 5}
+    assert [u["user_email"] for u in body["data"]] == ["admin@cmep.local", "operador@cmep.local"]
+    assert body["data"][0]["roles"] == ["ADMIN"]
+    assert body["data"][0]["nombres"] == "Admin"
+
+    resp = await client.get("/admin/usuarios", params={"page": 3, "page_size": 2}, cookies=_cookies("test-admin-session"))
+    assert len(resp.json()["data"]) == 1
+
+    resp = await client.get("/admin/usuarios", params={"page": 9}, cookies=_cookies("test-admin-session"))
+    assert resp.json()["data"] == []
+    assert resp.json()["meta"]["total"] == 5
+
+    resp = await client.get("/admin/usuarios", params={"rol": "MEDICO"}, cookies=_cookies("test-admin-session"))
+    medicos = resp.json()["data"]
+    assert len(medicos) == 3
+    assert all(u["roles"] == ["GESTOR", "MEDICO"] for u in medicos)
+
+    resp = await client.get(
+        "/admin/usuarios", params={"rol": "MEDICO", "estado": "SUSPENDIDO"},
+        cookies=_cookies("test-admin-session"),
+    )
+    assert [u["user_id"] for u in resp.json()["data"]] == [suspendido_id]
+    assert resp.json()["data"][0]["is_active"] is False
+
+    resp = await client.get("/admin/usuarios", params={"rol": "NOPE"}, cookies=_cookies("test-admin-session"))
+    assert resp.status_code == 422
+
+
 @pytest.mark.anyio
 async def test_list_users_as_non_admin(client: AsyncClient):
     """Non-ADMIN recibe 403."""
@@ -424,3 +474,19 @@ async def test_reset_password_nonexistent(client: AsyncClient):
         cookies=_cookies("test-admin-session"),
     )
     assert resp.status_code == 404
+
+
+# ── GET /admin/db-pool ────────────────────────────────────────────────
+
+@pytest.mark.anyio
+async def test_db_pool_stats(client: AsyncClient):
+    """ADMIN ve el estado del pool y el histograma de espera; otros roles no."""
+    resp = await client.get("/admin/db-pool", cookies=_cookies("test-operador-session"))
+    assert resp.status_code == 403
+
+    resp = await client.get("/admin/db-pool", cookies=_cookies("test-admin-session"))
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert set(data) == {"pool", "pool_lectura", "espera_checkout", "timeouts"}
+    assert data["espera_checkout"]["buckets"]["+Inf"] == data["espera_checkout"]["count"]
+    assert data["timeouts"] >= 0
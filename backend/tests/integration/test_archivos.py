@@ -378,3 +378,445 @@ async def test_archivos_appear_in_detail():
         # Verify new fields present
         assert archivos[0]["mime_type"] is not None
         assert archivos[0]["tamano_bytes"] is not None
+
+
+# ── Deduplicacion por contenido ──────────────────────────────────────
+
+async def _upload(
+    client: AsyncClient, sol_id: int, name: str, content: bytes, mime: str = "application/pdf",
+) -> int:
+    resp = await client.post(
+        f"/solicitudes/{sol_id}/archivos",
+        files={"file": (name, content, mime)},
+        data={"tipo_archivo": "DOCUMENTO"},
+        cookies=_cookies("test-operador-session"),
+    )
+    assert resp.status_code == 200
+    return resp.json()["data"]["archivo_id"]
+
+
+async def _contenidos() -> list:
+    from sqlalchemy import select
+    from app.models.solicitud import ArchivoContenido
+    async with TestSessionLocal() as db:
+        return (await db.execute(select(ArchivoContenido))).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_upload_duplicado_comparte_objeto():
+    """El mismo contenido se guarda una vez; borrar solo libera la ultima referencia."""
+    from pathlib import Path
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        a1 = await _upload(client, sol_id, "dni.txt", b"DNI-ESCANEADO", "text/plain")
+        a2 = await _upload(client, sol_id, "dni_copia.txt", b"DNI-ESCANEADO", "text/plain")
+
+        contenidos = await _contenidos()
+        assert len(contenidos) == 1
+        assert contenidos[0].ref_count == 2
+        path = Path(contenidos[0].storage_path)
+        assert path.exists()
+
+        resp = await client.get(f"/archivos/{a2}", cookies=_cookies("test-operador-session"))
+        assert resp.content == b"DNI-ESCANEADO"
+
+        await client.delete(f"/archivos/{a1}", cookies=_cookies("test-operador-session"))
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 0
+        assert (await _contenidos())[0].ref_count == 1
+        assert path.exists()
+
+        await client.delete(f"/archivos/{a2}", cookies=_cookies("test-operador-session"))
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 1
+        assert await _contenidos() == []
+        assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_revive_contenido_pendiente_de_borrado():
+    """Una subida antes de que corra el job de borrado reutiliza el objeto."""
+    from pathlib import Path
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        a1 = await _upload(client, sol_id, "voucher.txt", b"VOUCHER", "text/plain")
+        await client.delete(f"/archivos/{a1}", cookies=_cookies("test-operador-session"))
+        assert (await _contenidos())[0].ref_count == 0
+
+        a2 = await _upload(client, sol_id, "voucher.txt", b"VOUCHER", "text/plain")
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 1
+
+        contenidos = await _contenidos()
+        assert contenidos[0].ref_count == 1
+        assert Path(contenidos[0].storage_path).exists()
+        resp = await client.get(f"/archivos/{a2}", cookies=_cookies("test-operador-session"))
+        assert resp.content == b"VOUCHER"
+
+
+@pytest.mark.asyncio
+async def test_upload_si_el_contenido_no_se_puede_referenciar(monkeypatch):
+    """Si la referencia falla (contenido borrandose), la subida queda como copia propia."""
+    import hashlib
+    from sqlalchemy import select
+    from app.models.solicitud import Archivo
+    from app.services import file_storage
+
+    referenciar = file_storage._referenciar_contenido
+    llamadas = []
+
+    async def _una_vez_none(db, *args, **kwargs):
+        llamadas.append(args[0])
+        if len(llamadas) == 1:
+            # Como el UPDATE real sin filas afectadas: la transaccion ya ejecuto algo
+            await db.execute(select(Archivo.archivo_id).limit(1))
+            return None
+        return await referenciar(db, *args, **kwargs)
+
+    monkeypatch.setattr(file_storage, "_referenciar_contenido", _una_vez_none)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        archivo_id = await _upload(client, sol_id, "carrera.txt", b"CARRERA", "text/plain")
+
+        async with TestSessionLocal() as db:
+            archivo = await db.get(Archivo, archivo_id)
+        assert archivo.sha256 is None
+        assert archivo.nombre_storage != file_storage.content_storage_name(hashlib.sha256(b"CARRERA").hexdigest())
+        assert await _contenidos() == []
+        resp = await client.get(f"/archivos/{archivo_id}", cookies=_cookies("test-operador-session"))
+        assert resp.content == b"CARRERA"
+
+
+@pytest.mark.asyncio
+async def test_upload_no_toca_la_key_de_un_contenido_en_borrado(monkeypatch):
+    """Con ref_count=-1 el job esta borrando la key sha256: la subida va a una key propia."""
+    from pathlib import Path
+    from sqlalchemy import update
+    from app.models.solicitud import Archivo, ArchivoContenido
+    from app.services import file_storage
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        a1 = await _upload(client, sol_id, "recibo.txt", b"RECIBO", "text/plain")
+        await client.delete(f"/archivos/{a1}", cookies=_cookies("test-operador-session"))
+        contenido = (await _contenidos())[0]
+        # El job ya paso 0 -> -1 y esta borrando el objeto
+        async with TestSessionLocal() as db:
+            await db.execute(update(ArchivoContenido).values(ref_count=-1))
+            await db.commit()
+
+        keys = []
+        save_original = file_storage.save_file
+
+        async def _save(data, key):
+            keys.append(key)
+            return await save_original(data, key)
+
+        monkeypatch.setattr(file_storage, "save_file", _save)
+        a2 = await _upload(client, sol_id, "recibo.txt", b"RECIBO", "text/plain")
+        assert contenido.nombre_storage not in keys
+
+        async with TestSessionLocal() as db:
+            archivo = await db.get(Archivo, a2)
+        assert archivo.sha256 is None
+        assert archivo.nombre_storage == keys[0]
+
+        # El job termina de borrar el contenido; la copia propia sigue intacta
+        async with TestSessionLocal() as db:
+            await db.execute(update(ArchivoContenido).values(ref_count=0))
+            await db.commit()
+        await JobWorker(TestSessionLocal).run_until_empty()
+        assert await _contenidos() == []
+        assert not Path(contenido.storage_path).exists()
+        resp = await client.get(f"/archivos/{a2}", cookies=_cookies("test-operador-session"))
+        assert resp.content == b"RECIBO"
+
+
+# ── Miniaturas / vistas previas ──────────────────────────────────────
+
+def _png(width: int, height: int) -> bytes:
+    from io import BytesIO
+    from PIL import Image
+    buf = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _pdf() -> bytes:
+    from io import BytesIO
+    from PIL import Image
+    buf = BytesIO()
+    Image.new("RGB", (600, 800), (255, 255, 255)).save(buf, format="PDF")
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_de_imagen_y_pdf():
+    from io import BytesIO
+    from PIL import Image
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        foto = await client.post(
+            f"/solicitudes/{sol_id}/archivos",
+            files={"file": ("voucher.png", _png(1600, 1200), "image/png")},
+            data={"tipo_archivo": "EVIDENCIA_PAGO"},
+            cookies=_cookies("test-operador-session"),
+        )
+        foto_id = foto.json()["data"]["archivo_id"]
+        pdf_id = await _upload(client, sol_id, "scan.pdf", _pdf())
+
+        # Aun no generada
+        resp = await client.get(f"/archivos/{foto_id}/thumbnail", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 404
+
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 2
+
+        for archivo_id in (foto_id, pdf_id):
+            resp = await client.get(
+                f"/archivos/{archivo_id}/thumbnail", cookies=_cookies("test-operador-session")
+            )
+            assert resp.status_code == 200
+            assert resp.headers["content-type"] == "image/webp"
+            assert max(Image.open(BytesIO(resp.content)).size) <= 256
+
+        resp = await client.get(
+            f"/archivos/{foto_id}/thumbnail?variante=preview", cookies=_cookies("test-operador-session")
+        )
+        assert resp.status_code == 200
+        assert Image.open(BytesIO(resp.content)).size == (1024, 768)
+
+        detalle = await client.get(f"/solicitudes/{sol_id}", cookies=_cookies("test-operador-session"))
+        assert all(a["thumbnail_disponible"] for a in detalle.json()["data"]["archivos"])
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_se_comparte_entre_duplicados():
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        pdf = _pdf()  # una sola vez: el PDF lleva fecha de creacion
+        a1 = await _upload(client, sol_id, "a.pdf", pdf)
+        await JobWorker(TestSessionLocal).run_until_empty()
+        a2 = await _upload(client, sol_id, "b.pdf", pdf)
+        await JobWorker(TestSessionLocal).run_until_empty()
+
+        from sqlalchemy import select
+        from app.models.solicitud import Archivo
+        async with TestSessionLocal() as db:
+            paths = (await db.execute(
+                select(Archivo.thumbnail_path).where(Archivo.archivo_id.in_([a1, a2]))
+            )).scalars().all()
+        assert len(paths) == 2 and paths[0] is not None and paths[0] == paths[1]
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_tipo_no_soportado_no_encola():
+    from app.services.jobs import JobWorker
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos",
+            files={"file": ("notas.txt", b"texto", "text/plain")},
+            data={"tipo_archivo": "OTROS"},
+            cookies=_cookies("test-operador-session"),
+        )
+        archivo_id = resp.json()["data"]["archivo_id"]
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 0
+
+        resp = await client.get(f"/archivos/{archivo_id}/thumbnail", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 404
+
+
+# ── Compresion transparente ──────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_compresion_transparente(monkeypatch):
+    """Se guarda comprimido; la descarga es identica al original."""
+    import gzip
+    from pathlib import Path
+    from sqlalchemy import select
+    from app.config import settings
+    from app.models.solicitud import Archivo
+
+    monkeypatch.setattr(settings, "STORAGE_COMPRESSION", "gzip")
+    original = b"%PDF-1.4 texto del informe medico " * 5000
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        archivo_id = await _upload(client, sol_id, "informe.txt", original, "text/plain")
+
+        async with TestSessionLocal() as db:
+            archivo = (await db.execute(
+                select(Archivo).where(Archivo.archivo_id == archivo_id)
+            )).scalar_one()
+        assert archivo.codec == "gzip"
+        assert archivo.tamano_bytes == len(original)
+        assert Path(archivo.storage_path).stat().st_size < len(original) // 10
+
+        # Cliente sin gzip: se descomprime en el servidor
+        resp = await client.get(
+            f"/archivos/{archivo_id}",
+            headers={"Accept-Encoding": "identity"},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 200
+        assert resp.content == original
+
+        # gzip rechazado explicitamente (q=0): tambien se descomprime
+        resp = await client.get(
+            f"/archivos/{archivo_id}",
+            headers={"Accept-Encoding": "gzip;q=0, identity"},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert "content-encoding" not in resp.headers
+        assert resp.content == original
+
+        # Cliente con gzip: se envian los bytes guardados con Content-Encoding
+        resp = await client.get(
+            f"/archivos/{archivo_id}",
+            headers={"Accept-Encoding": "gzip"},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.content == original  # httpx decodifica
+        assert gzip.decompress(Path(archivo.storage_path).read_bytes()) == original
+
+
+@pytest.mark.asyncio
+async def test_presign_no_disponible_con_storage_local():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/presign",
+            json={"nombre": "a.pdf", "mime_type": "application/pdf", "tamano_bytes": 10},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 409
+        assert resp.json()["detail"]["error"]["code"] == "PRESIGN_NOT_AVAILABLE"
+
+
+# ── ZIP de adjuntos ──────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_zip_de_adjuntos_en_orden_y_con_faltantes():
+    import io
+    import zipfile
+    from pathlib import Path
+    from sqlalchemy import select
+    from app.models.solicitud import Archivo
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        contenidos = [b"ZIP-UNO", b"ZIP-DOS" * 1000, b"ZIP-TRES", b"ZIP-CUATRO"]
+        nombres = ["informe.txt", "informe.txt", "foto.jpg", "perdido.txt"]
+        ids = []
+        for nombre, contenido in zip(nombres, contenidos):
+            mime = "image/jpeg" if nombre.endswith(".jpg") else "text/plain"
+            ids.append(await _upload(client, sol_id, nombre, contenido, mime))
+
+        # Un objeto desaparecio del storage
+        async with TestSessionLocal() as db:
+            path = (await db.execute(
+                select(Archivo.storage_path).where(Archivo.archivo_id == ids[3])
+            )).scalar_one()
+        Path(path).unlink()
+
+        resp = await client.get(f"/solicitudes/{sol_id}/archivos.zip", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/zip"
+
+    zf = zipfile.ZipFile(io.BytesIO(resp.content))
+    assert zf.namelist() == ["informe.txt", "informe (2).txt", "foto.jpg", "FALTANTES.txt"]
+    assert zf.read("informe.txt") == b"ZIP-UNO"
+    assert zf.read("informe (2).txt") == b"ZIP-DOS" * 1000
+    assert zf.getinfo("informe (2).txt").compress_type == zipfile.ZIP_DEFLATED
+    assert zf.getinfo("foto.jpg").compress_type == zipfile.ZIP_STORED
+    assert "perdido.txt" in zf.read("FALTANTES.txt").decode()
+
+
+@pytest.mark.asyncio
+async def test_zip_solicitud_inexistente():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/solicitudes/99999/archivos.zip", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 404
+
+
+# ── Conexion de BD libre durante la E/S de storage ───────────────────
+
+@pytest.mark.asyncio
+async def test_upload_y_descarga_no_retienen_conexion_durante_storage(monkeypatch):
+    import asyncio
+    from sqlalchemy import event
+    from app.api import archivos as archivos_api
+    from app.services import file_storage
+
+    en_uso = 0
+
+    def _checkout(*_):
+        nonlocal en_uso
+        en_uso += 1
+
+    def _checkin(*_):
+        nonlocal en_uso
+        en_uso -= 1
+
+    pool = test_engine.sync_engine.pool
+    event.listen(pool, "checkout", _checkout)
+    event.listen(pool, "checkin", _checkin)
+
+    entro, soltar = asyncio.Event(), asyncio.Event()
+    conexiones_en_io: list[int] = []
+    save_original = file_storage.save_file
+    read_original = archivos_api.read_content
+
+    async def _save_lento(data, key):
+        conexiones_en_io.append(en_uso)
+        entro.set()
+        await soltar.wait()
+        return await save_original(data, key)
+
+    async def _read_lento(path, codec):
+        conexiones_en_io.append(en_uso)
+        return await read_original(path, codec)
+
+    monkeypatch.setattr(file_storage, "save_file", _save_lento)
+    monkeypatch.setattr(archivos_api, "read_content", _read_lento)
+    try:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            sol_id = await _create_solicitud(client)
+            upload = asyncio.create_task(_upload(client, sol_id, "lento.txt", b"S3 LENTO", "text/plain"))
+            await asyncio.wait_for(entro.wait(), 5)
+
+            # Con el PUT colgado, otras requests usan la BD con normalidad
+            resp = await client.get(f"/solicitudes/{sol_id}", cookies=_cookies("test-operador-session"))
+            assert resp.status_code == 200
+            assert not upload.done()
+
+            soltar.set()
+            archivo_id = await upload
+            resp = await client.get(f"/archivos/{archivo_id}", cookies=_cookies("test-operador-session"))
+            assert resp.content == b"S3 LENTO"
+    finally:
+        event.remove(pool, "checkout", _checkout)
+        event.remove(pool, "checkin", _checkin)
+
+    assert conexiones_en_io == [0, 0]
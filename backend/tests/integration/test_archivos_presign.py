@@ -0,0 +1,193 @@
+"""
+Tests de integracion: upload directo a S3 (presign + confirm).
+S3 simulado con moto.
+
+Usa engine compartido de conftest.py.
+"""
+
+from datetime import timedelta
+
+import boto3
+import pytest
+from httpx import AsyncClient, ASGITransport
+from moto import mock_aws
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import Base
+from app.main import app
+from app.models.persona import Persona
+from app.models.solicitud import Archivo, SolicitudArchivo
+from app.models.user import User, UserRole, EstadoUser, UserRoleEnum, Session
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+BUCKET = "cmep-test-bucket"
+
+
+@pytest.fixture(autouse=True)
+async def setup_db(monkeypatch):
+    """Crea tablas, un ADMIN con sesion y un bucket S3 simulado."""
+    monkeypatch.setattr(settings, "FILE_STORAGE", "s3")
+    monkeypatch.setattr(settings, "S3_BUCKET", BUCKET)
+    monkeypatch.setattr(settings, "STORAGE_CACHE_MAX_BYTES", 0)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with TestSessionLocal() as db:
+        persona = Persona(
+            tipo_documento="DNI", numero_documento="00000001",
+            nombres="Admin", apellidos="Sistema", email="admin@cmep.local",
+        )
+        db.add(persona)
+        await db.flush()
+        user = User(
+            persona_id=persona.persona_id,
+            user_email="admin@cmep.local",
+            password_hash=hash_password("admin123"),
+            estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(user)
+        await db.flush()
+        db.add(UserRole(user_id=user.user_id, user_role=UserRoleEnum.ADMIN.value))
+        db.add(Session(
+            session_id="test-admin-session",
+            user_id=user.user_id,
+            expires_at=utcnow() + timedelta(hours=24),
+        ))
+        await db.commit()
+
+    with mock_aws():
+        boto3.client("s3", region_name=settings.S3_REGION).create_bucket(Bucket=BUCKET)
+        yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def _cookies() -> dict:
+    return {"cmep_session": "test-admin-session"}
+
+
+async def _create_solicitud(client: AsyncClient) -> int:
+    resp = await client.post("/solicitudes", json={
+        "cliente": {
+            "tipo_documento": "DNI", "numero_documento": "44556677",
+            "nombres": "Cliente", "apellidos": "Presign",
+        },
+    }, cookies=_cookies())
+    assert resp.status_code == 200
+    return resp.json()["data"]["solicitud_id"]
+
+
+async def _presign(client: AsyncClient, sol_id: int, **overrides) -> dict:
+    body = {"nombre": "voucher.pdf", "mime_type": "application/pdf",
+            "tamano_bytes": 11, "tipo_archivo": "DOCUMENTO", **overrides}
+    resp = await client.post(f"/solicitudes/{sol_id}/archivos/presign", json=body, cookies=_cookies())
+    assert resp.status_code == 200, resp.text
+    return resp.json()["data"]
+
+
+def _subir_como_navegador(data: dict, content: bytes, content_type: str) -> None:
+    """Simula el POST del navegador al bucket: el objeto aparece con esa key."""
+    boto3.client("s3", region_name=settings.S3_REGION).put_object(
+        Bucket=BUCKET, Key=data["fields"]["key"], Body=content, ContentType=content_type,
+    )
+
+
+@pytest.mark.asyncio
+async def test_presign_y_confirm_registra_archivo():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        data = await _presign(client, sol_id)
+
+        assert BUCKET in data["url"]
+        assert data["fields"]["key"].startswith("incoming/")
+        assert data["fields"]["Content-Type"] == "application/pdf"
+        assert "policy" in data["fields"]
+
+        _subir_como_navegador(data, b"PDF-DIRECTO", "application/pdf")
+
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/confirm",
+            json={"upload_token": data["upload_token"]}, cookies=_cookies(),
+        )
+        assert resp.status_code == 200
+        archivo = resp.json()["data"]
+        assert archivo["nombre"] == "voucher.pdf"
+        assert archivo["tamano_bytes"] == len(b"PDF-DIRECTO")
+
+        # Confirm repetido: idempotente
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/confirm",
+            json={"upload_token": data["upload_token"]}, cookies=_cookies(),
+        )
+        assert resp.json()["data"]["archivo_id"] == archivo["archivo_id"]
+
+        resp = await client.get(f"/archivos/{archivo['archivo_id']}", cookies=_cookies())
+        assert resp.status_code == 200
+        assert resp.content == b"PDF-DIRECTO"
+
+    async with TestSessionLocal() as db:
+        links = (await db.execute(select(SolicitudArchivo))).scalars().all()
+        assert [link.solicitud_id for link in links] == [sol_id]
+
+
+@pytest.mark.asyncio
+async def test_confirm_sin_objeto_o_token_alterado():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        data = await _presign(client, sol_id)
+
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/confirm",
+            json={"upload_token": data["upload_token"]}, cookies=_cookies(),
+        )
+        assert resp.status_code == 409
+        assert resp.json()["detail"]["error"]["code"] == "UPLOAD_NOT_FOUND"
+
+        body, mac = data["upload_token"].split(".")
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/confirm",
+            json={"upload_token": body + "x." + mac}, cookies=_cookies(),
+        )
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_confirm_rechaza_content_type_distinto():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        data = await _presign(client, sol_id)
+        _subir_como_navegador(data, b"<html>", "text/html")
+
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/confirm",
+            json={"upload_token": data["upload_token"]}, cookies=_cookies(),
+        )
+        assert resp.status_code == 422
+
+    async with TestSessionLocal() as db:
+        assert (await db.execute(select(Archivo))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_presign_valida_tamano():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/archivos/presign",
+            json={"nombre": "big.pdf", "mime_type": "application/pdf",
+                  "tamano_bytes": 50 * 1024 * 1024},
+            cookies=_cookies(),
+        )
+        assert resp.status_code == 422
@@ -0,0 +1,258 @@
+"""
+Tests de integracion: cache de catalogos (servicios, empleados, promotores)
+con ETag / 304 e invalidacion al confirmar escrituras.
+"""
+
+import pytest
+from decimal import Decimal
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event, select
+
+from app.database import Base
+from app.main import app
+from app.models.persona import Persona
+from app.models.servicio import Servicio
+from app.models.empleado import Empleado, RolEmpleado, EstadoEmpleado
+from app.models.solicitud import SolicitudCmep
+from app.models.user import User, UserRole, EstadoUser, UserRoleEnum, Session
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+from datetime import timedelta
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+def _cookies(session_id: str) -> dict:
+    return {"cmep_session": session_id}
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    """ADMIN + OPERADOR, un GESTOR activo y un servicio."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with TestSessionLocal() as db:
+        for i, (email, rol, sid) in enumerate([
+            ("admin@cmep.local", UserRoleEnum.ADMIN, "test-admin-session"),
+            ("operador@cmep.local", UserRoleEnum.OPERADOR, "test-operador-session"),
+        ]):
+            persona = Persona(
+                tipo_documento="DNI", numero_documento=f"8000000{i}",
+                nombres=rol.value.title(), apellidos="Test",
+            )
+            db.add(persona)
+            await db.flush()
+            user = User(
+                persona_id=persona.persona_id, user_email=email,
+                password_hash=hash_password("x12345678"), estado=EstadoUser.ACTIVO.value,
+            )
+            db.add(user)
+            await db.flush()
+            db.add(UserRole(user_id=user.user_id, user_role=rol.value))
+            db.add(Session(session_id=sid, user_id=user.user_id, expires_at=utcnow() + timedelta(hours=24)))
+
+        gestor = Persona(tipo_documento="DNI", numero_documento="80000009", nombres="Gina", apellidos="Gestora")
+        db.add(gestor)
+        await db.flush()
+        db.add(Empleado(
+            persona_id=gestor.persona_id,
+            rol_empleado=RolEmpleado.GESTOR.value,
+            estado_empleado=EstadoEmpleado.ACTIVO.value,
+        ))
+        db.add(Servicio(descripcion_servicio="Certificado", tarifa_servicio=Decimal("150.00"), moneda_tarifa="PEN"))
+        await db.commit()
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+class _ContadorSQL:
+    def __init__(self):
+        self.n = 0
+
+    def __call__(self, *_):
+        self.n += 1
+
+    def __enter__(self):
+        event.listen(test_engine.sync_engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *_):
+        event.remove(test_engine.sync_engine, "before_cursor_execute", self)
+
+
+@pytest.mark.asyncio
+async def test_etag_y_304():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/servicios", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 200
+        assert resp.json()["data"][0]["tarifa_servicio"] == "150.00"
+        tag = resp.headers["etag"]
+
+        resp = await client.get(
+            "/servicios", headers={"If-None-Match": tag}, cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == tag
+
+        # ETag distinto por parametros (rol)
+        g = await client.get("/empleados", params={"rol": "GESTOR"}, cookies=_cookies("test-operador-session"))
+        m = await client.get("/empleados", params={"rol": "MEDICO"}, cookies=_cookies("test-operador-session"))
+        assert [e["nombre"] for e in g.json()["data"]] == ["Gina Gestora"]
+        assert m.json()["data"] == []
+        assert g.headers["etag"] != m.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_escritura_invalida_snapshot():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/promotores", params={"modo": "autocomplete"}, cookies=_cookies("test-operador-session"),
+        )
+        assert resp.json()["data"] == []
+        tag = resp.headers["etag"]
+
+        resp = await client.post(
+            "/promotores",
+            json={"tipo_promotor": "EMPRESA", "razon_social": "Clinica Norte"},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 200
+        promotor_id = resp.json()["data"]["promotor_id"]
+
+        resp = await client.get(
+            "/promotores", params={"modo": "autocomplete", "q": "clin"},
+            headers={"If-None-Match": tag}, cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 200
+        assert resp.json()["data"] == [
+            {"promotor_id": promotor_id, "tipo_promotor": "EMPRESA", "nombre": "Clinica Norte"},
+        ]
+
+        # Nuevo MEDICO via admin: aparece en el selector
+        resp = await client.post(
+            "/admin/usuarios",
+            json={
+                "user_email": "medico@cmep.local", "password": "password123",
+                "nombres": "Mario", "apellidos": "Medico",
+                "tipo_documento": "DNI", "numero_documento": "80000010",
+                "roles": ["MEDICO"],
+            },
+            cookies=_cookies("test-admin-session"),
+        )
+        assert resp.status_code == 201
+        resp = await client.get("/empleados", params={"rol": "MEDICO"}, cookies=_cookies("test-operador-session"))
+        assert [e["nombre"] for e in resp.json()["data"]] == ["Mario Medico"]
+
+
+@pytest.mark.asyncio
+async def test_tarifa_y_r10_sin_consultas_en_regimen_estable():
+    async with TestSessionLocal() as db:
+        gestor_id = (await db.execute(
+            select(Empleado.persona_id).where(Empleado.rol_empleado == "GESTOR")
+        )).scalar_one()
+        servicio_id = (await db.execute(select(Servicio.servicio_id))).scalar_one()
+
+    from app.services import catalogos
+    from app.services.solicitud_service import validate_empleado_r10
+
+    async with TestSessionLocal() as db:
+        await catalogos.obtener(db, "servicios")
+        await catalogos.obtener(db, "empleados")
+        with _ContadorSQL() as contador:
+            await validate_empleado_r10(db, gestor_id, "GESTOR")
+            assert (await catalogos.servicio(db, servicio_id))["tarifa_servicio"] == "150.00"
+        assert contador.n == 0
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.post(
+            "/solicitudes",
+            json={
+                "cliente": {"tipo_documento": "DNI", "numero_documento": "12345678",
+                            "nombres": "Cliente", "apellidos": "Uno"},
+                "servicio_id": servicio_id,
+            },
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code in (200, 201)
+    async with TestSessionLocal() as db:
+        sol = (await db.execute(select(SolicitudCmep))).scalar_one()
+        assert sol.tarifa_monto == Decimal("150.00")
+        assert sol.tarifa_fuente == "SERVICIO"
+
+
+@pytest.mark.asyncio
+async def test_r10_negativo_confirma_en_bd():
+    """Empleado creado fuera de la app (snapshot atrasado): R10 lo acepta igual."""
+    from fastapi import HTTPException
+    from app.services import catalogos
+    from app.services.solicitud_service import validate_empleado_r10
+
+    async with TestSessionLocal() as db:
+        await catalogos.obtener(db, "empleados")
+        persona = Persona(nombres="Nuevo", apellidos="Medico")
+        db.add(persona)
+        await db.flush()
+        db.add(Empleado(
+            persona_id=persona.persona_id, rol_empleado="MEDICO",
+            estado_empleado=EstadoEmpleado.ACTIVO.value,
+        ))
+        await db.commit()
+
+        await validate_empleado_r10(db, persona.persona_id, "MEDICO")
+        with pytest.raises(HTTPException) as exc:
+            await validate_empleado_r10(db, persona.persona_id, "GESTOR")
+        assert exc.value.status_code == 422
+
+
+# ── GET /bootstrap ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_bootstrap_combina_usuario_policy_y_catalogos():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/bootstrap", cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert data["user"]["user_email"] == "operador@cmep.local"
+        assert data["user"]["display_name"] == "Operador Test"
+        assert list(data["policy"]) == ["OPERADOR"]
+        assert data["catalogos"]["servicios"][0]["descripcion_servicio"] == "Certificado"
+        assert [e["nombre"] for e in data["catalogos"]["empleados"]["GESTOR"]] == ["Gina Gestora"]
+        assert data["catalogos"]["empleados"]["MEDICO"] == []
+        assert data["catalogos"]["promotores"] == {"items": [], "next_cursor": None}
+        tag = resp.headers["etag"]
+
+        resp = await client.get("/bootstrap", headers={"If-None-Match": tag}, cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 304
+
+        # ETag distinto por usuario
+        resp = await client.get("/bootstrap", cookies=_cookies("test-admin-session"))
+        assert resp.headers["etag"] != tag
+        assert list(resp.json()["data"]["policy"]) == ["ADMIN"]
+
+        # Cambia un catalogo -> cambia el ETag
+        resp = await client.post(
+            "/promotores",
+            json={"tipo_promotor": "OTROS", "nombre_promotor_otros": "Referido"},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 200
+        resp = await client.get("/bootstrap", headers={"If-None-Match": tag}, cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 200
+        assert [p["nombre"] for p in resp.json()["data"]["catalogos"]["promotores"]["items"]] == ["Referido"]
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_sin_sesion():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/bootstrap")
+        assert resp.status_code == 401
@@ -0,0 +1,179 @@
+"""
+Tests de integracion: DELETE /solicitudes/{id} (M8).
+Cascada set-based + borrado fisico via jobs + limpieza de huerfanos.
+
+Usa engine compartido de conftest.py.
+"""
+
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, func
+
+from app.database import Base
+from app.main import app
+from app.models.persona import Persona
+from app.models.cliente import Cliente
+from app.models.user import User, UserRole, EstadoUser, UserRoleEnum, Session
+from app.models.solicitud import (
+    SolicitudCmep,
+    SolicitudArchivo,
+    Archivo,
+    PagoSolicitud,
+    SolicitudEstadoHistorial,
+)
+from app.models.job import Job, EstadoJob
+from app.services.jobs import JobWorker
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+from datetime import timedelta
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    """Crea tablas y un ADMIN con sesion."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with TestSessionLocal() as db:
+        persona_admin = Persona(
+            tipo_documento="DNI", numero_documento="00000001",
+            nombres="Admin", apellidos="Sistema", email="admin@cmep.local",
+        )
+        db.add(persona_admin)
+        await db.flush()
+
+        user_admin = User(
+            persona_id=persona_admin.persona_id,
+            user_email="admin@cmep.local",
+            password_hash=hash_password("admin123"),
+            estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(user_admin)
+        await db.flush()
+
+        db.add(UserRole(user_id=user_admin.user_id, user_role=UserRoleEnum.ADMIN.value))
+        db.add(Session(
+            session_id="test-admin-session",
+            user_id=user_admin.user_id,
+            expires_at=utcnow() + timedelta(hours=24),
+        ))
+        await db.commit()
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def _cookies() -> dict:
+    return {"cmep_session": "test-admin-session"}
+
+
+async def _create_solicitud(client: AsyncClient, doc: str = "44556677", apoderado: bool = True) -> int:
+    body = {
+        "cliente": {
+            "tipo_documento": "DNI", "numero_documento": doc,
+            "nombres": "Cliente", "apellidos": "Borrable",
+        },
+    }
+    if apoderado:
+        body["apoderado"] = {
+            "tipo_documento": "DNI", "numero_documento": "77665544",
+            "nombres": "Apoderado", "apellidos": "Borrable",
+        }
+    resp = await client.post("/solicitudes", json=body, cookies=_cookies())
+    assert resp.status_code == 200
+    return resp.json()["data"]["solicitud_id"]
+
+
+async def _upload(client: AsyncClient, sol_id: int, name: str) -> int:
+    resp = await client.post(
+        f"/solicitudes/{sol_id}/archivos",
+        files={"file": (name, b"CONTENT-" + name.encode(), "application/pdf")},
+        data={"tipo_archivo": "DOCUMENTO"},
+        cookies=_cookies(),
+    )
+    assert resp.status_code == 200
+    return resp.json()["data"]["archivo_id"]
+
+
+async def _count(model, *where) -> int:
+    async with TestSessionLocal() as db:
+        stmt = select(func.count()).select_from(model)
+        if where:
+            stmt = stmt.where(*where)
+        return (await db.execute(stmt)).scalar()
+
+
+@pytest.mark.asyncio
+async def test_eliminar_solicitud_cascada_completa():
+    """Borra dependientes, archivos fisicos y personas huerfanas."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client)
+        resp = await client.post(
+            f"/solicitudes/{sol_id}/registrar-pago",
+            json={"canal_pago": "EFECTIVO", "fecha_pago": "2026-01-30", "monto": 100.00, "moneda": "PEN"},
+            cookies=_cookies(),
+        )
+        assert resp.status_code == 200
+        for i in range(5):
+            await _upload(client, sol_id, f"doc{i}.pdf")
+        # Jobs de miniaturas de los uploads
+        await JobWorker(TestSessionLocal).run_until_empty()
+
+        async with TestSessionLocal() as db:
+            paths = (await db.execute(select(Archivo.storage_path))).scalars().all()
+        assert len(paths) == 5
+        assert all(Path(p).exists() for p in paths)
+
+        resp = await client.delete(f"/solicitudes/{sol_id}", cookies=_cookies())
+        assert resp.status_code == 200
+        # El borrado fisico queda encolado, no se hace en la request
+        assert all(Path(p).exists() for p in paths)
+        assert await _count(Job, Job.estado == EstadoJob.PENDIENTE.value) == 5
+        assert await JobWorker(TestSessionLocal).run_until_empty() == 5
+
+    assert await _count(SolicitudCmep) == 0
+    assert await _count(SolicitudArchivo) == 0
+    assert await _count(Archivo) == 0
+    assert await _count(PagoSolicitud) == 0
+    assert await _count(SolicitudEstadoHistorial) == 0
+    assert await _count(Cliente) == 0
+    # Solo queda la persona del ADMIN
+    assert await _count(Persona) == 1
+    assert not any(Path(p).exists() for p in paths)
+
+
+@pytest.mark.asyncio
+async def test_eliminar_conserva_cliente_con_otras_solicitudes():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_1 = await _create_solicitud(client, apoderado=False)
+        sol_2 = await _create_solicitud(client, apoderado=False)
+
+        resp = await client.delete(f"/solicitudes/{sol_1}", cookies=_cookies())
+        assert resp.status_code == 200
+
+        resp = await client.get(f"/solicitudes/{sol_2}", cookies=_cookies())
+        assert resp.status_code == 200
+
+    assert await _count(Cliente) == 1
+    assert await _count(Persona, Persona.numero_documento == "44556677") == 1
+
+
+@pytest.mark.asyncio
+async def test_eliminar_conserva_persona_que_es_user():
+    """Un cliente que tambien es user pierde el registro cliente, no la persona."""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        sol_id = await _create_solicitud(client, doc="00000001", apoderado=False)
+        resp = await client.delete(f"/solicitudes/{sol_id}", cookies=_cookies())
+        assert resp.status_code == 200
+
+    assert await _count(Cliente) == 0
+    assert await _count(Persona, Persona.numero_documento == "00000001") == 1
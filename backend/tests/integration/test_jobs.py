@@ -0,0 +1,154 @@
+"""
+Tests de integracion: cola de jobs en segundo plano (outbox en BD).
+
+Usa engine compartido de conftest.py.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.database import Base
+from app.models.job import Job, EstadoJob
+from app.services.jobs import JobWorker, enqueue_job, job_handler, claim_jobs
+from app.utils.time import utcnow
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+ejecutados: list[dict] = []
+
+
+@job_handler("test.ok")
+async def _handler_ok(payload: dict) -> None:
+    ejecutados.append(payload)
+
+
+@job_handler("test.falla")
+async def _handler_falla(payload: dict) -> None:
+    raise RuntimeError("storage caido")
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ejecutados.clear()
+    yield
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+async def _get_job(job_id: int) -> Job:
+    async with TestSessionLocal() as db:
+        return (await db.execute(select(Job).where(Job.job_id == job_id))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_job_se_ejecuta_y_completa():
+    async with TestSessionLocal() as db:
+        job = enqueue_job(db, "test.ok", {"x": 1})
+        await db.commit()
+
+    assert await JobWorker(TestSessionLocal).run_until_empty() == 1
+    assert ejecutados == [{"x": 1}]
+
+    job = await _get_job(job.job_id)
+    assert job.estado == EstadoJob.COMPLETADO.value
+    assert job.intentos == 1
+    assert job.finalizado_en is not None
+
+
+@pytest.mark.asyncio
+async def test_job_no_existe_si_la_transaccion_hace_rollback():
+    async with TestSessionLocal() as db:
+        enqueue_job(db, "test.ok", {"x": 1})
+        await db.flush()
+        await db.rollback()
+
+    assert await JobWorker(TestSessionLocal).run_until_empty() == 0
+    assert ejecutados == []
+
+
+@pytest.mark.asyncio
+async def test_job_fallido_reintenta_con_backoff_y_luego_falla():
+    async with TestSessionLocal() as db:
+        job = enqueue_job(db, "test.falla", {}, max_intentos=2)
+        await db.commit()
+
+    worker = JobWorker(TestSessionLocal)
+    assert await worker.run_until_empty() == 1
+
+    job = await _get_job(job.job_id)
+    assert job.estado == EstadoJob.PENDIENTE.value
+    assert "storage caido" in job.ultimo_error
+    assert job.ejecutar_desde > utcnow() + timedelta(seconds=settings.JOBS_BACKOFF_SECONDS - 2)
+
+    # Aun en backoff: no se reclama
+    assert await worker.run_until_empty() == 0
+
+    async with TestSessionLocal() as db:
+        await db.execute(update(Job).values(ejecutar_desde=utcnow() - timedelta(seconds=1)))
+        await db.commit()
+    assert await worker.run_until_empty() == 1
+
+    job = await _get_job(job.job_id)
+    assert job.estado == EstadoJob.FALLIDO.value
+    assert job.intentos == 2
+
+
+@pytest.mark.asyncio
+async def test_handler_desconocido_falla_sin_reintentos():
+    async with TestSessionLocal() as db:
+        job = enqueue_job(db, "test.no_registrado", {})
+        await db.commit()
+
+    await JobWorker(TestSessionLocal).run_until_empty()
+    job = await _get_job(job.job_id)
+    assert job.estado == EstadoJob.FALLIDO.value
+    assert job.intentos == 1
+
+
+@pytest.mark.asyncio
+async def test_lease_expirado_se_reclama_de_nuevo():
+    async with TestSessionLocal() as db:
+        job = enqueue_job(db, "test.ok", {"x": 2})
+        await db.commit()
+
+    # Un worker reclama y "muere" sin registrar resultado
+    async with TestSessionLocal() as db:
+        claimed = await claim_jobs(db, "worker-caido", 10)
+        await db.commit()
+    assert [j.job_id for j in claimed] == [job.job_id]
+
+    worker = JobWorker(TestSessionLocal)
+    assert await worker.run_until_empty() == 0
+
+    async with TestSessionLocal() as db:
+        await db.execute(update(Job).values(
+            bloqueado_en=utcnow() - timedelta(seconds=settings.JOBS_LEASE_SECONDS + 1)
+        ))
+        await db.commit()
+    assert await worker.run_until_empty() == 1
+    assert ejecutados == [{"x": 2}]
+    assert (await _get_job(job.job_id)).estado == EstadoJob.COMPLETADO.value
+
+
+@pytest.mark.asyncio
+async def test_worker_in_process_se_despierta_tras_commit():
+    worker = JobWorker(TestSessionLocal, concurrency=1, poll_seconds=60)
+    worker.start()
+    try:
+        async with TestSessionLocal() as db:
+            enqueue_job(db, "test.ok", {"x": 3})
+            await db.commit()
+        for _ in range(100):
+            if ejecutados:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await worker.stop()
+    assert ejecutados == [{"x": 3}]
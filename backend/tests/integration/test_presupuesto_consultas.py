@@ -0,0 +1,179 @@
+"""
+Tests de integracion: presupuesto de consultas SQL por endpoint (y log de
+consultas lentas con su ruta).
+
+Cada listado se mide con pocos y con muchos registros: el numero de
+sentencias no debe crecer con las filas (N+1, p.ej. un _load_persona por
+fila). Los presupuestos incluyen la resolucion de la sesion.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.database import Base
+from app.main import app
+from app.models.empleado import Empleado, RolEmpleado, EstadoEmpleado
+from app.models.persona import Persona
+from app.models.servicio import Servicio
+from app.models.user import User, UserRole, EstadoUser, UserRoleEnum, Session
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+ADMIN = {"cmep_session": "test-admin-session"}
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    """ADMIN (tambien GESTOR empleado) + servicio."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with TestSessionLocal() as db:
+        persona = Persona(
+            tipo_documento="DNI", numero_documento="00000001",
+            nombres="Admin", apellidos="Sistema",
+        )
+        db.add(persona)
+        await db.flush()
+        user = User(
+            persona_id=persona.persona_id,
+            user_email="admin@cmep.local",
+            password_hash=hash_password("admin123"),
+            estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(user)
+        await db.flush()
+        db.add(UserRole(user_id=user.user_id, user_role=UserRoleEnum.ADMIN.value))
+        db.add(Session(
+            session_id="test-admin-session",
+            user_id=user.user_id,
+            expires_at=utcnow() + timedelta(hours=24),
+        ))
+        db.add(Empleado(
+            persona_id=persona.persona_id,
+            rol_empleado=RolEmpleado.GESTOR.value,
+            estado_empleado=EstadoEmpleado.ACTIVO.value,
+        ))
+        db.add(Servicio(
+            descripcion_servicio="CMEP Presencial",
+            tarifa_servicio=Decimal("150.00"),
+            moneda_tarifa="PEN",
+        ))
+        await db.commit()
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+async def _poblar(client: AsyncClient, desde: int, hasta: int) -> None:
+    """Solicitudes con promotor PERSONA (nuevo) y gestor asignado; usuarios."""
+    for i in range(desde, hasta):
+        resp = await client.post("/solicitudes", cookies=ADMIN, json={
+            "cliente": {
+                "tipo_documento": "DNI", "numero_documento": f"4{i:07d}",
+                "nombres": f"Cliente{i}", "apellidos": "Prueba",
+            },
+            "promotor": {
+                "tipo_promotor": "PERSONA", "tipo_documento": "DNI",
+                "numero_documento": f"5{i:07d}", "nombres": f"Promo{i}", "apellidos": "Tor",
+            },
+            "servicio_id": 1,
+        })
+        assert resp.status_code in (200, 201), resp.text
+        sid = resp.json()["data"]["solicitud_id"]
+        resp = await client.post(
+            f"/solicitudes/{sid}/asignar-gestor", cookies=ADMIN, json={"persona_id_gestor": 1},
+        )
+        assert resp.status_code == 200, resp.text
+        resp = await client.post("/admin/usuarios", cookies=ADMIN, json={
+            "user_email": f"user{i}@cmep.local", "password": "secreto123",
+            "nombres": f"User{i}", "apellidos": "Prueba",
+            "tipo_documento": "DNI", "numero_documento": f"6{i:07d}",
+            "roles": ["OPERADOR"],
+        })
+        assert resp.status_code == 201, resp.text
+
+
+# Presupuestos: resolver la sesion (con roles y permisos) ya cuesta 5
+PRESUPUESTOS = {
+    "/auth/me": 6,
+    "/bootstrap": 8,
+    "/solicitudes": 18,
+    "/solicitudes/1": 18,
+    "/promotores": 6,
+    "/promotores?modo=autocomplete": 5,
+    "/empleados?rol=GESTOR": 5,
+    "/servicios": 5,
+    "/admin/usuarios": 6,
+}
+
+
+@pytest.mark.asyncio
+async def test_presupuesto_constante_con_el_volumen(max_consultas):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        medidas: dict[str, list[int]] = {path: [] for path in PRESUPUESTOS}
+        for desde, hasta in ((0, 2), (2, 15)):
+            await _poblar(client, desde, hasta)
+            for path, maximo in PRESUPUESTOS.items():
+                with max_consultas(maximo) as stats:
+                    resp = await client.get(path, cookies=ADMIN)
+                assert resp.status_code == 200, (path, resp.text)
+                medidas[path].append(stats.consultas)
+
+    for path, (pocos, muchos) in medidas.items():
+        assert pocos == muchos, f"{path}: {pocos} consultas con 2 filas, {muchos} con 15"
+
+
+@pytest.mark.asyncio
+async def test_presupuesto_excedido_falla(max_consultas):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(AssertionError, match="Presupuesto de consultas excedido"):
+            with max_consultas(1):
+                await client.get("/auth/me", cookies=ADMIN)
+
+
+@pytest.mark.asyncio
+async def test_server_timing_y_log_n_mas_1(monkeypatch, caplog):
+    from app.config import settings
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/auth/me", cookies=ADMIN)
+        assert resp.status_code == 200
+        timing = resp.headers["server-timing"]
+        assert timing.startswith("db;dur=")
+        assert 'desc="6 queries"' in timing
+        assert "app;dur=" in timing
+
+        # Umbral 1: cualquier sentencia cuenta como repetida
+        monkeypatch.setattr(settings, "SQL_NPLUS1_THRESHOLD", 1)
+        with caplog.at_level("WARNING", logger="app.sql"):
+            await client.get("/auth/me", cookies=ADMIN)
+    assert any("N+1 probable en GET /auth/me" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_consulta_lenta_con_ruta(monkeypatch, caplog):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with caplog.at_level("WARNING", logger="app.sql.lenta"):
+            resp = await client.get("/promotores?q=Ana", cookies=ADMIN)
+    assert resp.status_code == 200
+    lentas = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Consulta lenta")]
+    promotores = next(m for m in lentas if "FROM promotor" in m)
+    assert "ruta=GET /promotores" in promotores
+    assert "llamador=app.api.promotores." in promotores
+    assert "'Ana" not in promotores  # prefijo de busqueda sobre nombres: redactado
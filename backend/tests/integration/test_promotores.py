@@ -0,0 +1,147 @@
+"""
+Tests de integracion: listado de promotores (paginacion por cursor, busqueda
+por prefijo y modo autocomplete).
+"""
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.database import Base
+from app.main import app
+from app.models.persona import Persona
+from app.models.promotor import Promotor
+from app.models.user import User, UserRole, EstadoUser, UserRoleEnum, Session
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+from datetime import timedelta
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+def _cookies(session_id: str) -> dict:
+    return {"cmep_session": session_id}
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    """Usuario OPERADOR + promotores de los tres tipos."""
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with TestSessionLocal() as db:
+        p_op = Persona(
+            tipo_documento="DNI", numero_documento="70000001",
+            nombres="Olga", apellidos="Operadora",
+        )
+        db.add(p_op)
+        await db.flush()
+        u_op = User(
+            persona_id=p_op.persona_id,
+            user_email="operador@cmep.local",
+            password_hash=hash_password("operador123"),
+            estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(u_op)
+        await db.flush()
+        db.add(UserRole(user_id=u_op.user_id, user_role=UserRoleEnum.OPERADOR.value))
+        db.add(Session(
+            session_id="test-operador-session",
+            user_id=u_op.user_id,
+            expires_at=utcnow() + timedelta(hours=24),
+        ))
+
+        for i in range(5):
+            persona = Persona(
+                tipo_documento="DNI", numero_documento=f"7100000{i}",
+                nombres=f"Pedro{i}", apellidos="Promotor",
+            )
+            db.add(persona)
+            await db.flush()
+            db.add(Promotor(tipo_promotor="PERSONA", persona_id=persona.persona_id))
+        db.add(Promotor(tipo_promotor="EMPRESA", razon_social="Clinica Andina SAC", ruc="20100000001"))
+        db.add(Promotor(tipo_promotor="EMPRESA", razon_social="100%_Salud EIRL"))
+        db.add(Promotor(tipo_promotor="OTROS", nombre_promotor_otros="Clinica Referida", fuente_promotor="Web"))
+        await db.commit()
+
+    yield
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.mark.asyncio
+async def test_paginacion_por_cursor():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        vistos, cursor = [], None
+        while True:
+            params = {"limit": 3}
+            if cursor is not None:
+                params["cursor"] = cursor
+            resp = await client.get("/promotores", params=params, cookies=_cookies("test-operador-session"))
+            assert resp.status_code == 200
+            body = resp.json()
+            assert len(body["data"]) <= 3
+            vistos += [p["promotor_id"] for p in body["data"]]
+            cursor = body["meta"]["next_cursor"]
+            if cursor is None:
+                break
+
+    assert len(vistos) == 8
+    assert vistos == sorted(vistos)
+
+
+@pytest.mark.asyncio
+async def test_listado_completo_incluye_persona():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/promotores", cookies=_cookies("test-operador-session"))
+    data = resp.json()["data"]
+    persona = next(p for p in data if p["tipo_promotor"] == "PERSONA")
+    assert persona["nombre"] == "Pedro0 Promotor"
+    assert persona["persona_numero_documento"] == "71000000"
+    empresa = next(p for p in data if p["tipo_promotor"] == "EMPRESA")
+    assert empresa["nombre"] == "Clinica Andina SAC"
+    assert empresa["persona_nombres"] is None
+
+
+@pytest.mark.asyncio
+async def test_busqueda_por_prefijo():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async def _nombres(q: str) -> list[str]:
+            resp = await client.get("/promotores", params={"q": q}, cookies=_cookies("test-operador-session"))
+            assert resp.status_code == 200
+            return [p["nombre"] for p in resp.json()["data"]]
+
+        # razon_social y nombre_promotor_otros
+        assert await _nombres("clinica") == ["Clinica Andina SAC", "Clinica Referida"]
+        # nombres y apellidos de la persona
+        assert await _nombres("Pedro3") == ["Pedro3 Promotor"]
+        assert len(await _nombres("Promo")) == 5
+        # Prefijo, no subcadena
+        assert await _nombres("Andina") == []
+        # Comodines literales
+        assert await _nombres("100%_") == ["100%_Salud EIRL"]
+        assert await _nombres("1_0") == []
+
+
+@pytest.mark.asyncio
+async def test_modo_autocomplete():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get(
+            "/promotores", params={"modo": "autocomplete", "q": "Ped", "limit": 2},
+            cookies=_cookies("test-operador-session"),
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["data"] == [
+            {"promotor_id": body["data"][0]["promotor_id"], "tipo_promotor": "PERSONA", "nombre": "Pedro0 Promotor"},
+            {"promotor_id": body["data"][1]["promotor_id"], "tipo_promotor": "PERSONA", "nombre": "Pedro1 Promotor"},
+        ]
+        assert body["meta"]["next_cursor"] == body["data"][1]["promotor_id"]
+
+        resp = await client.get("/promotores", params={"modo": "otro"}, cookies=_cookies("test-operador-session"))
+        assert resp.status_code == 422
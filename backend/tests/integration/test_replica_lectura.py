@@ -0,0 +1,165 @@
+"""
+Tests de integracion: replica de lectura (DB_READ_URL) y pin read-your-writes.
+
+Dos SQLite en archivo: el primario (override de get_db) y la replica
+(DB_READ_URL). La replica no recibe las escrituras posteriores a la siembra,
+como una replica con retraso.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base, PIN_COOKIE_NAME, cerrar_engine_lectura, get_db
+from app.main import app
+from app.models.persona import Persona
+from app.models.servicio import Servicio
+from app.models.user import EstadoUser, Session, User, UserRole, UserRoleEnum
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+
+SESION = {"cmep_session": "test-admin-session"}
+
+
+async def _sembrar(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        persona = Persona(
+            tipo_documento="DNI", numero_documento="00000001",
+            nombres="Admin", apellidos="Sistema", email="admin@cmep.local",
+        )
+        db.add(persona)
+        await db.flush()
+        user = User(
+            persona_id=persona.persona_id, user_email="admin@cmep.local",
+            password_hash=hash_password("admin123"), estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(user)
+        await db.flush()
+        db.add(UserRole(user_id=user.user_id, user_role=UserRoleEnum.ADMIN.value))
+        db.add(Session(
+            session_id="test-admin-session", user_id=user.user_id,
+            expires_at=utcnow() + timedelta(hours=24),
+        ))
+        db.add(Servicio(
+            descripcion_servicio="CMEP Presencial",
+            tarifa_servicio=Decimal("150.00"), moneda_tarifa="PEN",
+        ))
+        await db.commit()
+
+
+@pytest.fixture(autouse=True)
+async def setup_db(tmp_path, monkeypatch):
+    """Primario y replica en archivos separados, con la misma siembra."""
+    primario = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primario.db'}")
+    replica_url = f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    replica = create_async_engine(replica_url)
+    await _sembrar(primario)
+    await _sembrar(replica)
+    await replica.dispose()
+
+    factory = async_sessionmaker(primario, class_=AsyncSession, expire_on_commit=False)
+
+    async def _get_db_primario():
+        async with factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    monkeypatch.setitem(app.dependency_overrides, get_db, _get_db_primario)
+    monkeypatch.setattr(settings, "DB_READ_URL", replica_url)
+    await cerrar_engine_lectura()
+    yield
+    await cerrar_engine_lectura()
+    await primario.dispose()
+
+
+def _cliente() -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test", cookies=SESION)
+
+
+async def _crear_solicitud(client: AsyncClient):
+    return await client.post("/solicitudes", json={
+        "cliente": {
+            "tipo_documento": "DNI", "numero_documento": "44444444",
+            "nombres": "Reuso", "apellidos": "Test",
+        },
+    })
+
+
+async def _total(client: AsyncClient, **kwargs) -> int:
+    resp = await client.get("/solicitudes", **kwargs)
+    assert resp.status_code == 200
+    return resp.json()["meta"]["total"]
+
+
+@pytest.mark.asyncio
+async def test_lecturas_van_a_la_replica_salvo_pin():
+    async with _cliente() as client:
+        resp = await _crear_solicitud(client)
+        assert resp.status_code == 200
+        solicitud_id = resp.json()["data"]["solicitud_id"]
+        # La escritura fijo el pin: el mismo cliente ve su solicitud
+        assert PIN_COOKIE_NAME in client.cookies
+        assert await _total(client) == 1
+        assert (await client.get(f"/solicitudes/{solicitud_id}")).status_code == 200
+
+    async with _cliente() as otro:
+        # Sin pin: replica (sin la escritura todavia)
+        assert await _total(otro) == 0
+        assert (await otro.get(f"/solicitudes/{solicitud_id}")).status_code == 404
+        # Header explicito: primario
+        assert await _total(otro, headers={"X-CMEP-Primario": "1"}) == 1
+
+
+@pytest.mark.asyncio
+async def test_cookie_pin_solo_tras_escritura_exitosa():
+    async with _cliente() as client:
+        resp = await client.get("/solicitudes")
+        assert PIN_COOKIE_NAME not in resp.headers.get("set-cookie", "")
+
+        resp = await client.post("/solicitudes", json={"cliente": {}})
+        assert resp.status_code == 422
+        assert PIN_COOKIE_NAME not in resp.headers.get("set-cookie", "")
+
+        resp = await _crear_solicitud(client)
+        cookie = resp.headers["set-cookie"]
+        assert cookie.startswith(f"{PIN_COOKIE_NAME}=1")
+        assert f"Max-Age={settings.DB_READ_PIN_SECONDS}" in cookie
+        assert "HttpOnly" in cookie
+
+
+@pytest.mark.asyncio
+async def test_sin_replica_todo_al_primario(monkeypatch):
+    monkeypatch.setattr(settings, "DB_READ_URL", "")
+    await cerrar_engine_lectura()
+    async with _cliente() as client:
+        resp = await _crear_solicitud(client)
+        assert PIN_COOKIE_NAME not in resp.headers.get("set-cookie", "")
+    async with _cliente() as otro:
+        assert await _total(otro) == 1
+
+
+@pytest.mark.asyncio
+async def test_catalogo_desde_replica_atrasada_no_se_publica():
+    """Tras invalidar, un snapshot leido de la replica no queda cacheado con datos viejos."""
+    params = {"modo": "autocomplete"}
+    async with _cliente() as client:
+        resp = await client.post("/promotores", json={"tipo_promotor": "EMPRESA", "razon_social": "Acme SAC"})
+        assert resp.status_code == 200
+
+    async with _cliente() as otro:
+        # Replica sin el promotor: se sirve, pero no se publica como vigente
+        assert (await otro.get("/promotores", params=params)).json()["data"] == []
+        # Primario (pin): ve el promotor aunque la replica siga atrasada
+        resp = await otro.get("/promotores", params=params, headers={"X-CMEP-Primario": "1"})
+        assert [p["nombre"] for p in resp.json()["data"]] == ["Acme SAC"]
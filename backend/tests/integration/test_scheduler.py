@@ -0,0 +1,204 @@
+"""
+Tests de integracion: scheduler periodico in-app (lider unico + tareas).
+
+Usa engine compartido de conftest.py.
+"""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update, func
+
+from app.database import Base
+from app.models.persona import Persona
+from app.models.user import User, EstadoUser, Session
+from app.models.scheduler import SchedulerLease, TareaProgramada
+from app.services.scheduler import (
+    PeriodicScheduler,
+    ScheduledTask,
+    borrar_en_lotes,
+    tarea_expirar_sesiones,
+)
+from app.services.auth_service import delete_expired_sessions
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+@pytest.fixture(autouse=True)
+async def setup_db():
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+async def _crear_sesiones(expiradas: int, vigentes: int) -> None:
+    async with TestSessionLocal() as db:
+        persona = Persona(
+            tipo_documento="DNI", numero_documento="00000001",
+            nombres="Admin", apellidos="Sistema",
+        )
+        db.add(persona)
+        await db.flush()
+        user = User(
+            persona_id=persona.persona_id,
+            user_email="admin@cmep.local",
+            password_hash=hash_password("admin123"),
+            estado=EstadoUser.ACTIVO.value,
+        )
+        db.add(user)
+        await db.flush()
+        now = utcnow()
+        for i in range(expiradas):
+            db.add(Session(session_id=f"exp-{i}", user_id=user.user_id,
+                           expires_at=now - timedelta(hours=1, minutes=i)))
+        for i in range(vigentes):
+            db.add(Session(session_id=f"ok-{i}", user_id=user.user_id,
+                           expires_at=now + timedelta(hours=24)))
+        await db.commit()
+
+
+async def _sesiones() -> list[str]:
+    async with TestSessionLocal() as db:
+        return sorted((await db.execute(select(Session.session_id))).scalars().all())
+
+
+def _tarea_contadora(nombre: str, llamadas: list, intervalo: float = 3600) -> ScheduledTask:
+    async def fn(session_factory):
+        llamadas.append(nombre)
+        return "ok"
+    return ScheduledTask(nombre, intervalo, fn)
+
+
+async def _vencer(nombre: str) -> None:
+    async with TestSessionLocal() as db:
+        await db.execute(
+            update(TareaProgramada)
+            .where(TareaProgramada.nombre == nombre)
+            .values(proxima_ejecucion=utcnow() - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+# ── Liderazgo ──────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_solo_un_scheduler_es_lider():
+    a = PeriodicScheduler([], TestSessionLocal)
+    b = PeriodicScheduler([], TestSessionLocal)
+
+    assert await a.try_acquire_leadership() is True
+    assert await b.try_acquire_leadership() is False
+    # El lider renueva su lease
+    assert await a.try_acquire_leadership() is True
+
+    async with TestSessionLocal() as db:
+        assert (await db.execute(select(func.count()).select_from(SchedulerLease))).scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_lease_expirado_pasa_a_otra_instancia():
+    a = PeriodicScheduler([], TestSessionLocal)
+    b = PeriodicScheduler([], TestSessionLocal)
+    assert await a.try_acquire_leadership() is True
+
+    async with TestSessionLocal() as db:
+        await db.execute(update(SchedulerLease).values(expires_at=utcnow() - timedelta(seconds=1)))
+        await db.commit()
+
+    assert await b.try_acquire_leadership() is True
+    assert await a.try_acquire_leadership() is False
+
+
+@pytest.mark.asyncio
+async def test_stop_libera_el_lease():
+    a = PeriodicScheduler([], TestSessionLocal)
+    b = PeriodicScheduler([], TestSessionLocal)
+    assert await a.try_acquire_leadership() is True
+    await a.stop()
+    assert await b.try_acquire_leadership() is True
+
+
+# ── Tareas ─────────────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_tarea_se_ejecuta_solo_cuando_vence():
+    llamadas: list[str] = []
+    sched = PeriodicScheduler([_tarea_contadora("t1", llamadas)], TestSessionLocal)
+
+    # Primer tick: registra la tarea con su fase inicial, no la ejecuta aun
+    assert await sched.tick() == []
+    async with TestSessionLocal() as db:
+        row = await db.get(TareaProgramada, "t1")
+    assert row.proxima_ejecucion >= utcnow() - timedelta(seconds=5)
+
+    await _vencer("t1")
+    assert await sched.tick() == ["t1"]
+    assert llamadas == ["t1"]
+
+    # Ya ejecutada: no vuelve a correr hasta el siguiente intervalo
+    assert await sched.tick() == []
+
+    async with TestSessionLocal() as db:
+        row = await db.get(TareaProgramada, "t1")
+    assert row.ultima_ejecucion is not None
+    assert row.ultimo_resultado == "ok"
+    assert row.ultimo_error is None
+    assert row.proxima_ejecucion > utcnow()
+
+
+@pytest.mark.asyncio
+async def test_no_lider_no_ejecuta_tareas():
+    llamadas: list[str] = []
+    lider = PeriodicScheduler([_tarea_contadora("t1", llamadas)], TestSessionLocal)
+    otro = PeriodicScheduler([_tarea_contadora("t1", llamadas)], TestSessionLocal)
+
+    await lider.tick()
+    await _vencer("t1")
+    assert await otro.tick() == []
+    assert llamadas == []
+    assert await lider.tick() == ["t1"]
+
+
+@pytest.mark.asyncio
+async def test_error_de_tarea_queda_registrado():
+    async def falla(session_factory):
+        raise RuntimeError("boom")
+
+    sched = PeriodicScheduler([ScheduledTask("t_falla", 60, falla)], TestSessionLocal)
+    await sched.tick()
+    await _vencer("t_falla")
+    assert await sched.tick() == ["t_falla"]
+
+    async with TestSessionLocal() as db:
+        row = await db.get(TareaProgramada, "t_falla")
+    assert "boom" in row.ultimo_error
+    assert row.proxima_ejecucion > utcnow()
+
+
+# ── Expiracion de sesiones ─────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_expiracion_en_lotes_borra_solo_expiradas():
+    await _crear_sesiones(expiradas=7, vigentes=3)
+
+    lotes: list[int] = []
+
+    async def lote(db, limit):
+        n = await delete_expired_sessions(db, limit)
+        lotes.append(n)
+        return n
+
+    assert await borrar_en_lotes(TestSessionLocal, lote, 3) == 7
+    assert lotes == [3, 3, 1]
+    assert await _sesiones() == ["ok-0", "ok-1", "ok-2"]
+
+
+@pytest.mark.asyncio
+async def test_tarea_expirar_sesiones():
+    await _crear_sesiones(expiradas=2, vigentes=1)
+    assert await tarea_expirar_sesiones(TestSessionLocal) == "sesiones_borradas=2"
+    assert await _sesiones() == ["ok-0"]
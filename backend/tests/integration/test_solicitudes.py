@@ -294,6 +294,10 @@ async def test_list_solicitudes_after_create():
         assert len(data["data"]["items"]) == 1
         item = data["data"]["items"][0]
         assert item["estado_operativo"] == "REGISTRADO"
+        # Acciones del usuario (tabla de POLICY en lote), igual que en el detalle
+        detalle = await client.get(f"/solicitudes/{item['solicitud_id']}", cookies=_cookies("test-operador-session"))
+        assert item["acciones_permitidas"] == detalle.json()["data"]["acciones_permitidas"]
+        assert "ASIGNAR_GESTOR" in item["acciones_permitidas"]
 
 
 @pytest.mark.asyncio
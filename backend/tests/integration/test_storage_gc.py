@@ -0,0 +1,97 @@
+"""
+Tests de integracion: GC / reconciliacion archivos <-> storage local.
+
+Usa engine compartido de conftest.py y un UPLOAD_DIR temporal por test.
+"""
+
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.database import Base
+from app.models.solicitud import Archivo
+from app.services.storage_gc import reconciliar_storage
+
+from tests.integration.conftest import test_engine, TestSessionLocal
+
+
+@pytest.fixture(autouse=True)
+async def setup_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def _objeto(tmp_path, key: str, antiguedad_s: int = 0):
+    path = tmp_path / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    if antiguedad_s:
+        t = time.time() - antiguedad_s
+        os.utime(path, (t, t))
+    return path
+
+
+async def _registrar(*keys: str) -> list[int]:
+    async with TestSessionLocal() as db:
+        archivos = [
+            Archivo(nombre_original=k, nombre_storage=k, tipo="DOCUMENTO", storage_path=k)
+            for k in keys
+        ]
+        db.add_all(archivos)
+        await db.commit()
+        return [a.archivo_id for a in archivos]
+
+
+@pytest.mark.asyncio
+async def test_reporta_huerfanos_y_faltantes_sin_borrar(tmp_path):
+    _objeto(tmp_path, "vivo.pdf", 3600)
+    huerfano = _objeto(tmp_path, "huerfano.pdf", 3600)
+    _objeto(tmp_path, ".gitkeep", 3600)
+    _, faltante_id = await _registrar("vivo.pdf", "perdido.pdf")
+
+    reporte = await reconciliar_storage(TestSessionLocal, borrar=False, grace_seconds=60)
+
+    assert reporte.objetos_escaneados == 2
+    assert reporte.huerfanos == 1
+    assert reporte.muestra_huerfanos == ["huerfano.pdf"]
+    assert reporte.faltantes == 1
+    assert reporte.muestra_faltantes == [faltante_id]
+    assert reporte.huerfanos_borrados == 0
+    assert huerfano.exists()
+
+
+@pytest.mark.asyncio
+async def test_borra_huerfanos_paginando(tmp_path):
+    vivos = [f"v{i}.pdf" for i in range(5)]
+    for k in vivos:
+        _objeto(tmp_path, k, 3600)
+    huerfanos = [_objeto(tmp_path, f"sub/h{i}.pdf", 3600) for i in range(7)]
+    await _registrar(*vivos)
+
+    reporte = await reconciliar_storage(
+        TestSessionLocal, borrar=True, page_size=3, concurrency=2, grace_seconds=60
+    )
+
+    assert reporte.objetos_escaneados == 12
+    assert reporte.huerfanos == 7
+    assert reporte.huerfanos_borrados == 7
+    assert reporte.faltantes == 0
+    assert not any(p.exists() for p in huerfanos)
+    assert all((tmp_path / k).exists() for k in vivos)
+
+
+@pytest.mark.asyncio
+async def test_huerfano_reciente_se_respeta(tmp_path):
+    """Un upload en curso ya escribio el objeto pero su fila aun no existe."""
+    reciente = _objeto(tmp_path, "subiendo.pdf")
+
+    reporte = await reconciliar_storage(TestSessionLocal, borrar=True, grace_seconds=600)
+
+    assert reporte.huerfanos == 0
+    assert reciente.exists()
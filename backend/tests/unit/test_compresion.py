@@ -0,0 +1,42 @@
+"""
+Tests unitarios: codecs de compresion del storage.
+"""
+
+import os
+
+import pytest
+
+from app.utils.compresion import (
+    CHUNK_SIZE,
+    compress,
+    decompress,
+    maybe_compress,
+    zstd_disponible,
+)
+
+TEXTO = b"Certificado medico de evaluacion profesional. " * 20000  # > CHUNK_SIZE
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_roundtrip_por_bloques(codec):
+    if codec == "zstd" and not zstd_disponible():
+        pytest.skip("zstandard no instalado")
+    assert len(TEXTO) > CHUNK_SIZE
+    comprimido = compress(TEXTO, codec)
+    assert len(comprimido) < len(TEXTO) // 10
+    assert decompress(comprimido, codec) == TEXTO
+
+
+def test_mime_no_comprimible_se_guarda_tal_cual():
+    assert maybe_compress(TEXTO, "image/jpeg", "gzip") == (TEXTO, None)
+
+
+def test_sin_ganancia_se_guarda_tal_cual():
+    aleatorio = os.urandom(64 * 1024)
+    assert maybe_compress(aleatorio, "application/pdf", "gzip") == (aleatorio, None)
+
+
+def test_comprime_pdf_de_texto():
+    data, codec = maybe_compress(TEXTO, "application/pdf", "gzip")
+    assert codec == "gzip"
+    assert decompress(data, codec) == TEXTO
@@ -0,0 +1,157 @@
+"""
+Tests unitarios: compresion negociada de respuestas (CompressionMiddleware).
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+import httpx
+from httpx import ASGITransport, AsyncClient
+
+from app.middleware import compression_middleware
+from app.middleware.compression_middleware import CompressionMiddleware, acepta, negociar, sin_compresion
+
+DATOS = {"items": [{"id": i, "nombre": f"Solicitud {i}"} for i in range(200)]}
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/json")
+    async def grande():
+        return DATOS
+
+    @app.get("/chico")
+    async def chico():
+        return {"ok": True}
+
+    @app.get("/ya-gzip")
+    async def ya_gzip():
+        return Response(gzip.compress(b"x" * 5000), media_type="text/plain",
+                        headers={"Content-Encoding": "gzip"})
+
+    @app.get("/adjunto")
+    async def adjunto():
+        return PlainTextResponse("x" * 5000, headers={"Content-Disposition": 'attachment; filename="a.txt"'})
+
+    @app.get("/opt-out")
+    @sin_compresion
+    async def opt_out():
+        return DATOS
+
+    @app.get("/etag")
+    async def con_etag():
+        return PlainTextResponse("x" * 5000, headers={"ETag": '"abc"'})
+
+    @app.get("/pdf")
+    async def pdf():
+        return Response(b"%PDF" + b"0" * 5000, media_type="application/pdf")
+
+    @app.get("/stream")
+    async def stream():
+        async def filas():
+            for i in range(50):
+                yield f"{i},fila {i}\n".encode()
+        return StreamingResponse(filas(), media_type="text/csv")
+
+    return app
+
+
+async def _get(ruta: str, accept: str = "gzip") -> httpx.Response:
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        return await client.get(ruta, headers={"Accept-Encoding": accept})
+
+
+def test_negociar():
+    assert negociar("gzip, deflate") == "gzip"
+    assert negociar("deflate") is None
+    assert negociar("gzip;q=0") is None
+    assert negociar("*") in ("gzip", "br")
+    assert negociar("*, gzip;q=0") == ("br" if compression_middleware.brotli else None)
+    assert negociar("identity") is None
+
+
+def test_acepta():
+    assert acepta("gzip, deflate", "gzip")
+    assert not acepta("gzip;q=0", "gzip")
+    assert not acepta("deflate", "gzip")
+    assert acepta("*", "gzip")
+    assert not acepta("*, gzip;q=0", "gzip")
+
+
+async def test_json_grande_con_gzip():
+    resp = await _get("/json")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["vary"] == "Accept-Encoding"
+    assert int(resp.headers["content-length"]) < len(json.dumps(DATOS)) / 3
+    assert resp.json() == DATOS  # httpx decodifica
+
+
+@pytest.mark.parametrize("ruta", ["/chico", "/ya-gzip", "/adjunto", "/opt-out", "/pdf"])
+async def test_no_comprime(ruta):
+    resp = await _get(ruta)
+    if ruta == "/ya-gzip":
+        # Passthrough: se envia el gzip original, sin recomprimir
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.content == b"x" * 5000
+    else:
+        assert "content-encoding" not in resp.headers
+
+
+async def test_sin_accept_encoding_no_comprime():
+    resp = await _get("/json", accept="identity")
+    assert "content-encoding" not in resp.headers
+    assert resp.json() == DATOS
+
+
+async def test_etag_fuerte_pasa_a_debil():
+    resp = await _get("/etag")
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["etag"] == 'W/"abc"'
+
+
+async def test_streaming_se_comprime_por_chunk():
+    mensajes = []
+
+    async def send(message):
+        mensajes.append(message)
+
+    pedido = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if pedido:
+            return pedido.pop()
+        await asyncio.Event().wait()  # sin desconexion: el stream termina solo
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+        "root_path": "", "scheme": "http", "query_string": b"", "server": ("test", 80),
+        "headers": [(b"accept-encoding", b"gzip")], "http_version": "1.1",
+    }
+    await _app()(scope, receive, send)
+
+    inicio = mensajes[0]
+    headers = dict(inicio["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    cuerpos = [m for m in mensajes[1:] if m["type"] == "http.response.body"]
+    assert len(cuerpos) > 2
+    # Cada chunk llega vaciado: lo enviado hasta ahi ya se puede decodificar
+    d = zlib.decompressobj(31)
+    assert d.decompress(cuerpos[0]["body"] + cuerpos[1]["body"]).startswith(b"0,fila 0\n")
+    completo = b"".join(m["body"] for m in cuerpos)
+    assert gzip.decompress(completo) == b"".join(f"{i},fila {i}\n".encode() for i in range(50))
+
+
+async def test_brotli_si_esta_instalado():
+    pytest.importorskip("brotli")
+    resp = await _get("/json", accept="gzip, br")
+    assert resp.headers["content-encoding"] == "br"
+    assert resp.json() == DATOS
@@ -0,0 +1,100 @@
+"""
+Tests unitarios: log de consultas lentas (redaccion, llamador, EXPLAIN).
+Engine aiosqlite sobre archivo temporal: el plan se captura en otra conexion.
+"""
+
+import logging
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base
+from app.models.persona import Persona
+from app.models.servicio import Servicio
+from app.services import catalogos, consultas_lentas
+
+
+@pytest.fixture
+async def sesion(tmp_path, monkeypatch):
+    # Umbral minimo: toda sentencia es "lenta"
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 1e-6)
+    consultas_lentas.reset()
+    catalogos.reset()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lentas.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+        db.add(Servicio(descripcion_servicio="CMEP", tarifa_servicio=Decimal("150.00"), moneda_tarifa="PEN"))
+        await db.commit()
+        yield db
+    await consultas_lentas.esperar_planes()
+    await engine.dispose()
+    catalogos.reset()
+
+
+def _mensajes(caplog, prefijo: str) -> list[str]:
+    return [r.getMessage() for r in caplog.records if r.getMessage().startswith(prefijo)]
+
+
+def test_redaccion_por_nombre_de_parametro():
+    class _Compilado:
+        positiontup = ["numero_documento_1", "estado_1", "param_1", "persona_id_1"]
+
+    class _Contexto:
+        compiled = _Compilado()
+
+    texto = consultas_lentas.parametros_redactados(
+        _Contexto(), ("12345678", "ACTIVO", "Juan%", 7), False,
+    )
+    assert "12345678" not in texto and "Juan" not in texto
+    assert "numero_documento_1: <redactado>" in texto
+    assert "estado_1: 'ACTIVO'" in texto
+    assert "param_1: <str len=5>" in texto
+    assert "persona_id_1: 7" in texto
+    # Sin nombres alineados (SQL textual): ningun string visible
+    assert "ACTIVO" not in consultas_lentas.parametros_redactados(None, ("ACTIVO",), False)
+    assert consultas_lentas.parametros_redactados(None, [(1,), (2,)], True) == "<executemany: 2 filas>"
+
+
+async def test_log_con_llamador_parametros_redactados_y_plan(sesion, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.sql.lenta"):
+        await sesion.execute(select(Persona).where(Persona.numero_documento == "12345678"))
+        await catalogos.obtener(sesion, "servicios")
+        await consultas_lentas.esperar_planes()
+
+    lentas = _mensajes(caplog, "Consulta lenta")
+    persona = next(m for m in lentas if "FROM persona" in m)
+    assert "12345678" not in persona
+    assert "<redactado>" in persona
+    assert "ruta=-" in persona
+
+    servicios = next(m for m in lentas if "FROM servicio" in m)
+    assert "llamador=app.services.catalogos._cargar_servicios:" in servicios
+
+    planes = _mensajes(caplog, "Plan de consulta lenta")
+    assert len(planes) == 2
+    assert any("SCAN" in p or "SEARCH" in p for p in planes)
+    # El id del plan coincide con el del log de la sentencia
+    qid = persona.split("[q=")[1].split("]")[0]
+    assert any(f"[q={qid}]" in p for p in planes)
+
+
+async def test_explain_con_rate_limit_por_sentencia(sesion, caplog):
+    stmt = select(Persona).where(Persona.persona_id == 1)
+    with caplog.at_level(logging.WARNING, logger="app.sql.lenta"):
+        for _ in range(3):
+            await sesion.execute(stmt)
+            await consultas_lentas.esperar_planes()
+
+    assert len([m for m in _mensajes(caplog, "Consulta lenta") if "FROM persona" in m]) == 3
+    assert len(_mensajes(caplog, "Plan de consulta lenta")) == 1
+
+
+async def test_desactivado_con_umbral_cero(sesion, caplog, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    with caplog.at_level(logging.WARNING, logger="app.sql.lenta"):
+        await sesion.execute(select(Persona))
+    assert not _mensajes(caplog, "Consulta lenta")
@@ -0,0 +1,99 @@
+"""
+Tests unitarios: serializacion orjson de respuestas (app.utils.json_rapido).
+"""
+
+import enum
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import APIRouter, FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.utils.json_rapido import RespuestaJSON, RutaJSON, dumps
+
+
+class Color(str, enum.Enum):
+    ROJO = "ROJO"
+
+
+class Modelo(BaseModel):
+    nombre: str
+
+
+def test_tipos_nativos_igual_que_jsonable_encoder():
+    contenido = {
+        "creado": datetime(2026, 3, 1, 10, 30, 5, 123456),
+        "utc": datetime(2026, 3, 1, 10, 30, tzinfo=timezone.utc),
+        "fecha": date(2026, 3, 1),
+        "color": Color.ROJO,
+        "modelo": Modelo(nombre="x"),
+        "ids": {3},
+        1: "clave no str",
+    }
+    assert json.loads(dumps(contenido)) == json.loads(json.dumps(jsonable_encoder(contenido)))
+
+
+def test_decimal_como_string():
+    # Contrato historico de montos y tarifas: "150.00", no 150.0
+    assert dumps({"monto": Decimal("150.00")}) == b'{"monto":"150.00"}'
+
+
+def _app() -> FastAPI:
+    router = APIRouter(route_class=RutaJSON)
+
+    @router.post("/creado", status_code=201)
+    async def creado():
+        return {"monto": Decimal("1.50")}
+
+    @router.get("/cookie")
+    async def con_cookie(response: Response):
+        response.set_cookie("k", "v")
+        response.status_code = 202
+        return {"ok": True}
+
+    @router.get("/propia")
+    async def propia():
+        return Response(b"crudo", media_type="text/plain")
+
+    @router.get("/modelo", response_model=dict)
+    async def con_modelo():
+        return {"monto": Decimal("1.50")}
+
+    app = FastAPI(default_response_class=RespuestaJSON)
+    app.include_router(router, prefix="/x")
+    return app
+
+
+async def test_ruta_json_respeta_status_headers_y_respuestas_propias():
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as client:
+        resp = await client.post("/x/creado")
+        assert resp.status_code == 201
+        assert resp.content == b'{"monto":"1.50"}'
+        assert resp.headers["content-type"] == "application/json"
+
+        resp = await client.get("/x/cookie")
+        assert resp.status_code == 202
+        assert resp.cookies["k"] == "v"
+
+        resp = await client.get("/x/propia")
+        assert resp.text == "crudo"
+
+
+def _endpoint(app: FastAPI, ruta: str):
+    return next(r.endpoint for r in app.routes if getattr(r, "path", None) == ruta)
+
+
+@pytest.mark.parametrize("ruta", ["/x/creado", "/x/cookie"])
+def test_endpoint_envuelto_una_sola_vez(ruta):
+    # include_router recrea la ruta: no debe envolver dos veces
+    endpoint = _endpoint(_app(), ruta)
+    assert endpoint._json_rapido
+    assert not getattr(endpoint.__wrapped__, "_json_rapido", False)
+
+
+def test_con_response_model_sigue_el_camino_de_fastapi():
+    assert not getattr(_endpoint(_app(), "/x/modelo"), "_json_rapido", False)
@@ -0,0 +1,120 @@
+"""
+Tests unitarios: metricas en memoria y scrape de GET /metrics.
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.main import app
+from app.services import metricas
+from app.services.metricas import Counter, Histogram, medir_storage
+
+
+@pytest.fixture(autouse=True)
+def _reset_metricas():
+    metricas.reset()
+    yield
+    metricas.reset()
+
+
+def _muestras(texto: str) -> dict[str, float]:
+    """Parsea las lineas de muestra del formato de texto: {nombre{labels}: valor}."""
+    muestras = {}
+    for linea in texto.splitlines():
+        if not linea or linea.startswith("#"):
+            continue
+        serie, valor = linea.rsplit(" ", 1)
+        muestras[serie] = float(valor)
+    return muestras
+
+
+# ── Formato de exposicion ───────────────────────────────────────────────
+
+def test_counter_expone_help_type_y_labels():
+    c = Counter("x_total", "Ayuda.", ("a", "b"))
+    c.inc("1", 'co"mi')
+    c.inc("1", 'co"mi', valor=2)
+    assert c.exponer() == [
+        "# HELP x_total Ayuda.",
+        "# TYPE x_total counter",
+        'x_total{a="1",b="co\\"mi"} 3',
+    ]
+
+
+def test_histograma_buckets_acumulados_suma_y_total():
+    h = Histogram("lat_seconds", "Latencia.", ("ruta",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.observe("/a", valor=v)
+    m = _muestras("\n".join(h.exponer()))
+    assert m['lat_seconds_bucket{ruta="/a",le="0.1"}'] == 2
+    assert m['lat_seconds_bucket{ruta="/a",le="1.0"}'] == 3
+    assert m['lat_seconds_bucket{ruta="/a",le="+Inf"}'] == 4
+    assert m['lat_seconds_count{ruta="/a"}'] == 4
+    assert m['lat_seconds_sum{ruta="/a"}'] == pytest.approx(3.65)
+
+
+async def test_medir_storage_cuenta_errores_pero_no_ausencias():
+    @medir_storage("read")
+    async def falla(exc):
+        raise exc
+
+    with pytest.raises(FileNotFoundError):
+        await falla(FileNotFoundError())
+    with pytest.raises(OSError):
+        await falla(OSError("caido"))
+
+    backend = settings.FILE_STORAGE
+    assert metricas.storage_duracion.count("read", backend) == 2
+    assert metricas.storage_errores.valor("read", backend) == 1
+
+
+# ── Scrape ──────────────────────────────────────────────────────────────
+
+async def _cliente():
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def test_scrape_por_plantilla_de_ruta():
+    async with await _cliente() as client:
+        await client.get("/health")
+        await client.get("/health")
+        # Sin sesion: 401, pero etiquetado con la plantilla, no con el id real
+        await client.get("/solicitudes/123")
+        await client.get("/solicitudes/456")
+        await client.get("/no-existe/789")
+        resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    m = _muestras(resp.text)
+
+    assert m['cmep_http_requests_total{method="GET",route="/health",status="200"}'] == 2
+    assert m['cmep_http_requests_total{method="GET",route="/solicitudes/{solicitud_id}",status="401"}'] == 2
+    assert m['cmep_http_requests_total{method="GET",route="<unmatched>",status="404"}'] == 1
+    assert m['cmep_http_request_duration_seconds_count{method="GET",route="/solicitudes/{solicitud_id}"}'] == 2
+    assert m['cmep_http_request_duration_seconds_bucket{method="GET",route="/health",le="+Inf"}'] == 2
+    assert not any("/solicitudes/123" in serie for serie in m)
+    # El propio scrape esta en vuelo mientras se expone
+    assert m["cmep_http_requests_in_flight"] == 1
+
+
+async def test_scrape_con_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3creto")
+    async with await _cliente() as client:
+        assert (await client.get("/metrics")).status_code == 401
+        resp = await client.get("/metrics", headers={"Authorization": "Bearer s3creto"})
+    assert resp.status_code == 200
+    assert "# TYPE cmep_http_requests_total counter" in resp.text
+
+
+async def test_fuera_de_local_sin_token_no_se_expone(monkeypatch):
+    monkeypatch.setattr(settings, "APP_ENV", "prod")
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    async with await _cliente() as client:
+        assert (await client.get("/metrics")).status_code == 404
+
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "s3creto")
+        assert (await client.get("/metrics")).status_code == 401
+        resp = await client.get("/metrics", headers={"Authorization": "Bearer s3creto"})
+    assert resp.status_code == 200
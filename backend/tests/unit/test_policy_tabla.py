@@ -0,0 +1,77 @@
+"""
+Tests unitarios: tabla precompilada de POLICY.
+Compara contra la implementacion original (union de listas por rol + sorted)
+para toda combinacion de roles y estados.
+"""
+
+from itertools import combinations
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.policy import (
+    POLICY,
+    ACCIONES,
+    TABLA,
+    acciones_permitidas_lote,
+    assert_allowed,
+    get_acciones_permitidas,
+    permitido_lote,
+)
+
+ESTADOS = ["REGISTRADO", "ASIGNADO_GESTOR", "PAGADO", "ASIGNADO_MEDICO", "CERRADO", "CANCELADO", "DESCONOCIDO"]
+ROLES = sorted(POLICY) + ["INVITADO"]
+
+
+def _referencia(roles: list[str], estado: str) -> list[str]:
+    """Implementacion previa a la tabla (fuente de verdad del test)."""
+    acciones: set[str] = set()
+    for rol in roles:
+        acciones.update(POLICY.get(rol, {}).get(estado, []))
+    return sorted(acciones)
+
+
+def _combinaciones_roles():
+    yield []
+    for n in range(1, len(ROLES) + 1):
+        for combinacion in combinations(ROLES, n):
+            yield list(combinacion)
+    # Duplicados y orden arbitrario
+    yield ["GESTOR", "ADMIN", "GESTOR"]
+
+
+def test_tabla_consistente_con_policy():
+    for roles in _combinaciones_roles():
+        for estado in ESTADOS:
+            assert get_acciones_permitidas(roles, estado) == _referencia(roles, estado), (roles, estado)
+
+
+def test_assert_allowed_consistente_con_policy():
+    for roles in _combinaciones_roles():
+        for estado in ESTADOS:
+            permitidas = _referencia(roles, estado)
+            for accion in list(ACCIONES) + ["OVERRIDE", "INEXISTENTE"]:
+                if accion in permitidas:
+                    assert_allowed(roles, estado, accion)
+                else:
+                    with pytest.raises(HTTPException) as exc:
+                        assert_allowed(roles, estado, accion)
+                    assert exc.value.status_code == 403
+
+
+def test_helpers_en_lote():
+    roles = ["OPERADOR", "GESTOR"]
+    assert acciones_permitidas_lote(roles, ESTADOS) == [tuple(_referencia(roles, e)) for e in ESTADOS]
+    assert permitido_lote(roles, ESTADOS, "ASIGNAR_MEDICO") == [
+        "ASIGNAR_MEDICO" in _referencia(roles, e) for e in ESTADOS
+    ]
+    assert acciones_permitidas_lote(roles, []) == []
+
+
+def test_tabla_inmutable():
+    with pytest.raises(TypeError):
+        TABLA[(frozenset({"ADMIN"}), "REGISTRADO")] = (0, ())  # type: ignore[index]
+    # El resultado publico es una lista nueva: mutarla no altera la tabla
+    acciones = get_acciones_permitidas(["ADMIN"], "REGISTRADO")
+    acciones.clear()
+    assert get_acciones_permitidas(["ADMIN"], "REGISTRADO") == _referencia(["ADMIN"], "REGISTRADO")
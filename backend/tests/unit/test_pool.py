@@ -0,0 +1,93 @@
+"""
+Tests unitarios: pool de conexiones configurable y medicion de espera de checkout.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import database
+from app.config import Settings
+from app.database import PoolMedido, _opciones_pool
+from app.services import metricas
+
+
+@pytest.fixture(autouse=True)
+def _reset_metricas():
+    metricas.reset()
+    yield
+    metricas.reset()
+
+
+def test_opciones_pool_desde_settings():
+    s = Settings(DB_URL="mysql+asyncmy://u:p@db/cmep", DB_POOL_SIZE=20, DB_MAX_OVERFLOW=5,
+                 DB_POOL_TIMEOUT=2.5, DB_POOL_RECYCLE=600, DB_POOL_PRE_PING=False)
+    assert _opciones_pool(s) == {
+        "poolclass": PoolMedido,
+        "pool_size": 20,
+        "max_overflow": 5,
+        "pool_timeout": 2.5,
+        "pool_recycle": 600,
+        "pool_pre_ping": False,
+    }
+    # SQLite en memoria usa StaticPool: sin opciones de dimensionamiento
+    assert _opciones_pool(Settings(DB_URL="sqlite+aiosqlite:///:memory:")) == {}
+    assert _opciones_pool(Settings(DB_URL="sqlite+aiosqlite://")) == {}
+    assert _opciones_pool(Settings(DB_URL="sqlite+aiosqlite:////tmp/x.db"))["poolclass"] is PoolMedido
+
+
+async def test_pool_mide_espera_y_cuenta_timeouts(tmp_path, monkeypatch):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=PoolMedido, pool_size=1, max_overflow=0, pool_timeout=0.2,
+    )
+    monkeypatch.setattr(database, "_engine", engine)
+    try:
+        async with engine.connect() as ocupada:
+            await ocupada.execute(text("SELECT 1"))
+            estado = database.estado_pool()
+            assert estado["checkedout"] == 1
+            assert estado["size"] == 1
+            assert estado["max_overflow"] == 0
+
+            # Pool agotado: la segunda conexion espera pool_timeout y falla
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+            # Liberada a tiempo: la espera queda registrada sin timeout
+            async def liberar():
+                await asyncio.sleep(0.05)
+                await ocupada.close()
+
+            tarea = asyncio.create_task(liberar())
+            async with engine.connect() as otra:
+                await otra.execute(text("SELECT 1"))
+            await tarea
+    finally:
+        await engine.dispose()
+
+    assert metricas.db_pool_timeouts.valor() == 1
+    espera = metricas.db_pool_espera.resumen()
+    assert espera["count"] == 3
+    assert espera["sum"] >= 0.2 + 0.05
+    assert espera["buckets"]["0.01"] == 1  # la primera: conexion nueva, sin cola
+    assert espera["buckets"]["+Inf"] == 3
+
+
+def test_estado_pool_sin_engine_no_lo_crea(monkeypatch):
+    monkeypatch.setattr(database, "_engine", None)
+    assert database.estado_pool() is None
+    assert database._engine is None
+
+
+def test_uso_del_pool_sin_tope_es_none():
+    from app.api.admin import _con_uso
+
+    assert _con_uso({"size": 5, "max_overflow": 5, "checkedout": 3})["uso"] == 0.3
+    # pool_size=0 es pool sin limite en SQLAlchemy: no hay capacidad contra la cual dividir
+    assert _con_uso({"size": 0, "max_overflow": 0, "checkedout": 2})["uso"] is None
+    assert _con_uso({"size": 5, "max_overflow": -1, "checkedout": 2})["uso"] is None
+    assert _con_uso(None) is None
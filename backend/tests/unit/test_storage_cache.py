@@ -0,0 +1,139 @@
+"""
+Tests unitarios: cache LRU en disco delante de S3.
+"""
+
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services import file_storage, storage_cache
+from app.services.storage_cache import DiskLRUCache
+
+
+@pytest.mark.asyncio
+async def test_hit_miss_y_eviccion_por_bytes(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=250)
+    assert await cache.get("a") is None
+
+    await cache.put("a", b"a" * 100)
+    await cache.put("b", b"b" * 100)
+    assert await cache.get("a") == b"a" * 100  # "a" pasa a ser la mas reciente
+
+    await cache.put("c", b"c" * 100)           # excede 250: sale "b"
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["bytes"] == 200
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_indice_se_reconstruye_del_directorio(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=1000)
+    await cache.put("k1", b"x" * 10)
+    (tmp_path / "basura.1234.tmp").write_bytes(b"escritura interrumpida")
+
+    reabierto = DiskLRUCache(tmp_path, max_bytes=1000)
+    assert await reabierto.get("k1") == b"x" * 10
+    assert reabierto.stats()["bytes"] == 10
+    assert not (tmp_path / "basura.1234.tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_read_file_s3_usa_cache_y_un_solo_get(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE", "s3")
+    monkeypatch.setattr(settings, "STORAGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(storage_cache, "_cache", None)
+    monkeypatch.setattr(storage_cache, "_prefetch_sem", None)
+    monkeypatch.setattr(settings, "STORAGE_CACHE_PREFETCH", True)
+
+    gets: list[str] = []
+
+    async def fake_s3_read(storage_path: str) -> bytes:
+        gets.append(storage_path)
+        await asyncio.sleep(0.01)
+        return b"contenido-" + storage_path.encode()
+
+    monkeypatch.setattr(file_storage, "_s3_read", fake_s3_read)
+
+    # Dos lecturas concurrentes del mismo objeto: un solo GET
+    r1, r2 = await asyncio.gather(
+        file_storage.read_file("doc.pdf"), file_storage.read_file("doc.pdf")
+    )
+    assert r1 == r2 == b"contenido-doc.pdf"
+    assert await file_storage.read_file("doc.pdf") == b"contenido-doc.pdf"
+    assert gets == ["doc.pdf"]
+    assert storage_cache.get_cache().stats()["hits"] >= 1
+
+    # Prefetch: precarga sin bloquear
+    storage_cache.prefetch(["otro.pdf", "doc.pdf"])
+    await asyncio.gather(*storage_cache._prefetch_tasks)
+    assert gets == ["doc.pdf", "otro.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_con_url_s3_ya_cacheada_no_lee(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FILE_STORAGE", "s3")
+    monkeypatch.setattr(settings, "STORAGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(storage_cache, "_cache", None)
+    monkeypatch.setattr(storage_cache, "_prefetch_sem", None)
+    monkeypatch.setattr(settings, "STORAGE_CACHE_PREFETCH", True)
+
+    lecturas: list[str] = []
+    read_original = file_storage.read_file
+
+    async def fake_read_file(storage_path: str) -> bytes:
+        lecturas.append(storage_path)
+        return await read_original(storage_path)
+
+    monkeypatch.setattr(file_storage, "read_file", fake_read_file)
+
+    # storage_path tal como lo registra _s3_save: URL publica; el cache usa la key
+    url = file_storage.s3_url("abc.pdf")
+    cache = storage_cache.get_cache()
+    await cache.put("abc.pdf", b"pdf")
+
+    storage_cache.prefetch([url])
+    assert not storage_cache._prefetch_tasks
+    assert lecturas == []
+    assert cache.stats()["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_adjuntos_miniaturas_y_originales_chicos_con_tope(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    monkeypatch.setattr(settings, "FILE_STORAGE", "s3")
+    monkeypatch.setattr(settings, "STORAGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "STORAGE_CACHE_PREFETCH_MAX_BYTES", 1000)
+    monkeypatch.setattr(settings, "STORAGE_CACHE_PREFETCH_MAX_FILES", 3)
+    monkeypatch.setattr(storage_cache, "_cache", None)
+    monkeypatch.setattr(storage_cache, "_prefetch_sem", None)
+
+    lecturas: list[str] = []
+
+    async def fake_read_file(storage_path: str) -> bytes:
+        lecturas.append(storage_path)
+        return b""
+
+    monkeypatch.setattr(file_storage, "read_file", fake_read_file)
+    archivos = [
+        SimpleNamespace(thumbnail_path="t1.webp", storage_path="chico.pdf", tamano_bytes=500),
+        SimpleNamespace(thumbnail_path="t2.webp", storage_path="escaneo.pdf", tamano_bytes=50_000),
+        SimpleNamespace(thumbnail_path=None, storage_path="otro.pdf", tamano_bytes=10),
+    ]
+
+    # Desactivado por defecto
+    storage_cache.prefetch_adjuntos(archivos)
+    assert not storage_cache._prefetch_tasks
+
+    monkeypatch.setattr(settings, "STORAGE_CACHE_PREFETCH", True)
+    storage_cache.prefetch_adjuntos(archivos)
+    await asyncio.gather(*storage_cache._prefetch_tasks)
+    # Miniaturas primero; el escaneo grande nunca; tope de 3 lecturas
+    assert sorted(lecturas) == ["chico.pdf", "t1.webp", "t2.webp"]
@@ -3,7 +3,7 @@
  * Ref: docs/source/06_ui_paginas_y_contratos.md — Ruteo
  *
  * Publicas: /, /login
- * Privadas: /app/* (requieren sesion valida via GET /auth/me)
+ * Privadas: /app/* (requieren sesion valida via GET /bootstrap)
  *
  * Regla frontend: NO calcula permisos.
  *
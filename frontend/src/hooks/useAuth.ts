@@ -3,7 +3,8 @@
  * Ref: docs/source/06_ui_paginas_y_contratos.md — regla de acceso
  *
  * Regla: toda ruta /app/* requiere sesion valida.
- * Si GET /auth/me falla (401/403) -> redirigir a /login
+ * La sesion se valida con GET /bootstrap (usuario + policy + catalogos en
+ * una sola llamada). Si falla (401/403) -> redirigir a /login
  *
  * Usa React Context para que todos los componentes compartan
  * el mismo estado de autenticacion (fix: login sin refresh).
@@ -12,14 +13,19 @@
 import { createContext, useContext, useState, useEffect, useCallback, createElement } from "react";
 import type { ReactNode } from "react";
 import { api } from "../services/api";
-import type { UserDTO, ApiResponse } from "../types/auth";
+import type { UserDTO, ApiResponse, BootstrapData } from "../types/auth";
 
 interface AuthState {
   user: UserDTO | null;
   loading: boolean;
   error: string | null;
+  // Policy y catalogos de /bootstrap (null hasta cargar)
+  policy: BootstrapData["policy"] | null;
+  catalogos: BootstrapData["catalogos"] | null;
 }
 
+const EMPTY: AuthState = { user: null, loading: false, error: null, policy: null, catalogos: null };
+
 interface AuthContextValue extends AuthState {
   login: (email: string, password: string) => Promise<UserDTO>;
   logout: () => Promise<void>;
@@ -29,18 +35,20 @@ interface AuthContextValue extends AuthState {
 const AuthContext = createContext<AuthContextValue | null>(null);
 
 export function AuthProvider({ children }: { children: ReactNode }) {
-  const [state, setState] = useState<AuthState>({
-    user: null,
-    loading: true,
-    error: null,
-  });
+  const [state, setState] = useState<AuthState>({ ...EMPTY, loading: true });
 
   const checkSession = useCallback(async () => {
     try {
-      const res = await api.get<ApiResponse<{ user: UserDTO }>>("/auth/me");
-      setState({ user: res.data.user, loading: false, error: null });
+      const res = await api.get<ApiResponse<BootstrapData>>("/bootstrap");
+      setState({
+        user: res.data.user,
+        loading: false,
+        error: null,
+        policy: res.data.policy,
+        catalogos: res.data.catalogos,
+      });
     } catch {
-      setState({ user: null, loading: false, error: null });
+      setState(EMPTY);
     }
   }, []);
 
@@ -53,7 +61,9 @@ export function AuthProvider({ children }: { children: ReactNode }) {
       email,
       password,
     });
-    setState({ user: res.data.user, loading: false, error: null });
+    setState({ ...EMPTY, user: res.data.user });
+    // Policy y catalogos en segundo plano (el login no espera)
+    checkSession();
     return res.data.user;
   };
 
@@ -61,7 +71,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     try {
       await api.post("/auth/logout");
     } finally {
-      setState({ user: null, loading: false, error: null });
+      setState(EMPTY);
     }
   };
 
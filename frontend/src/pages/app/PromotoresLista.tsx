@@ -9,6 +9,7 @@ import { api } from "../../services/api";
 import Modal from "../../components/Modal";
 
 const PRIMARY = "#1a3d5c";
+const PAGE_SIZE = 50;
 
 interface PromotorItem {
   promotor_id: number;
@@ -100,6 +101,11 @@ export default function PromotoresLista() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
+  // Busqueda por prefijo en el servidor + paginacion por cursor
+  const [q, setQ] = useState("");
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
   const [formMode, setFormMode] = useState<FormMode>("idle");
   const [editId, setEditId] = useState<number | null>(null);
   const [form, setForm] = useState<FormData>(emptyForm);
@@ -143,22 +149,49 @@ export default function PromotoresLista() {
     marginBottom: "0.5rem",
   };
 
+  const fetchPage = useCallback(async (cursor: number | null) => {
+    const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+    if (q.trim()) params.set("q", q.trim());
+    if (cursor !== null) params.set("cursor", String(cursor));
+    return api.get<{ ok: boolean; data: PromotorItem[]; meta: { next_cursor: number | null } }>(
+      `/promotores?${params}`
+    );
+  }, [q]);
+
   const fetchList = useCallback(async () => {
     setLoading(true);
     setError(null);
     try {
-      const res = await api.get<{ ok: boolean; data: PromotorItem[] }>("/promotores");
+      const res = await fetchPage(null);
       setItems(res.data);
+      setNextCursor(res.meta.next_cursor);
     } catch (err: unknown) {
       const e = err as { detail?: string };
       setError(e.detail ?? "Error al cargar promotores");
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [fetchPage]);
 
+  const loadMore = async () => {
+    if (nextCursor === null) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetchPage(nextCursor);
+      setItems((prev) => [...prev, ...res.data]);
+      setNextCursor(res.meta.next_cursor);
+    } catch (err: unknown) {
+      const e = err as { detail?: string };
+      setError(e.detail ?? "Error al cargar promotores");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Debounce de la busqueda
   useEffect(() => {
-    fetchList();
+    const t = setTimeout(fetchList, 250);
+    return () => clearTimeout(t);
   }, [fetchList]);
 
   const resetForm = () => {
@@ -416,11 +449,20 @@ export default function PromotoresLista() {
         </div>
       </Modal>
 
+      {/* ─── Busqueda ─── */}
+      <input
+        type="search"
+        value={q}
+        onChange={(e) => setQ(e.target.value)}
+        placeholder="Buscar por razon social, nombre o apellidos..."
+        style={{ ...inputStyle, marginBottom: "0.75rem" }}
+      />
+
       {/* ─── Tabla ─── */}
       {loading ? (
         <p style={{ color: "#666" }}>Cargando...</p>
       ) : items.length === 0 ? (
-        <p style={{ color: "#999" }}>No hay promotores registrados.</p>
+        <p style={{ color: "#999" }}>{q.trim() ? "Sin resultados." : "No hay promotores registrados."}</p>
       ) : (
         <table style={{ width: "100%", borderCollapse: "collapse" }}>
           <thead>
@@ -469,6 +511,13 @@ export default function PromotoresLista() {
           </tbody>
         </table>
       )}
+      {!loading && nextCursor !== null && (
+        <div style={{ textAlign: "center", marginTop: "0.75rem" }}>
+          <button onClick={loadMore} disabled={loadingMore} style={btnStyle(PRIMARY)}>
+            {loadingMore ? "Cargando..." : "Cargar mas"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -35,7 +35,7 @@ type ActionModal =
 export default function SolicitudDetalle() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
-  const { user } = useAuth();
+  const { user, catalogos } = useAuth();
   const isAdmin = user?.roles.includes("ADMIN") ?? false;
 
   const [detail, setDetail] = useState<SolicitudDetailDTO | null>(null);
@@ -257,7 +257,7 @@ export default function SolicitudDetalle() {
     setActionComentario("");
   };
 
-  const fetchEmpleados = async (rol: string) => {
+  const fetchEmpleados = async (rol: "GESTOR" | "MEDICO") => {
     try {
       const res = await api.get<{ ok: boolean; data: { persona_id: number; nombre: string }[] }>(
         `/empleados?rol=${rol}`
@@ -271,10 +271,13 @@ export default function SolicitudDetalle() {
   const openModal = async (modal: ActionModal) => {
     resetActionForms();
     setActiveModal(modal);
+    // Lista del bootstrap al instante; /empleados la revalida (ETag, 304 si no cambio)
     if (modal === "asignar_gestor" || modal === "cambiar_gestor") {
+      if (catalogos) setGestores(catalogos.empleados.GESTOR);
       const list = await fetchEmpleados("GESTOR");
       setGestores(list);
     } else if (modal === "asignar_medico" || modal === "cambiar_medico") {
+      if (catalogos) setMedicos(catalogos.empleados.MEDICO);
       const list = await fetchEmpleados("MEDICO");
       setMedicos(list);
     }
@@ -304,10 +307,7 @@ export default function SolicitudDetalle() {
     setUploading(true);
     setUploadError(null); // solo upload
     try {
-      const formData = new FormData();
-      formData.append("file", uploadFile);
-      formData.append("tipo_archivo", uploadTipo);
-      await api.upload<{ ok: boolean }>(`/solicitudes/${id}/archivos`, formData);
+      await api.uploadArchivo<{ ok: boolean }>(id, uploadFile, uploadTipo);
       setUploadFile(null);
       setUploadTipo("DOCUMENTO");
       fetchDetail();
@@ -926,6 +926,7 @@ if (!detail) {
           <table style={tableStyle}>
             <thead>
               <tr>
+                <th style={thStyle}></th>
                 <th style={thStyle}>Nombre</th>
                 <th style={thStyle}>Tipo</th>
                 <th style={thStyle}>Tamano</th>
@@ -935,6 +936,16 @@ if (!detail) {
             <tbody>
               {detail.archivos.map((a) => (
                 <tr key={a.id} style={trStyle}>
+                  <td style={tdStyle}>
+                    {a.thumbnail_disponible && (
+                      <img
+                        src={`${import.meta.env.VITE_API_URL ?? "http://localhost:8000"}/archivos/${a.archivo_id}/thumbnail`}
+                        alt=""
+                        loading="lazy"
+                        style={{ width: 48, height: 48, objectFit: "cover", borderRadius: 4, display: "block" }}
+                      />
+                    )}
+                  </td>
                   <td style={tdStyle}>{a.nombre ?? "archivo"}</td>
                   <td style={tdStyle}>{a.tipo ?? "-"}</td>
                   <td style={tdStyle}>
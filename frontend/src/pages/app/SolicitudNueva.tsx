@@ -10,6 +10,7 @@
 import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import { api } from "../../services/api";
+import { useAuth } from "../../hooks/useAuth";
 import type { ApiResponse } from "../../types/auth";
 import type { CreateSolicitudRequest, PromotorListItem } from "../../types/solicitud";
 
@@ -65,6 +66,7 @@ export default function SolicitudNueva() {
   const [promotores, setPromotores] = useState<PromotorListItem[]>([]);
   const [promotorMode, setPromotorMode] = useState<"none" | "existing" | "new">("none");
   const [selectedPromotorId, setSelectedPromotorId] = useState("");
+  const [promQ, setPromQ] = useState("");
   // New promotor fields
   const [promTipo, setPromTipo] = useState<"PERSONA" | "EMPRESA" | "OTROS">("PERSONA");
   const [promTipoDoc, setPromTipoDoc] = useState("DNI");
@@ -85,14 +87,36 @@ export default function SolicitudNueva() {
   // Comentario
   const [comentario, setComentario] = useState("");
 
-  // Fetch promotores + servicios on mount
+  const { catalogos } = useAuth();
+
+  // Promotores: primera pagina del bootstrap; busqueda via autocomplete (debounce)
   useEffect(() => {
-    api
-      .get<{ ok: boolean; data: PromotorListItem[] }>("/promotores")
-      .then((res) => setPromotores(res.data))
-      .catch(() => {
-        /* promotores list is optional — ignore errors */
-      });
+    if (!promQ.trim() && catalogos) {
+      setPromotores(catalogos.promotores.items);
+      return;
+    }
+    const params = new URLSearchParams({ modo: "autocomplete", limit: "20" });
+    if (promQ.trim()) params.set("q", promQ.trim());
+    const t = setTimeout(() => {
+      api
+        .get<{ ok: boolean; data: PromotorListItem[] }>(`/promotores?${params}`)
+        .then((res) => setPromotores(res.data))
+        .catch(() => {
+          /* promotores list is optional — ignore errors */
+        });
+    }, promQ ? 250 : 0);
+    return () => clearTimeout(t);
+  }, [promQ, catalogos]);
+
+  // Servicios: del bootstrap; si aun no cargo, pedirlos
+  useEffect(() => {
+    if (catalogos) {
+      setServicios(catalogos.servicios);
+      if (catalogos.servicios.length === 1) {
+        setServicioId(String(catalogos.servicios[0].servicio_id));
+      }
+      return;
+    }
     api
       .get<{ ok: boolean; data: typeof servicios }>("/servicios")
       .then((res) => {
@@ -102,7 +126,7 @@ export default function SolicitudNueva() {
         }
       })
       .catch(() => {});
-  }, []);
+  }, [catalogos]);
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
@@ -346,7 +370,7 @@ export default function SolicitudNueva() {
               style={inputStyle}
             >
               <option value="none">Sin promotor</option>
-              {promotores.length > 0 && <option value="existing">Seleccionar existente</option>}
+              {(promotores.length > 0 || promQ) && <option value="existing">Seleccionar existente</option>}
               <option value="new">Registrar nuevo promotor</option>
             </select>
           </div>
@@ -355,6 +379,13 @@ export default function SolicitudNueva() {
           {promotorMode === "existing" && (
             <div style={fieldGroupStyle}>
               <label style={labelStyle}>Seleccionar promotor</label>
+              <input
+                type="search"
+                value={promQ}
+                onChange={(e) => setPromQ(e.target.value)}
+                placeholder="Buscar por razon social, nombre o apellidos..."
+                style={{ ...inputStyle, marginBottom: "0.4rem" }}
+              />
               <select
                 value={selectedPromotorId}
                 onChange={(e) => setSelectedPromotorId(e.target.value)}
@@ -364,7 +395,6 @@ export default function SolicitudNueva() {
                 {promotores.map((p) => (
                   <option key={p.promotor_id} value={p.promotor_id}>
                     {p.nombre} ({p.tipo_promotor})
-                    {p.fuente_promotor ? ` — ${p.fuente_promotor}` : ""}
                   </option>
                 ))}
               </select>
@@ -10,6 +10,7 @@ import type { AdminUserDTO, CreateUserPayload, UpdateUserPayload } from "../../t
 
 const PRIMARY = "#1a3d5c";
 const ALL_ROLES = ["ADMIN", "OPERADOR", "GESTOR", "MEDICO"];
+const PAGE_SIZE = 50;
 
 type ModalType = "create" | "edit" | "reset_password" | null;
 
@@ -19,6 +20,12 @@ export default function UsuariosLista() {
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
 
+  // Paginacion y filtros (servidor)
+  const [page, setPage] = useState(1);
+  const [total, setTotal] = useState(0);
+  const [filtroRol, setFiltroRol] = useState("");
+  const [filtroEstado, setFiltroEstado] = useState("");
+
   // Modal state
   const [activeModal, setActiveModal] = useState<ModalType>(null);
   const [editingUser, setEditingUser] = useState<AdminUserDTO | null>(null);
@@ -47,15 +54,23 @@ export default function UsuariosLista() {
     setLoading(true);
     setError(null);
     try {
-      const res = await api.get<{ ok: boolean; data: AdminUserDTO[] }>("/admin/usuarios");
+      const params = new URLSearchParams({ page: String(page), page_size: String(PAGE_SIZE) });
+      if (filtroRol) params.set("rol", filtroRol);
+      if (filtroEstado) params.set("estado", filtroEstado);
+      const res = await api.get<{
+        ok: boolean;
+        data: AdminUserDTO[];
+        meta: { page: number; page_size: number; total: number };
+      }>(`/admin/usuarios?${params}`);
       setUsers(res.data);
+      setTotal(res.meta.total);
     } catch (err: unknown) {
       const e = err as { detail?: string };
       setError(e.detail ?? "Error al cargar usuarios");
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [page, filtroRol, filtroEstado]);
 
   useEffect(() => {
     fetchUsers();
@@ -289,11 +304,36 @@ export default function UsuariosLista() {
         </div>
       )}
 
+      {/* Filtros */}
+      <div style={{ display: "flex", gap: "0.5rem", marginBottom: "0.75rem", flexWrap: "wrap" }}>
+        <select
+          value={filtroRol}
+          onChange={(e) => { setFiltroRol(e.target.value); setPage(1); }}
+          style={{ ...inputStyle, width: "auto" }}
+        >
+          <option value="">Todos los roles</option>
+          {ALL_ROLES.map((role) => (
+            <option key={role} value={role}>{role}</option>
+          ))}
+        </select>
+        <select
+          value={filtroEstado}
+          onChange={(e) => { setFiltroEstado(e.target.value); setPage(1); }}
+          style={{ ...inputStyle, width: "auto" }}
+        >
+          <option value="">Todos los estados</option>
+          <option value="ACTIVO">Activos</option>
+          <option value="SUSPENDIDO">Suspendidos</option>
+        </select>
+      </div>
+
       {/* Table */}
       {loading ? (
         <p style={{ color: "#666" }}>Cargando...</p>
       ) : users.length === 0 ? (
-        <p style={{ color: "#666" }}>No hay usuarios registrados.</p>
+        <p style={{ color: "#666" }}>
+          {filtroRol || filtroEstado ? "Sin usuarios para estos filtros." : "No hay usuarios registrados."}
+        </p>
       ) : (
         <table style={{ width: "100%", borderCollapse: "collapse", fontSize: "0.9rem" }}>
           <thead>
@@ -376,6 +416,19 @@ export default function UsuariosLista() {
           </tbody>
         </table>
       )}
+      {total > PAGE_SIZE && (
+        <div style={{ display: "flex", justifyContent: "center", alignItems: "center", gap: "0.75rem", marginTop: "0.75rem" }}>
+          <button style={btnSmall} disabled={page <= 1} onClick={() => setPage(page - 1)}>
+            Anterior
+          </button>
+          <span style={{ fontSize: "0.85rem", color: "#666" }}>
+            Pagina {page} de {Math.ceil(total / PAGE_SIZE)}
+          </span>
+          <button style={btnSmall} disabled={page * PAGE_SIZE >= total} onClick={() => setPage(page + 1)}>
+            Siguiente
+          </button>
+        </div>
+      )}
 
       {/* ── Create Modal ─────────────────────────────────────────────── */}
       {activeModal === "create" && (
@@ -56,6 +56,51 @@ async function uploadRequest<T>(path: string, formData: FormData): Promise<T> {
   return body as T;
 }
 
+/**
+ * Sube un archivo a una solicitud. Con S3 sube directo al bucket
+ * (presign -> POST al bucket -> confirm) sin pasar los bytes por la API;
+ * si el backend no lo soporta (storage local) usa el upload multipart.
+ */
+async function uploadArchivo<T>(solicitudId: number | string, file: File, tipoArchivo: string): Promise<T> {
+  const base = `/solicitudes/${solicitudId}/archivos`;
+  let presign: { data: { url: string; fields: Record<string, string>; upload_token: string } };
+  try {
+    presign = await request(`${base}/presign`, {
+      method: "POST",
+      body: JSON.stringify({
+        nombre: file.name,
+        mime_type: file.type || "application/octet-stream",
+        tamano_bytes: file.size,
+        tipo_archivo: tipoArchivo,
+      }),
+    });
+  } catch (err: unknown) {
+    const e = err as { status?: number; detail?: { error?: { code?: string; message?: string } } | string };
+    if (e.status === 409) {
+      const formData = new FormData();
+      formData.append("file", file);
+      formData.append("tipo_archivo", tipoArchivo);
+      return uploadRequest<T>(base, formData);
+    }
+    const d = typeof e.detail === "object" ? e.detail?.error : undefined;
+    throw { status: e.status, code: d?.code ?? "UNKNOWN_ERROR", detail: d?.message ?? "Error al subir archivo" };
+  }
+
+  const { url, fields, upload_token } = presign.data;
+  const s3Form = new FormData();
+  Object.entries(fields).forEach(([k, v]) => s3Form.append(k, v));
+  s3Form.append("file", file); // debe ir al final
+  const s3Res = await fetch(url, { method: "POST", body: s3Form });
+  if (!s3Res.ok) {
+    throw { status: s3Res.status, code: "S3_UPLOAD_FAILED", detail: "Falló la subida del archivo. Intenta nuevamente." };
+  }
+
+  return request<T>(`${base}/confirm`, {
+    method: "POST",
+    body: JSON.stringify({ upload_token }),
+  });
+}
+
 
 export const api = {
   get: <T>(path: string) => request<T>(path),
@@ -65,4 +110,6 @@ export const api = {
     request<T>(path, { method: "PATCH", body: JSON.stringify(data) }),
   delete: <T>(path: string) => request<T>(path, { method: "DELETE" }),
   upload: <T>(path: string, formData: FormData) => uploadRequest<T>(path, formData),
+  uploadArchivo: <T>(solicitudId: number | string, file: File, tipoArchivo: string) =>
+    uploadArchivo<T>(solicitudId, file, tipoArchivo),
 };
@@ -12,6 +12,33 @@ export interface UserDTO {
   display_name: string;
 }
 
+export interface EmpleadoOption {
+  persona_id: number;
+  nombre: string;
+  rol: string;
+}
+
+export interface ServicioOption {
+  servicio_id: number;
+  descripcion_servicio: string;
+  tarifa_servicio: string;
+  moneda_tarifa: string;
+}
+
+// GET /bootstrap — usuario + policy + catalogos de selectores
+export interface BootstrapData {
+  user: UserDTO;
+  policy: Record<string, Record<string, string[]>>;
+  catalogos: {
+    servicios: ServicioOption[];
+    empleados: Record<"GESTOR" | "MEDICO", EmpleadoOption[]>;
+    promotores: {
+      items: { promotor_id: number; tipo_promotor: string; nombre: string }[];
+      next_cursor: number | null;
+    };
+  };
+}
+
 export interface ApiResponse<T> {
   ok: boolean;
   data: T;
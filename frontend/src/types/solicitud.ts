@@ -61,6 +61,7 @@ export interface ArchivoDTO {
   tipo: string | null;
   mime_type: string | null;
   tamano_bytes: number | null;
+  thumbnail_disponible: boolean;
 }
 
 export interface HistorialDTO {
@@ -85,6 +86,7 @@ export interface SolicitudListItemDTO {
   medico: string | null;
   promotor: string | null;
   created_at: string;
+  acciones_permitidas?: string[];
 }
 
 export interface ResultadoMedicoDTO {
@@ -157,11 +159,11 @@ export interface ApoderadoInput {
   email?: string;
 }
 
+// GET /promotores?modo=autocomplete
 export interface PromotorListItem {
   promotor_id: number;
   tipo_promotor: string;
   nombre: string;
-  fuente_promotor: string | null;
 }
 
 export interface PromotorInput {
@@ -1,12 +1,19 @@
 """
 Lambda para limpieza de sesiones expiradas.
-Ejecutada via EventBridge cada 6 horas.
+OPCIONAL: la API ya expira sesiones con su scheduler in-app
+(app.services.scheduler, SCHEDULER_ENABLED). Mantener solo si el scheduler
+esta desactivado.
+
+Borra en lotes de BATCH_SIZE con un COMMIT por lote, para no sostener
+un DELETE largo con bloqueos sobre toda la tabla sessions.
 
 Variables de entorno requeridas:
   DB_HOST  — RDS endpoint
   DB_USER  — usuario MySQL (cmep_user)
   DB_PASS  — password MySQL
   DB_NAME  — nombre de la BD (cmep_prod)
+Opcional:
+  BATCH_SIZE — filas por lote (default 500)
 """
 
 import os
@@ -14,17 +21,27 @@ import pymysql
 
 
 def handler(event, context):
+    batch_size = int(os.environ.get("BATCH_SIZE", "500"))
     conn = pymysql.connect(
         host=os.environ["DB_HOST"],
         user=os.environ["DB_USER"],
         password=os.environ["DB_PASS"],
         database=os.environ["DB_NAME"],
     )
+    deleted = 0
     try:
-        with conn.cursor() as cur:
-            cur.execute("DELETE FROM sessions WHERE expires_at < NOW()")
-            deleted = cur.rowcount
-        conn.commit()
+        while True:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM sessions WHERE expires_at < NOW() "
+                    "ORDER BY expires_at LIMIT %s",
+                    (batch_size,),
+                )
+                n = cur.rowcount
+            conn.commit()
+            deleted += n
+            if n < batch_size:
+                break
         print(f"Sesiones expiradas eliminadas: {deleted}")
         return {"ok": True, "deleted_sessions": deleted}
     finally:
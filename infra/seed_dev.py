@@ -143,8 +143,8 @@ SEED_SERVICIOS = [
 
 def get_engine(use_mysql: bool):
     if use_mysql:
-        from app.database import _get_engine
-        return _get_engine()
+        from app.database import get_engine
+        return get_engine()
 
     print(f"Usando SQLite local: {SQLITE_PATH}")
     return create_async_engine(SQLITE_URL, echo=False)
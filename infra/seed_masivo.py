@@ -0,0 +1,520 @@
+"""
+Generador de datos sinteticos a escala de produccion.
+
+A diferencia de seed_dev.py (objetos ORM uno a uno), inserta por lotes con
+Core insert() + executemany (sin unit of work ni identity map): 10k / 100k / 1M solicitudes con clientes,
+promotores, asignaciones (incluye cambios de gestor), pagos, historial,
+archivos (solo metadatos, sin objetos en storage) y resultados medicos,
+con una distribucion configurable de estados operativos.
+
+Ejecutar desde /infra:
+  python seed_masivo.py --solicitudes 100000 --reset      (SQLite local)
+  python seed_masivo.py --solicitudes 10000               (agrega a lo existente)
+  python seed_masivo.py --estados REGISTRADO=50,PAGADO=30,CERRADO=20
+  python seed_masivo.py --mysql --solicitudes 1000000 --lote 5000
+
+Usuarios de login (mismos que seed_dev): admin@cmep.local / admin123,
+operador@cmep.local / operador123, gestor@cmep.local / gestor123,
+medico@cmep.local / medico123. Reproducible con --semilla.
+"""
+
+import sys
+import os
+import argparse
+
+# Agregar backend al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from app.database import Base
+import app.models  # noqa: F401 — registrar todos los modelos en metadata
+from app.models.cliente import Cliente
+from app.models.empleado import Empleado, MedicoExtra
+from app.models.persona import Persona
+from app.models.promotor import Promotor
+from app.models.servicio import Servicio
+from app.models.solicitud import (
+    Archivo,
+    PagoSolicitud,
+    ResultadoMedico,
+    SolicitudArchivo,
+    SolicitudAsignacion,
+    SolicitudCmep,
+    SolicitudEstadoHistorial,
+)
+from app.models.user import User, UserRole
+from app.utils.hashing import hash_password
+from app.utils.time import utcnow
+
+
+SQLITE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "cmep_dev.db"))
+SQLITE_URL = f"sqlite+aiosqlite:///{SQLITE_PATH}"
+
+ESTADOS = ("REGISTRADO", "ASIGNADO_GESTOR", "PAGADO", "ASIGNADO_MEDICO", "CERRADO", "CANCELADO")
+
+# Porcentajes por estado operativo (se normalizan)
+DISTRIBUCION_DEFAULT = {
+    "REGISTRADO": 20,
+    "ASIGNADO_GESTOR": 15,
+    "PAGADO": 10,
+    "ASIGNADO_MEDICO": 10,
+    "CERRADO": 40,
+    "CANCELADO": 5,
+}
+
+USUARIOS_LOGIN = [
+    ("admin@cmep.local", "admin123", "ADMIN"),
+    ("operador@cmep.local", "operador123", "OPERADOR"),
+    ("gestor@cmep.local", "gestor123", "GESTOR"),
+    ("medico@cmep.local", "medico123", "MEDICO"),
+]
+
+NOMBRES = ["Ana", "Luis", "Maria", "Jose", "Carmen", "Jorge", "Rosa", "Carlos", "Lucia", "Pedro",
+           "Elena", "Miguel", "Sofia", "Juan", "Patricia", "Diego", "Andrea", "Raul", "Julia", "Victor"]
+APELLIDOS = ["Quispe", "Flores", "Garcia", "Rodriguez", "Mamani", "Huaman", "Lopez", "Chavez",
+             "Sanchez", "Ramirez", "Torres", "Vargas", "Castillo", "Rojas", "Mendoza", "Gutierrez"]
+CANALES = ["YAPE", "PLIN", "TRANSFERENCIA", "EFECTIVO"]
+SERVICIOS = [
+    ("CMEP Presencial", Decimal("150.00"), "PEN"),
+    ("CMEP Virtual", Decimal("120.00"), "PEN"),
+    ("CMEP Domicilio", Decimal("220.00"), "PEN"),
+]
+
+
+def parse_distribucion(texto: str | None) -> dict[str, float]:
+    """'REGISTRADO=50,PAGADO=30' -> pesos por estado (los omitidos valen 0)."""
+    if not texto:
+        return dict(DISTRIBUCION_DEFAULT)
+    pesos = {}
+    for parte in texto.split(","):
+        estado, _, valor = parte.partition("=")
+        estado = estado.strip().upper()
+        if estado not in ESTADOS:
+            raise ValueError(f"Estado desconocido: {estado} (validos: {', '.join(ESTADOS)})")
+        pesos[estado] = float(valor)
+    if sum(pesos.values()) <= 0:
+        raise ValueError("La distribucion debe sumar mas de 0")
+    return pesos
+
+
+# ── Insercion por lotes ────────────────────────────────────────────────
+
+class _Lotes:
+    """Acumula filas por tabla y las inserta con un insert() Core por tabla y lote."""
+
+    # Orden de insercion (dependencias FK)
+    ORDEN = [
+        Persona, User, UserRole, Empleado, MedicoExtra, Servicio, Promotor, Cliente,
+        SolicitudCmep, SolicitudAsignacion, PagoSolicitud, Archivo, SolicitudArchivo,
+        SolicitudEstadoHistorial, ResultadoMedico,
+    ]
+
+    def __init__(self, conn: AsyncConnection):
+        self.conn = conn
+        self.filas: dict = {m: [] for m in self.ORDEN}
+        self.totales: dict[str, int] = {m.__tablename__: 0 for m in self.ORDEN}
+
+    def add(self, modelo, **valores) -> None:
+        self.filas[modelo].append(valores)
+
+    async def volcar(self) -> None:
+        for modelo in self.ORDEN:
+            filas = self.filas[modelo]
+            if not filas:
+                continue
+            tabla = modelo.__table__
+            # executemany de un insert() compilado una vez (cache de SQLAlchemy);
+            # el driver lo envia como INSERT multi-VALUES (MySQL) o sentencia
+            # preparada reutilizada (SQLite). insert().values(lista) recompila
+            # un VALUES de miles de filas por lote: ~20x mas lento.
+            await self.conn.execute(insert(tabla), filas)
+            self.totales[tabla.name] += len(filas)
+            filas.clear()
+
+
+class _Ids:
+    """Siguiente id por tabla (a partir del maximo existente: permite agregar)."""
+
+    # Tablas con id surrogate asignado aqui (el resto usa FKs como PK)
+    MODELOS = [
+        Persona, User, Empleado, Servicio, Promotor, SolicitudCmep, SolicitudAsignacion,
+        PagoSolicitud, Archivo, SolicitudArchivo, SolicitudEstadoHistorial, ResultadoMedico,
+    ]
+
+    def __init__(self):
+        self._sig: dict[str, int] = {}
+
+    async def cargar(self, conn: AsyncConnection) -> None:
+        for modelo in self.MODELOS:
+            pk = modelo.__table__.primary_key.columns.values()[0]
+            maximo = (await conn.execute(select(func.max(pk)))).scalar() or 0
+            self._sig[modelo.__tablename__] = maximo + 1
+
+    def nuevo(self, modelo) -> int:
+        n = self._sig[modelo.__tablename__]
+        self._sig[modelo.__tablename__] = n + 1
+        return n
+
+
+# ── Generador ──────────────────────────────────────────────────────────
+
+class _Generador:
+    def __init__(self, lotes: _Lotes, ids: _Ids, rnd: random.Random, ahora: datetime):
+        self.lotes = lotes
+        self.ids = ids
+        self.rnd = rnd
+        self.ahora = ahora
+
+    def persona(self, nombres: str | None = None, apellidos: str | None = None,
+                email: str | None = None) -> int:
+        pid = self.ids.nuevo(Persona)
+        r = self.rnd
+        self.lotes.add(
+            Persona,
+            persona_id=pid,
+            tipo_documento="CE",
+            numero_documento=f"{pid:09d}",
+            nombres=nombres or r.choice(NOMBRES),
+            apellidos=apellidos or f"{r.choice(APELLIDOS)} {r.choice(APELLIDOS)}",
+            email=email,
+            celular_1=f"9{r.randrange(10**8):08d}",
+            created_at=self.ahora,
+            updated_at=self.ahora,
+        )
+        return pid
+
+    def usuario(self, persona_id: int, email: str, password_hash: str, rol: str) -> int:
+        uid = self.ids.nuevo(User)
+        self.lotes.add(
+            User, user_id=uid, persona_id=persona_id, user_email=email,
+            password_hash=password_hash, estado="ACTIVO",
+            created_at=self.ahora, updated_at=self.ahora,
+        )
+        self.lotes.add(UserRole, user_id=uid, user_role=rol, created_at=self.ahora, updated_at=self.ahora)
+        return uid
+
+    def empleado(self, persona_id: int, rol: str) -> None:
+        self.lotes.add(
+            Empleado, empleado_id=self.ids.nuevo(Empleado), persona_id=persona_id,
+            rol_empleado=rol, estado_empleado="ACTIVO",
+            created_at=self.ahora, updated_at=self.ahora,
+        )
+        if rol == "MEDICO":
+            self.lotes.add(
+                MedicoExtra, persona_id=persona_id, cmp=f"{persona_id:06d}",
+                especialidad="Medicina Ocupacional", created_at=self.ahora, updated_at=self.ahora,
+            )
+
+    def promotor(self) -> int:
+        r = self.rnd
+        prid = self.ids.nuevo(Promotor)
+        tipo = r.choices(["PERSONA", "EMPRESA", "OTROS"], weights=[50, 40, 10])[0]
+        valores = dict(promotor_id=prid, tipo_promotor=tipo, persona_id=None, razon_social=None,
+                       nombre_promotor_otros=None, ruc=None, fuente_promotor=None)
+        if tipo == "PERSONA":
+            valores["persona_id"] = self.persona()
+        elif tipo == "EMPRESA":
+            valores["razon_social"] = f"{r.choice(APELLIDOS)} {r.choice(['Salud', 'Clinica', 'Medic'])} SAC {prid}"
+            valores["ruc"] = f"20{prid:09d}"
+        else:
+            valores["nombre_promotor_otros"] = f"Referido {r.choice(NOMBRES)} {prid}"
+            valores["fuente_promotor"] = r.choice(["Web", "Facebook", "Volante"])
+        self.lotes.add(Promotor, **valores, created_at=self.ahora, updated_at=self.ahora)
+        return prid
+
+    def cliente(self) -> int:
+        pid = self.persona()
+        self.lotes.add(Cliente, persona_id=pid, estado="ACTIVO", created_at=self.ahora, updated_at=self.ahora)
+        return pid
+
+    def historial(self, sid: int, campo: str, anterior, nuevo, por: int, en: datetime) -> None:
+        self.lotes.add(
+            SolicitudEstadoHistorial, historial_id=self.ids.nuevo(SolicitudEstadoHistorial),
+            solicitud_id=sid, campo=campo, valor_anterior=anterior, valor_nuevo=nuevo,
+            cambiado_por=por, cambiado_en=en, comentario=None,
+        )
+
+    def asignacion(self, sid: int, rol: str, persona_id: int, vigente: bool, por: int, en: datetime) -> None:
+        self.lotes.add(
+            SolicitudAsignacion, asignacion_id=self.ids.nuevo(SolicitudAsignacion),
+            solicitud_id=sid, persona_id=persona_id, rol=rol, es_vigente=vigente,
+            asignado_por=None, fecha_asignacion=en, created_by=por, created_at=en, updated_at=en,
+        )
+
+    def archivo(self, sid: int, tipo: str, pago_id: int | None, por: int, en: datetime) -> None:
+        aid = self.ids.nuevo(Archivo)
+        nombre = f"{tipo.lower()}_{aid}.pdf"
+        self.lotes.add(
+            Archivo, archivo_id=aid, nombre_original=nombre, nombre_storage=nombre,
+            tipo=tipo, mime_type="application/pdf",
+            tamano_bytes=self.rnd.randint(40_000, 2_000_000),
+            storage_path=f"sintetico/{nombre}", created_by=por, created_at=en, updated_at=en,
+        )
+        self.lotes.add(
+            SolicitudArchivo, id=self.ids.nuevo(SolicitudArchivo), solicitud_id=sid,
+            archivo_id=aid, pago_id=pago_id, created_by=por, created_at=en,
+        )
+
+    def solicitud(self, estado: str, cliente_id: int, promotor_id: int | None, servicio: tuple,
+                  operador_uid: int, gestores: list[int], medicos: list[int]) -> None:
+        r = self.rnd
+        sid = self.ids.nuevo(SolicitudCmep)
+        servicio_id, tarifa, moneda = servicio
+        creado = self.ahora - timedelta(days=r.uniform(0, 365))
+        t = creado
+
+        def despues(horas_max: float = 72) -> datetime:
+            nonlocal t
+            t = min(t + timedelta(hours=r.uniform(0.5, horas_max)), self.ahora)
+            return t
+
+        # Un cancelado se corta en cualquier etapa previa al cierre
+        etapa = estado
+        if estado == "CANCELADO":
+            etapa = r.choice(["REGISTRADO", "ASIGNADO_GESTOR", "PAGADO", "ASIGNADO_MEDICO"])
+        orden = ["REGISTRADO", "ASIGNADO_GESTOR", "PAGADO", "ASIGNADO_MEDICO", "CERRADO"]
+        nivel = orden.index(etapa)
+
+        fila = dict(
+            solicitud_id=sid, codigo=f"CMEP-{creado.year}-{sid:04d}", cliente_id=cliente_id,
+            apoderado_id=None, servicio_id=servicio_id, promotor_id=promotor_id,
+            estado_atencion="REGISTRADO", estado_pago="PENDIENTE", estado_certificado=None,
+            tarifa_monto=tarifa, tarifa_moneda=moneda, tarifa_fuente="SERVICIO",
+            tipo_atencion=r.choice(["PRESENCIAL", "VIRTUAL"]), lugar_atencion=None, comentario=None,
+            motivo_cancelacion=None, fecha_cierre=None, cerrado_por=None,
+            fecha_cancelacion=None, cancelado_por=None, comentario_admin=None,
+            created_by=operador_uid, updated_by=operador_uid, created_at=creado,
+        )
+        self.historial(sid, "solicitud_creada", None, "REGISTRADO", operador_uid, creado)
+
+        if nivel >= 1:
+            gestor = r.choice(gestores)
+            if r.random() < 0.1 and len(gestores) > 1:
+                # Cambio de gestor: asignacion previa ya no vigente
+                previo = r.choice([g for g in gestores if g != gestor])
+                self.asignacion(sid, "GESTOR", previo, False, operador_uid, despues())
+                self.historial(sid, "asignacion_gestor", None, str(previo), operador_uid, t)
+            self.asignacion(sid, "GESTOR", gestor, True, operador_uid, despues())
+            self.historial(sid, "asignacion_gestor", None, str(gestor), operador_uid, t)
+        if nivel >= 2:
+            pago_id = self.ids.nuevo(PagoSolicitud)
+            en = despues()
+            self.lotes.add(
+                PagoSolicitud, pago_id=pago_id, solicitud_id=sid, canal_pago=r.choice(CANALES),
+                fecha_pago=en.date(), monto=tarifa, moneda=moneda,
+                referencia_transaccion=f"OP{pago_id:010d}", comentario=None,
+                validated_by=operador_uid, validated_at=en, created_by=operador_uid,
+                created_at=en, updated_at=en,
+            )
+            self.historial(sid, "pago_registrado", None, str(tarifa), operador_uid, en)
+            self.historial(sid, "estado_pago", "PENDIENTE", "PAGADO", operador_uid, en)
+            self.archivo(sid, "EVIDENCIA_PAGO", pago_id, operador_uid, en)
+            fila["estado_pago"] = "PAGADO"
+        if nivel >= 3:
+            medico = r.choice(medicos)
+            self.asignacion(sid, "MEDICO", medico, True, operador_uid, despues())
+            self.historial(sid, "asignacion_medico", None, str(medico), operador_uid, t)
+        if r.random() < 0.3:
+            self.archivo(sid, "DOCUMENTO", None, operador_uid, despues(24))
+
+        if estado == "CERRADO":
+            en = despues()
+            fila.update(estado_atencion="ATENDIDO", fecha_cierre=en, cerrado_por=operador_uid,
+                        estado_certificado=r.choices(["APROBADO", "OBSERVADO"], weights=[9, 1])[0])
+            self.historial(sid, "estado_atencion", "REGISTRADO", "ATENDIDO", operador_uid, en)
+            self.lotes.add(
+                ResultadoMedico, resultado_id=self.ids.nuevo(ResultadoMedico), solicitud_id=sid,
+                medico_id=medico, fecha_evaluacion=en.date(), diagnostico="Apto",
+                resultado="APTO", estado_certificado=fila["estado_certificado"],
+                created_by=operador_uid, created_at=en, updated_at=en,
+            )
+        elif estado == "CANCELADO":
+            en = despues()
+            fila.update(estado_atencion="CANCELADO", fecha_cancelacion=en, cancelado_por=operador_uid,
+                        motivo_cancelacion="Cliente desiste")
+            self.historial(sid, "estado_atencion", "REGISTRADO", "CANCELADO", operador_uid, en)
+
+        fila["updated_at"] = t
+        self.lotes.add(SolicitudCmep, **fila)
+
+
+async def _existentes(conn: AsyncConnection) -> dict:
+    """Usuarios de login, personal y servicios ya presentes (para agregar)."""
+    usuarios = dict((await conn.execute(
+        select(User.user_email, User.user_id).where(User.user_email.in_([u[0] for u in USUARIOS_LOGIN]))
+    )).all())
+    empleados = (await conn.execute(
+        select(Empleado.persona_id, Empleado.rol_empleado).where(Empleado.estado_empleado == "ACTIVO")
+    )).all()
+    servicios = (await conn.execute(
+        select(Servicio.servicio_id, Servicio.tarifa_servicio, Servicio.moneda_tarifa)
+    )).all()
+    operadores = (await conn.execute(
+        select(UserRole.user_id).where(UserRole.user_role == "OPERADOR")
+    )).scalars().all()
+    return {
+        "usuarios": usuarios,
+        "gestores": [e.persona_id for e in empleados if e.rol_empleado == "GESTOR"],
+        "medicos": [e.persona_id for e in empleados if e.rol_empleado == "MEDICO"],
+        "operadores": list(operadores),
+        "servicios": [tuple(s) for s in servicios],
+        "promotores": (await conn.execute(select(Promotor.promotor_id))).scalars().all(),
+    }
+
+
+async def generar(
+    engine: AsyncEngine,
+    n_solicitudes: int,
+    distribucion: dict[str, float] | None = None,
+    lote: int = 2000,
+    semilla: int = 42,
+    reset: bool = False,
+    log=print,
+) -> dict:
+    """
+    Genera n_solicitudes (y lo que necesiten) en `engine`. Cada lote de
+    solicitudes es una transaccion. Retorna un resumen con filas por tabla.
+    """
+    distribucion = distribucion or dict(DISTRIBUCION_DEFAULT)
+    rnd = random.Random(semilla)
+    ahora = utcnow()
+    inicio = time.perf_counter()
+
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    # ── Base: usuarios de login, personal proporcional, servicios, promotores
+    async with engine.begin() as conn:
+        ids = _Ids()
+        await ids.cargar(conn)
+        lotes = _Lotes(conn)
+        gen = _Generador(lotes, ids, rnd, ahora)
+        ex = await _existentes(conn)
+
+        for email, password, rol in USUARIOS_LOGIN:
+            if email in ex["usuarios"]:
+                continue
+            nombre = email.split("@")[0].capitalize()
+            pid = gen.persona(nombre, "Sintetico", email)
+            uid = gen.usuario(pid, email, hash_password(password), rol)
+            if rol == "OPERADOR":
+                ex["operadores"].append(uid)
+            if rol in ("OPERADOR", "GESTOR", "MEDICO"):
+                gen.empleado(pid, rol)
+                if rol == "GESTOR":
+                    ex["gestores"].append(pid)
+                elif rol == "MEDICO":
+                    ex["medicos"].append(pid)
+
+        # Personal adicional proporcional al volumen (sin login propio)
+        hash_staff = hash_password("sintetico123")
+        total = n_solicitudes + len(ex["promotores"]) * 50
+        for rol, clave, por_cada, minimo in (
+            ("OPERADOR", "operadores", 5000, 3),
+            ("GESTOR", "gestores", 2000, 5),
+            ("MEDICO", "medicos", 2000, 5),
+        ):
+            for _ in range(max(minimo, total // por_cada) - len(ex[clave])):
+                pid = gen.persona()
+                if rol == "OPERADOR":
+                    ex[clave].append(gen.usuario(pid, f"{rol.lower()}{pid}@sintetico.local", hash_staff, rol))
+                else:
+                    gen.usuario(pid, f"{rol.lower()}{pid}@sintetico.local", hash_staff, rol)
+                    ex[clave].append(pid)
+                gen.empleado(pid, rol)
+
+        if not ex["servicios"]:
+            for descripcion, tarifa, moneda in SERVICIOS:
+                sid = ids.nuevo(Servicio)
+                lotes.add(Servicio, servicio_id=sid, descripcion_servicio=descripcion,
+                          tarifa_servicio=tarifa, moneda_tarifa=moneda,
+                          created_at=ahora, updated_at=ahora)
+                ex["servicios"].append((sid, tarifa, moneda))
+
+        for _ in range(max(20, total // 50) - len(ex["promotores"])):
+            ex["promotores"].append(gen.promotor())
+        await lotes.volcar()
+        totales = dict(lotes.totales)
+
+    # ── Solicitudes por lotes (una transaccion por lote)
+    estados = list(distribucion)
+    pesos = [distribucion[e] for e in estados]
+    clientes: list[int] = []
+    hechas = 0
+    while hechas < n_solicitudes:
+        n = min(lote, n_solicitudes - hechas)
+        async with engine.begin() as conn:
+            lotes = _Lotes(conn)
+            gen.lotes = lotes
+            for estado in rnd.choices(estados, weights=pesos, k=n):
+                # ~20% de clientes recurrentes
+                if clientes and rnd.random() < 0.2:
+                    cliente_id = rnd.choice(clientes)
+                else:
+                    cliente_id = gen.cliente()
+                    clientes.append(cliente_id)
+                gen.solicitud(
+                    estado, cliente_id,
+                    rnd.choice(ex["promotores"]) if rnd.random() < 0.7 else None,
+                    rnd.choice(ex["servicios"]), rnd.choice(ex["operadores"]),
+                    ex["gestores"], ex["medicos"],
+                )
+            await lotes.volcar()
+        for tabla, filas in lotes.totales.items():
+            totales[tabla] = totales.get(tabla, 0) + filas
+        hechas += n
+        transcurrido = time.perf_counter() - inicio
+        log(f"  {hechas}/{n_solicitudes} solicitudes ({hechas / transcurrido:,.0f}/s)")
+
+    return {
+        "solicitudes": n_solicitudes,
+        "distribucion": distribucion,
+        "semilla": semilla,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "filas": {t: n for t, n in totales.items() if n},
+    }
+
+
+def get_engine(use_mysql: bool, url: str | None = None) -> AsyncEngine:
+    if url:
+        return create_async_engine(url)
+    if use_mysql:
+        from app.database import get_engine
+        return get_engine()
+    print(f"Usando SQLite local: {SQLITE_PATH}")
+    return create_async_engine(SQLITE_URL)
+
+
+async def main(args) -> None:
+    engine = get_engine(args.mysql, args.url)
+    resumen = await generar(
+        engine, args.solicitudes, parse_distribucion(args.estados),
+        lote=args.lote, semilla=args.semilla, reset=args.reset,
+    )
+    await engine.dispose()
+    print(f"\nGenerado en {resumen['segundos']} s:")
+    for tabla, filas in resumen["filas"].items():
+        print(f"  {tabla:<28} {filas:>10,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Datos sinteticos masivos CMEP")
+    parser.add_argument("--solicitudes", type=int, default=10000, help="cantidad de solicitudes (default 10000)")
+    parser.add_argument("--estados", default=None,
+                        help="distribucion de estados, p.ej. REGISTRADO=50,PAGADO=30,CERRADO=20")
+    parser.add_argument("--lote", type=int, default=2000, help="solicitudes por transaccion")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="borrar y recrear todas las tablas")
+    parser.add_argument("--mysql", action="store_true", help="Usar MySQL (requiere docker-compose up)")
+    parser.add_argument("--url", default=None, help="DATABASE_URL explicita (async)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""
+Benchmark de compresion del storage: ratio y costo de CPU por tipo de archivo.
+
+    python scripts/bench_compresion.py                  # muestras sinteticas
+    python scripts/bench_compresion.py scan.tiff a.pdf  # archivos reales
+
+Para cada muestra y codec (gzip niveles 1/6/9, zstd 1/3/10 si esta instalado)
+imprime ratio (comprimido/original) y MB/s de compresion y descompresion.
+Sirve para decidir STORAGE_COMPRESSION y COMPRESSIBLE_MIME.
+"""
+
+import sys
+import os
+# Agregar 'backend' al sys.path para que 'app' sea importable
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import mimetypes
+import random
+import time
+from io import BytesIO
+
+from app.utils.compresion import compress, decompress, es_comprimible, zstd_disponible
+
+REPETICIONES = 3
+
+
+def _scan(fmt: str) -> bytes:
+    """Pagina escaneada sintetica: fondo blanco, renglones de 'texto' y ruido."""
+    from PIL import Image, ImageDraw
+
+    rnd = random.Random(42)
+    img = Image.new("L", (1700, 2200), 255)
+    draw = ImageDraw.Draw(img)
+    for y in range(150, 2050, 40):
+        x = 120
+        while x < 1550:
+            w = rnd.randint(20, 90)
+            draw.rectangle([x, y, x + w, y + 18], fill=rnd.randint(0, 60))
+            x += w + rnd.randint(10, 25)
+    for _ in range(20000):
+        img.putpixel((rnd.randrange(1700), rnd.randrange(2200)), rnd.randint(200, 255))
+    buf = BytesIO()
+    if fmt == "JPEG":
+        img.save(buf, format=fmt, quality=85)
+    else:
+        img.convert("RGB").save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _pdf_texto(paginas: int = 30) -> bytes:
+    """PDF con streams de texto sin comprimir (como los que exportan muchos escaneres)."""
+    rnd = random.Random(7)
+    palabras = ["paciente", "evaluacion", "medico", "certificado", "diagnostico",
+                "tratamiento", "resultado", "solicitud", "laboral", "informe"]
+    objs = []
+    for _ in range(paginas):
+        lineas = "\n".join(
+            f"BT /F1 10 Tf 50 {800 - i * 14} Td ({' '.join(rnd.choices(palabras, k=12))}) Tj ET"
+            for i in range(55)
+        )
+        objs.append(f"<< /Length {len(lineas)} >>\nstream\n{lineas}\nendstream")
+    cuerpo = "\n".join(f"{i + 1} 0 obj\n{o}\nendobj" for i, o in enumerate(objs))
+    return f"%PDF-1.4\n{cuerpo}\n%%EOF\n".encode()
+
+
+def _csv(filas: int = 20000) -> bytes:
+    rnd = random.Random(3)
+    lineas = ["solicitud_id,cliente,monto,estado"]
+    lineas += [f"{i},{rnd.randint(10**7, 10**8)},{rnd.randint(50, 900)}.00,PAGADO" for i in range(filas)]
+    return "\n".join(lineas).encode()
+
+
+def muestras_sinteticas() -> list[tuple[str, str, bytes]]:
+    return [
+        ("scan.bmp", "image/bmp", _scan("BMP")),
+        ("scan.tiff", "image/tiff", _scan("TIFF")),
+        ("scan.jpg", "image/jpeg", _scan("JPEG")),
+        ("informe.pdf", "application/pdf", _pdf_texto()),
+        ("reporte.csv", "text/csv", _csv()),
+    ]
+
+
+def muestras_de_archivos(paths: list[str]) -> list[tuple[str, str, bytes]]:
+    out = []
+    for p in paths:
+        mime = mimetypes.guess_type(p)[0] or "application/octet-stream"
+        with open(p, "rb") as f:
+            out.append((os.path.basename(p), mime, f.read()))
+    return out
+
+
+def _medir(fn, *args) -> tuple[float, bytes]:
+    mejor, res = float("inf"), b""
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor, res
+
+
+def main() -> None:
+    muestras = muestras_de_archivos(sys.argv[1:]) if len(sys.argv) > 1 else muestras_sinteticas()
+    codecs = [("gzip", 1), ("gzip", 6), ("gzip", 9)]
+    if zstd_disponible():
+        codecs += [("zstd", 1), ("zstd", 3), ("zstd", 10)]
+
+    print(f"{'archivo':<14} {'mime':<18} {'MB':>7} {'comp?':>5}  {'codec':<8} {'ratio':>6} {'comp MB/s':>10} {'desc MB/s':>10}")
+    for nombre, mime, data in muestras:
+        mb = len(data) / 1e6
+        for codec, nivel in codecs:
+            t_c, comprimido = _medir(compress, data, codec, nivel)
+            t_d, _ = _medir(decompress, comprimido, codec)
+            print(
+                f"{nombre:<14} {mime:<18} {mb:7.2f} {'si' if es_comprimible(mime) else 'no':>5}  "
+                f"{codec + '-' + str(nivel):<8} {len(comprimido) / len(data):6.3f} "
+                f"{mb / t_c:10.1f} {mb / t_d:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark de serializacion de respuestas: camino de FastAPI por defecto
+(jsonable_encoder + json.dumps de JSONResponse) vs RespuestaJSON (orjson).
+
+    python scripts/bench_json.py                      # SQLite temporal con 5000 solicitudes
+    python scripts/bench_json.py --url sqlite+aiosqlite:///cmep_dev.db --solicitudes 0
+
+Payloads reales construidos con los servicios sobre el dataset sintetico
+(infra/seed_masivo.py): pagina de 100 del listado, detalle con el historial
+mas largo y reporte de 365 dias. Por payload: p50 de encode en ms con cada
+camino, tamaño y aceleracion.
+"""
+
+import sys
+import os
+# Agregar 'backend' e 'infra' al sys.path ('app' y seed_masivo importables)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'infra')))
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models.solicitud import SolicitudCmep, SolicitudEstadoHistorial
+from app.services.reportes_service import generar_reporte
+from app.services.solicitud_service import (
+    build_detail_dto,
+    get_solicitud_by_id,
+    list_solicitudes,
+    resolve_historial_user_names,
+)
+from app.utils.json_rapido import dumps
+
+
+def encode_fastapi(contenido) -> bytes:
+    """Lo que hacia FastAPI con un dict retornado: jsonable_encoder + JSONResponse.render."""
+    return json.dumps(
+        jsonable_encoder(contenido), ensure_ascii=False, allow_nan=False,
+        indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def medir(fn, contenido, repeticiones: int) -> float:
+    fn(contenido)  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn(contenido)
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(tiempos)
+
+
+async def payloads(factory: async_sessionmaker) -> dict[str, dict]:
+    roles = ["ADMIN"]
+    async with factory() as db:
+        items, total = await list_solicitudes(db, page=1, page_size=100, user_roles=roles)
+        listado = {"ok": True, "data": {"items": items}, "meta": {"page": 1, "page_size": 100, "total": total}}
+
+        mas_historial = (await db.execute(
+            select(SolicitudEstadoHistorial.solicitud_id)
+            .group_by(SolicitudEstadoHistorial.solicitud_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )).scalar_one()
+        solicitud = await get_solicitud_by_id(db, mas_historial)
+        nombres = await resolve_historial_user_names(db, solicitud)
+        detalle = {"ok": True, "data": build_detail_dto(solicitud, roles, nombres)}
+
+        hoy = date.today()
+        reporte = {"ok": True, "data": await generar_reporte(db, hoy - timedelta(days=365), hoy, None, "mensual")}
+
+    return {"listado_100": listado, "detalle": detalle, "reporte_365_dias": reporte}
+
+
+async def main(args) -> None:
+    import seed_masivo
+
+    settings.SLOW_QUERY_MS = 0
+    url = args.url
+    if url is None:
+        url = f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(prefix='cmep_bench_'), 'bench.db')}"
+    engine = create_async_engine(url)
+    async with engine.connect() as conn:
+        try:
+            existentes = (await conn.execute(select(func.count()).select_from(SolicitudCmep))).scalar()
+        except Exception:
+            existentes = 0
+    if args.solicitudes and (existentes or 0) < args.solicitudes:
+        print(f"Generando {args.solicitudes - existentes} solicitudes...")
+        await seed_masivo.generar(engine, args.solicitudes - existentes, semilla=args.semilla)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    casos = await payloads(factory)
+    await engine.dispose()
+
+    print(f"\n  {'payload':<18} {'KB':>8} {'fastapi ms':>11} {'orjson ms':>10} {'x':>6}")
+    for nombre, contenido in casos.items():
+        # Mismo documento por ambos caminos (salvo Decimal: float vs string)
+        assert json.loads(dumps(contenido)).keys() == json.loads(encode_fastapi(contenido)).keys()
+        t_fastapi = medir(encode_fastapi, contenido, args.repeticiones)
+        t_orjson = medir(dumps, contenido, args.repeticiones)
+        kb = len(dumps(contenido)) / 1024
+        print(f"  {nombre:<18} {kb:>8.1f} {t_fastapi:>11.3f} {t_orjson:>10.3f} {t_fastapi / t_orjson:>6.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de serializacion JSON de respuestas CMEP")
+    parser.add_argument("--url", default=None, help="BD async existente (default: SQLite temporal)")
+    parser.add_argument("--solicitudes", type=int, default=5000,
+                        help="generar hasta tener esta cantidad (0 = usar la BD tal cual)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
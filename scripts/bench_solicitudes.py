@@ -0,0 +1,268 @@
+"""
+Benchmark de la capa de servicios sobre un dataset sintetico (infra/seed_masivo.py).
+
+    python scripts/bench_solicitudes.py --solicitudes 10000            # genera en un SQLite temporal
+    python scripts/bench_solicitudes.py --url sqlite+aiosqlite:///cmep_dev.db
+    python scripts/bench_solicitudes.py --comparar bench_results/anterior.json
+
+Mide list_solicitudes (base, q, estado, mine de OPERADOR y GESTOR), detalle,
+cada accion del workflow (accion + recarga del detalle, como el endpoint;
+cada corrida hace ROLLBACK, asi el dataset no cambia) y generar_reporte.
+Por caso: min / p50 / p95 / max en ms y sentencias SQL por ejecucion.
+
+Guarda el resultado como JSON en bench_results/ (o --salida) con el commit y
+el tamaño del dataset; con --comparar imprime la variacion de p50 por caso.
+"""
+
+import sys
+import os
+# Agregar 'backend' e 'infra' al sys.path ('app' y seed_masivo importables)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'infra')))
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models.empleado import Empleado
+from app.models.solicitud import SolicitudCmep
+from app.models.user import User
+from app.services import sql_stats
+from app.services.reportes_service import generar_reporte
+from app.services.solicitud_service import (
+    asignar_rol,
+    build_detail_dto,
+    cancelar_solicitud,
+    cerrar_solicitud,
+    get_solicitud_by_id,
+    list_solicitudes,
+    registrar_pago,
+    resolve_historial_user_names,
+    validate_empleado_r10,
+)
+
+RESULTADOS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "bench_results"))
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+class Banco:
+    def __init__(self, factory: async_sessionmaker, repeticiones: int):
+        self.factory = factory
+        self.repeticiones = repeticiones
+        self.resultados: dict[str, dict] = {}
+
+    async def medir(self, nombre: str, fn, rollback: bool = False) -> None:
+        """fn(db) en una sesion nueva por corrida; 1 corrida de calentamiento."""
+        tiempos, consultas = [], 0
+        for i in range(self.repeticiones + 1):
+            async with self.factory() as db:
+                with sql_stats.medir() as stats:
+                    t0 = time.perf_counter()
+                    await fn(db)
+                    t = time.perf_counter() - t0
+                if rollback:
+                    await db.rollback()
+            if i:  # descartar calentamiento
+                tiempos.append(t * 1000)
+                consultas = stats.consultas
+        self.resultados[nombre] = {
+            "min_ms": round(min(tiempos), 2),
+            "p50_ms": round(statistics.median(tiempos), 2),
+            "p95_ms": round(_percentil(tiempos, 95), 2),
+            "max_ms": round(max(tiempos), 2),
+            "consultas": consultas,
+        }
+        r = self.resultados[nombre]
+        print(f"  {nombre:<34} p50 {r['p50_ms']:>9.2f} ms  p95 {r['p95_ms']:>9.2f} ms  {consultas:>4} SQL")
+
+
+async def _detalle(db: AsyncSession, solicitud_id: int, roles: list[str]) -> dict:
+    await db.flush()
+    db.expire_all()
+    solicitud = await get_solicitud_by_id(db, solicitud_id)
+    nombres = await resolve_historial_user_names(db, solicitud)
+    return build_detail_dto(solicitud, roles, nombres)
+
+
+async def _una_en_estado(db: AsyncSession, estado: str) -> int:
+    # El filtro por estado de list_solicitudes se aplica sobre la pagina: recorrer
+    for page in range(1, 51):
+        items, _ = await list_solicitudes(db, page=page, page_size=100, estado_operativo=estado)
+        if items:
+            return items[0]["solicitud_id"]
+    raise SystemExit(f"El dataset no tiene solicitudes en estado {estado}")
+
+
+async def correr(factory: async_sessionmaker, repeticiones: int) -> dict:
+    banco = Banco(factory, repeticiones)
+
+    async with factory() as db:
+        operador = (await db.execute(select(User).where(User.user_email == "operador@cmep.local"))).scalar_one()
+        gestor = (await db.execute(select(User).where(User.user_email == "gestor@cmep.local"))).scalar_one()
+        admin = (await db.execute(select(User).where(User.user_email == "admin@cmep.local"))).scalar_one()
+        gestor_pid = (await db.execute(
+            select(Empleado.persona_id).where(Empleado.rol_empleado == "GESTOR").limit(1)
+        )).scalar_one()
+        medico_pid = (await db.execute(
+            select(Empleado.persona_id).where(Empleado.rol_empleado == "MEDICO").limit(1)
+        )).scalar_one()
+        objetivo = {e: await _una_en_estado(db, e) for e in
+                    ("REGISTRADO", "ASIGNADO_GESTOR", "PAGADO", "ASIGNADO_MEDICO")}
+        ultima = (await db.execute(select(func.max(SolicitudCmep.solicitud_id)))).scalar_one()
+
+    admin_roles = ["ADMIN"]
+
+    print("\n== Listado")
+    await banco.medir("listar", lambda db: list_solicitudes(db, user_roles=admin_roles))
+    await banco.medir("listar_pagina_100", lambda db: list_solicitudes(db, page=100, user_roles=admin_roles))
+    await banco.medir("listar_q_apellido", lambda db: list_solicitudes(db, q="Quispe", user_roles=admin_roles))
+    await banco.medir("listar_q_documento", lambda db: list_solicitudes(db, q="00001", user_roles=admin_roles))
+    await banco.medir("listar_estado_pagado",
+                      lambda db: list_solicitudes(db, estado_operativo="PAGADO", user_roles=admin_roles))
+    await banco.medir("listar_mine_operador", lambda db: list_solicitudes(
+        db, mine_user_id=operador.user_id, mine_persona_id=operador.persona_id,
+        mine_roles=["OPERADOR"], user_roles=["OPERADOR"]))
+    await banco.medir("listar_mine_gestor", lambda db: list_solicitudes(
+        db, mine_user_id=gestor.user_id, mine_persona_id=gestor.persona_id,
+        mine_roles=["GESTOR"], user_roles=["GESTOR"]))
+
+    print("\n== Detalle")
+    await banco.medir("detalle", lambda db: _detalle(db, ultima, admin_roles))
+
+    print("\n== Acciones (con ROLLBACK)")
+
+    async def asignar_gestor(db):
+        s = await get_solicitud_by_id(db, objetivo["REGISTRADO"])
+        await validate_empleado_r10(db, gestor_pid, "GESTOR")
+        await asignar_rol(db, s, "GESTOR", gestor_pid, admin.user_id, "asignacion_gestor")
+        await _detalle(db, s.solicitud_id, admin_roles)
+
+    async def pagar(db):
+        s = await get_solicitud_by_id(db, objetivo["ASIGNADO_GESTOR"])
+        await registrar_pago(db, s, "YAPE", date.today(), Decimal("150.00"), "PEN", "OP-BENCH", admin.user_id)
+        await _detalle(db, s.solicitud_id, admin_roles)
+
+    async def asignar_medico(db):
+        s = await get_solicitud_by_id(db, objetivo["PAGADO"])
+        await validate_empleado_r10(db, medico_pid, "MEDICO")
+        await asignar_rol(db, s, "MEDICO", medico_pid, admin.user_id, "asignacion_medico")
+        await _detalle(db, s.solicitud_id, admin_roles)
+
+    async def cerrar(db):
+        s = await get_solicitud_by_id(db, objetivo["ASIGNADO_MEDICO"])
+        await cerrar_solicitud(db, s, admin.user_id)
+        await _detalle(db, s.solicitud_id, admin_roles)
+
+    async def cancelar(db):
+        s = await get_solicitud_by_id(db, objetivo["REGISTRADO"])
+        await cancelar_solicitud(db, s, admin.user_id, "bench")
+        await _detalle(db, s.solicitud_id, admin_roles)
+
+    for nombre, fn in (("asignar_gestor", asignar_gestor), ("registrar_pago", pagar),
+                       ("asignar_medico", asignar_medico), ("cerrar", cerrar), ("cancelar", cancelar)):
+        await banco.medir(nombre, fn, rollback=True)
+
+    print("\n== Reportes")
+    hoy = date.today()
+    await banco.medir("reporte_30_dias", lambda db: generar_reporte(db, None, None, None, "semanal"))
+    await banco.medir("reporte_365_dias",
+                      lambda db: generar_reporte(db, hoy - timedelta(days=365), hoy, None, "mensual"))
+    await banco.medir("reporte_365_dias_pagado",
+                      lambda db: generar_reporte(db, hoy - timedelta(days=365), hoy, "PAGADO", "mensual"))
+
+    return banco.resultados
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(actual: dict, anterior: dict) -> None:
+    print(f"\n== Comparacion con {anterior.get('fecha')} ({anterior.get('commit')}, "
+          f"{anterior.get('dataset', {}).get('solicitudes')} solicitudes)")
+    print(f"  {'caso':<34} {'antes p50':>10} {'ahora p50':>10} {'delta':>8} {'SQL':>9}")
+    for nombre, r in actual["resultados"].items():
+        previo = anterior.get("resultados", {}).get(nombre)
+        if not previo:
+            continue
+        delta = (r["p50_ms"] - previo["p50_ms"]) / previo["p50_ms"] * 100 if previo["p50_ms"] else 0.0
+        sql = f"{previo['consultas']}->{r['consultas']}"
+        print(f"  {nombre:<34} {previo['p50_ms']:>10.2f} {r['p50_ms']:>10.2f} {delta:>+7.1f}% {sql:>9}")
+
+
+async def main(args) -> None:
+    import seed_masivo
+
+    if not args.log_lentas:
+        settings.SLOW_QUERY_MS = 0  # el log de consultas lentas ensucia la salida
+
+    url = args.url
+    if url is None:
+        ruta = os.path.join(tempfile.mkdtemp(prefix="cmep_bench_"), "bench.db")
+        url = f"sqlite+aiosqlite:///{ruta}"
+    engine = create_async_engine(url)
+
+    async with engine.connect() as conn:
+        try:
+            existentes = (await conn.execute(select(func.count()).select_from(SolicitudCmep))).scalar()
+        except Exception:
+            existentes = 0
+    if args.solicitudes and (existentes or 0) < args.solicitudes:
+        print(f"Generando {args.solicitudes - existentes} solicitudes...")
+        await seed_masivo.generar(engine, args.solicitudes - existentes, semilla=args.semilla)
+        existentes = args.solicitudes
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    resultados = await correr(factory, args.repeticiones)
+    await engine.dispose()
+
+    salida = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _commit(),
+        "dialecto": engine.dialect.name,
+        "dataset": {"solicitudes": existentes},
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }
+    path = args.salida or os.path.join(
+        RESULTADOS_DIR, f"bench_{salida['commit'] or 'local'}_{existentes}_{time.strftime('%Y%m%d%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(salida, f, indent=2)
+    print(f"\nResultados: {path}")
+
+    if args.comparar:
+        with open(args.comparar) as f:
+            comparar(salida, json.load(f))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de servicios CMEP sobre dataset sintetico")
+    parser.add_argument("--url", default=None, help="BD async existente (default: SQLite temporal)")
+    parser.add_argument("--solicitudes", type=int, default=10000,
+                        help="generar hasta tener esta cantidad (0 = usar la BD tal cual)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior")
+    parser.add_argument("--log-lentas", action="store_true", help="mantener el log de consultas lentas")
+    asyncio.run(main(parser.parse_args()))
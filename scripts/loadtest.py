@@ -0,0 +1,346 @@
+"""
+Prueba de carga in-process contra la app ASGI (sin desplegar).
+
+    python scripts/loadtest.py                                   # 20 usuarios, 30 s, 2000 solicitudes
+    python scripts/loadtest.py --usuarios 50 --duracion 60 --tamanos 2000,20000
+    python scripts/loadtest.py --mezcla listar=50,detalle=50     # solo esas acciones
+    python scripts/loadtest.py --base-url http://localhost:8000  # servidor ya levantado y sembrado
+
+Por defecto maneja app.main.app con httpx.ASGITransport sobre un SQLite en
+archivo (WAL) y storage local en un directorio temporal, sembrado con
+infra/seed_masivo.py. N usuarios virtuales concurrentes (cada uno con su
+sesion) eligen acciones segun la mezcla hasta agotar la duracion.
+
+Reporte por accion: peticiones, RPS, p50/p95/p99 y % de errores (5xx,
+excepciones o status inesperado). Con varios --tamanos el dataset crece
+entre corridas (mismo archivo) y se marcan las acciones cuyo p50 crece mas
+que CRECIMIENTO_ALERTA veces: latencia que depende del volumen de datos.
+--salida guarda todo como JSON.
+"""
+
+import sys
+import os
+# Agregar 'backend' e 'infra' al sys.path ('app' y seed_masivo importables)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'infra')))
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+
+import httpx
+
+# Mezcla por defecto (pesos relativos)
+MEZCLA_DEFAULT = {
+    "login": 5,
+    "listar": 30,
+    "buscar": 15,
+    "detalle": 25,
+    "pagar": 10,
+    "subir": 10,
+    "reporte": 5,
+}
+
+# Status esperados por accion (otro status cuenta como error)
+ESPERADOS = {
+    "login": {200},
+    "listar": {200},
+    "buscar": {200},
+    "detalle": {200},
+    "pagar": {200},
+    "subir": {200, 201},
+    "reporte": {200},
+}
+
+CRECIMIENTO_ALERTA = 2.0
+
+USUARIO = ("admin@cmep.local", "admin123")
+APELLIDOS = ["Quispe", "Flores", "Garcia", "Mamani", "Torres", "Rojas"]
+PDF = b"%PDF-1.4\n" + b"0" * 20_000 + b"\n%%EOF\n"
+
+
+def parse_mezcla(texto: str | None) -> dict[str, float]:
+    if not texto:
+        return dict(MEZCLA_DEFAULT)
+    mezcla = {}
+    for parte in texto.split(","):
+        accion, _, peso = parte.partition("=")
+        accion = accion.strip()
+        if accion not in MEZCLA_DEFAULT:
+            raise ValueError(f"Accion desconocida: {accion} (validas: {', '.join(MEZCLA_DEFAULT)})")
+        mezcla[accion] = float(peso)
+    return mezcla
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+# ── Estado compartido de la corrida ────────────────────────────────────
+
+class Corrida:
+    def __init__(self, ids: list[int], por_pagar: list[int]):
+        self.ids = ids                    # solicitudes existentes (detalle, subir)
+        self.por_pagar = por_pagar        # ASIGNADO_GESTOR sin pago: cada pago consume una
+        self.latencias: dict[str, list[float]] = defaultdict(list)
+        self.errores: dict[str, int] = defaultdict(int)
+        self.ejemplos_error: dict[str, str] = {}
+
+    def registrar(self, accion: str, segundos: float, ok: bool, detalle: str = "") -> None:
+        self.latencias[accion].append(segundos * 1000)
+        if not ok:
+            self.errores[accion] += 1
+            self.ejemplos_error.setdefault(accion, detalle[:200])
+
+
+async def _login(client: httpx.AsyncClient) -> httpx.Response:
+    return await client.post("/auth/login", json={"email": USUARIO[0], "password": USUARIO[1]})
+
+
+async def _accion(nombre: str, client: httpx.AsyncClient, corrida: Corrida, rnd: random.Random):
+    """Ejecuta la accion; None si no hay datos para ella (no se mide)."""
+    if nombre == "login":
+        return await _login(client)
+    if nombre == "listar":
+        return await client.get("/solicitudes", params={"page": rnd.randint(1, 20)})
+    if nombre == "buscar":
+        return await client.get("/solicitudes", params={"q": rnd.choice(APELLIDOS)})
+    if nombre == "detalle":
+        return await client.get(f"/solicitudes/{rnd.choice(corrida.ids)}")
+    if nombre == "pagar":
+        if not corrida.por_pagar:
+            return None
+        sid = corrida.por_pagar.pop()
+        return await client.post(f"/solicitudes/{sid}/registrar-pago", json={
+            "canal_pago": "YAPE", "fecha_pago": date.today().isoformat(),
+            "monto": "150.00", "moneda": "PEN", "referencia_transaccion": f"LT-{sid}",
+        })
+    if nombre == "subir":
+        # Contenido distinto por subida (sin dedup por SHA-256)
+        contenido = PDF + str(rnd.random()).encode()
+        return await client.post(
+            f"/solicitudes/{rnd.choice(corrida.ids)}/archivos",
+            files={"file": ("carga.pdf", contenido, "application/pdf")},
+            data={"tipo_archivo": "DOCUMENTO"},
+        )
+    if nombre == "reporte":
+        return await client.get("/admin/reportes")
+    raise ValueError(nombre)
+
+
+async def usuario_virtual(n: int, cliente, corrida: Corrida, mezcla: dict[str, float], hasta: float) -> None:
+    rnd = random.Random(n)
+    acciones, pesos = list(mezcla), list(mezcla.values())
+    async with cliente() as client:
+        t0 = time.perf_counter()
+        try:
+            resp = await _login(client)
+        except Exception as e:  # noqa: BLE001
+            corrida.registrar("login", time.perf_counter() - t0, False, repr(e))
+            return
+        if resp.status_code != 200:
+            corrida.registrar("login", time.perf_counter() - t0, False, f"{resp.status_code} {resp.text}")
+            return
+        while time.perf_counter() < hasta:
+            nombre = rnd.choices(acciones, weights=pesos)[0]
+            t0 = time.perf_counter()
+            try:
+                resp = await _accion(nombre, client, corrida, rnd)
+            except Exception as e:  # noqa: BLE001 — cuenta como error de la accion
+                corrida.registrar(nombre, time.perf_counter() - t0, False, repr(e))
+                continue
+            if resp is None:
+                continue
+            ok = resp.status_code in ESPERADOS[nombre]
+            corrida.registrar(nombre, time.perf_counter() - t0, ok, f"{resp.status_code} {resp.text}")
+
+
+def resumen(corrida: Corrida, segundos: float) -> dict:
+    por_accion = {}
+    for accion, lat in sorted(corrida.latencias.items()):
+        por_accion[accion] = {
+            "peticiones": len(lat),
+            "rps": round(len(lat) / segundos, 1),
+            "p50_ms": round(statistics.median(lat), 1),
+            "p95_ms": round(_percentil(lat, 95), 1),
+            "p99_ms": round(_percentil(lat, 99), 1),
+            "errores_pct": round(100 * corrida.errores[accion] / len(lat), 2),
+        }
+        if accion in corrida.ejemplos_error:
+            por_accion[accion]["ejemplo_error"] = corrida.ejemplos_error[accion]
+    total = sum(len(lat) for lat in corrida.latencias.values())
+    return {
+        "segundos": round(segundos, 1),
+        "peticiones": total,
+        "rps": round(total / segundos, 1),
+        "errores_pct": round(100 * sum(corrida.errores.values()) / total, 2) if total else 0.0,
+        "acciones": por_accion,
+    }
+
+
+def imprimir(titulo: str, r: dict) -> None:
+    print(f"\n== {titulo}: {r['peticiones']} peticiones en {r['segundos']} s "
+          f"({r['rps']} RPS, {r['errores_pct']}% errores)")
+    print(f"  {'accion':<10} {'n':>6} {'RPS':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>7}")
+    for accion, a in r["acciones"].items():
+        print(f"  {accion:<10} {a['peticiones']:>6} {a['rps']:>7} {a['p50_ms']:>9} "
+              f"{a['p95_ms']:>9} {a['p99_ms']:>9} {a['errores_pct']:>7}")
+        if "ejemplo_error" in a:
+            print(f"             ej. error: {a['ejemplo_error']}")
+
+
+def crecimiento(corridas: list[tuple[int, dict]]) -> list[str]:
+    """Acciones cuyo p50 crece mas de CRECIMIENTO_ALERTA veces entre el menor y el mayor dataset."""
+    (n0, r0), (n1, r1) = corridas[0], corridas[-1]
+    alertas = []
+    for accion, a1 in r1["acciones"].items():
+        a0 = r0["acciones"].get(accion)
+        if not a0 or not a0["p50_ms"]:
+            continue
+        factor = a1["p50_ms"] / a0["p50_ms"]
+        if factor >= CRECIMIENTO_ALERTA:
+            alertas.append(
+                f"{accion}: p50 {a0['p50_ms']} -> {a1['p50_ms']} ms (x{factor:.1f}) "
+                f"con {n0} -> {n1} solicitudes"
+            )
+    return alertas
+
+
+# ── Preparacion in-process ─────────────────────────────────────────────
+
+def preparar_app(directorio: str):
+    """Apunta la app a un SQLite en archivo + storage local (antes de crear el engine)."""
+    from app.config import settings
+
+    settings.DB_URL = f"sqlite+aiosqlite:///{os.path.join(directorio, 'carga.db')}"
+    settings.FILE_STORAGE = "local"
+    settings.UPLOAD_DIR = os.path.join(directorio, "uploads")
+    settings.SLOW_QUERY_MS = 0
+    settings.APP_ENV = "loadtest"  # sin echo de SQL (solo APP_ENV=local lo activa)
+
+    from app.database import get_engine
+    from app.main import app
+
+    return app, get_engine()
+
+
+async def sembrar(engine, hasta: int, semilla: int) -> int:
+    """Completa el dataset hasta `hasta` solicitudes; retorna cuantas hay."""
+    import seed_masivo
+    from sqlalchemy import func, select, text
+    from app.models.solicitud import SolicitudCmep
+
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA journal_mode=WAL"))
+        await conn.run_sync(seed_masivo.Base.metadata.create_all)
+        existentes = (await conn.execute(select(func.count()).select_from(SolicitudCmep))).scalar()
+    if existentes < hasta:
+        print(f"Sembrando {hasta - existentes} solicitudes...")
+        await seed_masivo.generar(engine, hasta - existentes, semilla=semilla + existentes,
+                                  log=lambda *_: None)
+    return max(existentes, hasta)
+
+
+async def objetivos(engine) -> tuple[list[int], list[int]]:
+    """Ids de solicitudes y de las pagables (gestor vigente, sin pago, no cerradas)."""
+    from sqlalchemy import and_, exists, select
+    from app.models.solicitud import SolicitudAsignacion, SolicitudCmep
+
+    async with engine.connect() as conn:
+        ids = (await conn.execute(select(SolicitudCmep.solicitud_id))).scalars().all()
+        por_pagar = (await conn.execute(
+            select(SolicitudCmep.solicitud_id).where(
+                SolicitudCmep.estado_pago == "PENDIENTE",
+                SolicitudCmep.estado_atencion == "REGISTRADO",
+                exists().where(and_(
+                    SolicitudAsignacion.solicitud_id == SolicitudCmep.solicitud_id,
+                    SolicitudAsignacion.rol == "GESTOR",
+                    SolicitudAsignacion.es_vigente == True,  # noqa: E712
+                    )),
+            )
+        )).scalars().all()
+    return list(ids), list(por_pagar)
+
+
+async def correr(cliente, ids, por_pagar, usuarios: int, duracion: float, mezcla: dict) -> dict:
+    corrida = Corrida(ids, por_pagar)
+    random.Random(0).shuffle(corrida.por_pagar)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        usuario_virtual(n, cliente, corrida, mezcla, inicio + duracion) for n in range(usuarios)
+    ))
+    return resumen(corrida, time.perf_counter() - inicio)
+
+
+async def main(args) -> None:
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    mezcla = parse_mezcla(args.mezcla)
+    resultados: list[tuple[int, dict]] = []
+
+    if args.base_url:
+        # Servidor externo (sembrado aparte): solo acciones que no requieren ids locales
+        def cliente():
+            return httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        async with cliente() as client:
+            await _login(client)
+            resp = await client.get("/solicitudes", params={"page_size": 100})
+            ids = [s["solicitud_id"] for s in resp.json()["data"]["items"]]
+        r = await correr(cliente, ids, [], args.usuarios, args.duracion,
+                         {k: v for k, v in mezcla.items() if k != "pagar"})
+        imprimir(args.base_url, r)
+        resultados.append((0, r))
+    else:
+        directorio = args.directorio or tempfile.mkdtemp(prefix="cmep_carga_")
+        app, engine = preparar_app(directorio)
+        transport = httpx.ASGITransport(app=app)
+
+        def cliente():
+            return httpx.AsyncClient(transport=transport, base_url="http://carga", timeout=60)
+
+        for tamano in sorted(int(t) for t in args.tamanos.split(",")):
+            n = await sembrar(engine, tamano, args.semilla)
+            ids, por_pagar = await objetivos(engine)
+            r = await correr(cliente, ids, por_pagar, args.usuarios, args.duracion, mezcla)
+            imprimir(f"{n} solicitudes, {args.usuarios} usuarios", r)
+            resultados.append((n, r))
+        await engine.dispose()
+
+    if len(resultados) > 1:
+        alertas = crecimiento(resultados)
+        print("\n== Latencia que crece con el dataset")
+        for a in alertas or ["(ninguna accion supera x%.1f)" % CRECIMIENTO_ALERTA]:
+            print(f"  {a}")
+
+    if args.salida:
+        with open(args.salida, "w") as f:
+            json.dump({
+                "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "usuarios": args.usuarios,
+                "duracion": args.duracion,
+                "mezcla": mezcla,
+                "corridas": [{"solicitudes": n, **r} for n, r in resultados],
+            }, f, indent=2)
+        print(f"\nResultados: {args.salida}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga in-process de la API CMEP")
+    parser.add_argument("--usuarios", type=int, default=20, help="usuarios virtuales concurrentes")
+    parser.add_argument("--duracion", type=float, default=30, help="segundos por corrida")
+    parser.add_argument("--tamanos", default="2000",
+                        help="solicitudes del dataset por corrida, p.ej. 2000,20000")
+    parser.add_argument("--mezcla", default=None, help="pesos por accion, p.ej. listar=50,detalle=50")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--directorio", default=None, help="reusar BD y uploads de una corrida anterior")
+    parser.add_argument("--base-url", default=None, help="servidor ya levantado (uvicorn) en vez de in-process")
+    parser.add_argument("--salida", default=None, help="archivo JSON de resultados")
+    asyncio.run(main(parser.parse_args()))